@@ -0,0 +1,45 @@
+"""CRC16 查表实现与逐位实现的微基准。
+
+用法:
+    python scripts/bench_crc16.py [--frames 200000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import timeit
+from pathlib import Path
+
+# 让脚本在仓库根目录直接运行
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from nimotion.communication import crc16
+
+# 典型帧长: 读请求 6B、状态响应 35B、整块读响应 253B
+SIZES = (6, 35, 253)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="CRC16 查表 vs 逐位 基准")
+    ap.add_argument("--frames", type=int, default=200000, help="每种帧长的计算次数")
+    args = ap.parse_args()
+
+    print(f"{'帧长':>6} {'逐位 us/帧':>12} {'查表 us/帧':>12} {'加速比':>8}")
+    for size in SIZES:
+        data = os.urandom(size)
+        assert crc16.calculate(data) == crc16.calculate_bitwise(data)
+        n = max(args.frames // size, 1000)
+        t_bit = timeit.timeit(lambda: crc16.calculate_bitwise(data), number=n)
+        t_tab = timeit.timeit(lambda: crc16.calculate(data), number=n)
+        print(
+            f"{size:>6} {t_bit / n * 1e6:>12.2f} {t_tab / n * 1e6:>12.2f} "
+            f"{t_bit / t_tab:>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""通讯事件逐条投递 vs 批量投递的界面线程负载基准。
+
+在 pty 虚拟驱动器上尽快轮询状态，界面线程挂接与串口调试页相同的
+LogViewer、收发计数标签与请求回调，统计界面线程 CPU 时间与槽函数调用次数。
+
+用法:
+    python scripts/bench_signal_batching.py [--seconds 3] [--rate 60]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 让脚本在仓库根目录直接运行
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication, QLabel
+
+from nimotion.communication.serial_port import SerialConfig
+from nimotion.communication.worker import CommWorker
+from nimotion.models.status import STATUS_ADDR, STATUS_COUNT
+from nimotion.models.types import FunctionCode, ModbusRequest
+from nimotion.simulator import DriveServer, SimulatedDrive
+from nimotion.ui.widgets.log_viewer import LogViewer
+
+
+def run(app: QApplication, port: str, rate: float | None, seconds: float) -> dict:
+    worker = CommWorker()
+    worker.set_batching(rate)
+    log = LogViewer()
+    label = QLabel()
+    slots = {"n": 0}
+    done = {"n": 0}
+
+    def on_tx(data: bytes) -> None:
+        slots["n"] += 1
+        log.append_tx(data)
+
+    def on_batch(events: list) -> None:
+        slots["n"] += 1
+        log.append_batch(events)
+
+    def on_counts(tx: int, rx: int) -> None:
+        slots["n"] += 1
+        label.setText(f"TX: {tx}  RX: {rx}")
+
+    def on_response(resp) -> None:
+        slots["n"] += 1
+        done["n"] += 1
+
+    worker.raw_data_sent.connect(on_tx)
+    worker.events_batched.connect(on_batch)
+    worker.bytes_count_updated.connect(on_counts)
+    worker.connect_port(SerialConfig(port=port, timeout=0.2))
+
+    stop = threading.Event()
+    request = ModbusRequest(1, FunctionCode.READ_INPUT, STATUS_ADDR, STATUS_COUNT)
+
+    def submit() -> None:
+        # 保持 4 条在途，模拟高频轮询
+        handles = []
+        while not stop.is_set():
+            handles.append(worker.send_modbus(request, callback=on_response))
+            if len(handles) >= 4:
+                handles.pop(0).result(2)
+
+    feeder = threading.Thread(target=submit, daemon=True)
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    cpu0 = time.thread_time()
+    feeder.start()
+    app.exec_()
+    cpu = time.thread_time() - cpu0
+    stop.set()
+    feeder.join()
+    worker.disconnect_port()
+    app.processEvents()
+    return {"transactions": done["n"], "slots": slots["n"], "gui_cpu": cpu}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="通讯事件批量投递基准")
+    ap.add_argument("--seconds", type=float, default=3.0, help="每种模式运行时长")
+    ap.add_argument("--rate", type=float, default=60.0, help="批量投递频率 (Hz)")
+    args = ap.parse_args()
+
+    app = QApplication(sys.argv)
+    with DriveServer([SimulatedDrive(1)], baudrate=921600) as server:
+        print(f"{'模式':<10} {'事务/s':>8} {'槽调用/s':>10} {'界面CPU %':>10} {'CPU us/事务':>12}")
+        for name, rate in (("逐条", None), (f"批量{args.rate:g}Hz", args.rate)):
+            r = run(app, server.port, rate, args.seconds)
+            n = max(r["transactions"], 1)
+            print(
+                f"{name:<10} {r['transactions'] / args.seconds:>8.0f} "
+                f"{r['slots'] / args.seconds:>10.0f} {r['gui_cpu'] / args.seconds * 100:>10.1f} "
+                f"{r['gui_cpu'] / n * 1e6:>12.1f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
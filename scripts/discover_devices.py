@@ -0,0 +1,57 @@
+"""扫描串口上的 NiMotion 驱动器（波特率、数据格式、从站地址、序列号）。
+
+用法:
+    python scripts/discover_devices.py [--ports /dev/ttyUSB0 /dev/ttyUSB1] [--slaves 1 247]
+        [--probe 8] [--all]
+
+缺省扫描全部串口；各串口并行。
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# 让脚本在仓库根目录直接运行
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from nimotion.communication.discovery import discover
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="NiMotion 驱动器自动发现")
+    ap.add_argument("--ports", nargs="+", default=None, help="要扫描的串口，缺省为全部")
+    ap.add_argument("--slaves", type=int, nargs=2, default=[1, 247], metavar=("FIRST", "LAST"),
+                    help="从站地址范围 (默认 1 247)")
+    ap.add_argument("--probe", type=int, default=8,
+                    help="尝试通讯参数时试探的从站地址数 (1..N，默认 8)")
+    ap.add_argument("--all", action="store_true", help="尝试全部通讯参数组合（总线上参数混杂时）")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    args = ap.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    started = time.perf_counter()
+    devices = discover(
+        args.ports,
+        slave_ids=range(args.slaves[0], args.slaves[1] + 1),
+        probe_ids=range(1, args.probe + 1),
+        all_combinations=args.all,
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"{'串口':<16} {'波特率':>8} {'格式':<5} {'从站':>4} {'序列号':>10}")
+    for d in devices:
+        print(
+            f"{d.port:<16} {d.baudrate:>8} {d.data_format:<5} {d.slave_id:>4}"
+            f" {d.serial_number:>10X}"
+        )
+    print(f"发现 {len(devices)} 个从站，用时 {elapsed:.1f} s")
+    return 0 if devices else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,12 @@
 """读取驱动器全部参数并保存为 Markdown，便于跨设备核对。
 
+按 plan_block_reads 规划的块读取，块读被从站拒绝时退回逐个寄存器读取。
+全部保持+输入寄存器: 默认 (--gap 0，只读已定义地址) 15 次事务；
+从站不拒绝夹带未定义地址时 --gap 4 为 9 次，--gap 8 为 6 次。
+
 用法:
-    python scripts/dump_params.py [--port /dev/ttyUSB0] [--slave 1] [--baud 115200] [--out reports/params_baseline.md]
+    python scripts/dump_params.py [--port /dev/ttyUSB0] [--slave 1] [--baud 115200]
+        [--out reports/params_baseline.md] [--gap 0]
 """
 
 from __future__ import annotations
@@ -16,52 +21,64 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT / "src"))
 
+from nimotion.communication.frame_receiver import FrameReceiver
 from nimotion.communication.modbus_rtu import ModbusRTU
-from nimotion.communication.serial_port import SerialConfig, SerialPort
+from nimotion.communication.serial_port import (
+    SerialConfig,
+    SerialPort,
+    char_time,
+    silent_interval,
+)
 from nimotion.models.error_codes import get_error_text, get_exception_text
-from nimotion.models.registers import HOLDING_REGISTERS, INPUT_REGISTERS
-from nimotion.models.types import DataType, FunctionCode, ModbusRequest, RegisterDef, RegisterType
-
-
-# 写命令型寄存器：读取它们意义不大，常常返回 0 或报错，单独标注
-COMMAND_ONLY_ADDRS = {
-    0x0008,  # 保存所有参数 (写 0x7376)
-    0x000B,  # 恢复默认参数 (写 0x6C64)
-    0x0047,  # 设置零点 (写 0x535A)
-    0x0048,  # 设置原点 (写 0x5348)
-    0x0051,  # 运动控制字
-    0x0073,  # 清空错误存储器 (写 0x6C64)
-    0x0074,  # 硬件自检 (写 0x7465)
-}
+from nimotion.models.registers import (
+    COMMAND_ONLY_ADDRS,
+    HOLDING_REGISTERS,
+    INPUT_REGISTERS,
+    RegisterBlock,
+    plan_block_reads,
+)
+from nimotion.models.types import FunctionCode, ModbusRequest, RegisterDef, RegisterType
+
+
+def receive(sp: SerialPort, rx: FrameReceiver) -> tuple[bytes, bool | None]:
+    """
+    接收一帧响应（与通讯线程相同）：先收帧头推算帧长，异常应答 5 字节即收齐，
+    不必等满按请求估算的长度直到超时。返回 (已收数据, CRC 是否正确；未收齐为 None)
+    """
+    config = sp.config
+    rx.reset()
+    first = sp.read(1)
+    if not first:
+        return b"", None
+    rx.feed(first)
+    silence = max(silent_interval(config.baudrate), config.rx_silence_floor)
+    per_byte = char_time(config.baudrate)
+    while not rx.done:
+        needed = rx.needed
+        chunk = sp.read(needed, needed * per_byte + silence)
+        if not chunk:
+            break
+        rx.feed(chunk)
+    return rx.frame, (rx.crc_ok if rx.done else None)
 
 
 def transact(sp: SerialPort, mb: ModbusRTU, req: ModbusRequest, retries: int = 2):
     """发起一次 Modbus 事务，带简易重试"""
+    rx = FrameReceiver()
+    gap = silent_interval(sp.config.baudrate)
     for attempt in range(retries + 1):
         frame = mb.build_frame(req)
+        time.sleep(gap)  # 帧间至少 t3.5 静默，从站可能仍在上一帧的应答周转中
         sp.flush_input()
         sp.write(frame)
-        time.sleep(0.02)
-        expected = mb.expected_response_length(req)
-        raw = sp.read(expected)
-        resp = mb.parse_response(raw, req)
+        raw, crc_ok = receive(sp, rx)
+        resp = mb.parse_response(raw, req, crc_ok)
         if not resp.is_error:
             return resp
         time.sleep(0.05)
     return resp  # 返回最后一次的失败响应
 
 
-def decode_value(reg: RegisterDef, values: list[int]) -> int:
-    """根据数据类型解析寄存器原始值"""
-    if reg.count == 1:
-        raw = values[0] & 0xFFFF
-        if reg.data_type == DataType.INT16 and raw >= 0x8000:
-            raw -= 0x10000
-        return raw
-    # 32-bit: [高, 低]
-    return ModbusRTU.combine_32bit(values[0], values[1], signed=(reg.data_type == DataType.INT32))
-
-
 def format_raw_hex(reg: RegisterDef, values: list[int]) -> str:
     """构造原始 hex 表示，便于完全核对"""
     if reg.count == 1:
@@ -83,22 +100,70 @@ def value_matches_default(reg: RegisterDef, decoded: int) -> str:
     return "✓" if decoded == reg.default_val else "⚠"
 
 
-def read_register(sp: SerialPort, mb: ModbusRTU, slave_id: int, reg: RegisterDef):
-    """读取单个寄存器，返回 (decoded_value, raw_hex, error_text)"""
-    fc = FunctionCode.READ_HOLDING if reg.reg_type == RegisterType.HOLDING else FunctionCode.READ_INPUT
-    req = ModbusRequest(slave_id=slave_id, function_code=fc, address=reg.address, count=reg.count)
+def _error_text(resp) -> str:
+    if resp.error_code == -1:
+        return "CRC 错误"
+    if resp.error_code in (-2, -3):
+        return "帧长度不足/超时"
+    return f"异常码 0x{resp.error_code:02X} ({get_exception_text(resp.error_code)})"
+
+
+def _read_block(sp: SerialPort, mb: ModbusRTU, slave_id: int, block: RegisterBlock):
+    """读取一个块并按块布局整块解码，返回 ({(类型, 地址): (decoded, raw_hex, "")}, error_text)"""
+    fc = (
+        FunctionCode.READ_HOLDING if block.reg_type == RegisterType.HOLDING
+        else FunctionCode.READ_INPUT
+    )
+    req = ModbusRequest(
+        slave_id=slave_id, function_code=fc, address=block.address, count=block.count,
+    )
     resp = transact(sp, mb, req)
     if resp.is_error:
-        if resp.error_code == -1:
-            return None, "", "CRC 错误"
-        if resp.error_code == -3:
-            return None, "", "帧长度不足/超时"
-        return None, "", f"异常码 0x{resp.error_code:02X} ({get_exception_text(resp.error_code)})"
-    if len(resp.values) < reg.count:
-        return None, "", "返回数据不足"
-    decoded = decode_value(reg, resp.values[: reg.count])
-    raw_hex = format_raw_hex(reg, resp.values[: reg.count])
-    return decoded, raw_hex, ""
+        return None, _error_text(resp)
+    if len(resp.data) < block.layout.size:
+        return None, "返回数据不足"
+    decoded = block.decode_data(resp.data)
+    results = {}
+    for reg in block.registers:
+        raw_hex = format_raw_hex(reg, block.raw(resp.values, reg))
+        results[(reg.reg_type, reg.address)] = (decoded[reg.address], raw_hex, "")
+    return results, ""
+
+
+def read_block(sp: SerialPort, mb: ModbusRTU, slave_id: int, block: RegisterBlock):
+    """
+    块读，返回 ({(类型, 地址): (decoded_value, raw_hex, error_text)}, 事务数)。
+    块被拒绝时逐个寄存器重读，定位出错的寄存器。
+    """
+    results, err = _read_block(sp, mb, slave_id, block)
+    if not err:
+        return results, 1
+    if len(block.registers) == 1:
+        return {(block.reg_type, block.address): (None, "", err)}, 1
+    results = {}
+    for reg in block.registers:
+        single = RegisterBlock(reg.reg_type, reg.address, reg.count, (reg,))
+        reg_results, err = _read_block(sp, mb, slave_id, single)
+        if err:
+            results[(reg.reg_type, reg.address)] = (None, "", err)
+        else:
+            results.update(reg_results)
+    return results, 1 + len(block.registers)
+
+
+def read_all(sp: SerialPort, mb: ModbusRTU, slave_id: int, registers: list[RegisterDef],
+             max_gap: int = 0):
+    """
+    按块读取寄存器表（命令型寄存器不读），
+    返回 ({(类型, 地址): (decoded, raw_hex, error)}, 事务数)
+    """
+    results: dict[tuple[RegisterType, int], tuple] = {}
+    transactions = 0
+    for block in plan_block_reads(registers, max_gap=max_gap):
+        block_results, n = read_block(sp, mb, slave_id, block)
+        results.update(block_results)
+        transactions += n
+    return results, transactions
 
 
 def render_md(slave_id: int, baud: int, port: str,
@@ -113,7 +178,8 @@ def render_md(slave_id: int, baud: int, port: str,
         f"- 波特率: {baud}",
         "",
         "> 用途：作为正常驱动器的参考基线，与异常驱动器逐项比对。",
-        "> `匹配默认` 列：✓ = 与手册默认值一致；⚠ = 与默认值不同（可能是已校准的现场参数，不一定是问题）。",
+        "> `匹配默认` 列：✓ = 与手册默认值一致；"
+        "⚠ = 与默认值不同（可能是已校准的现场参数，不一定是问题）。",
         "",
         "## 保持寄存器（EEPROM 可写参数）",
         "",
@@ -121,22 +187,26 @@ def render_md(slave_id: int, baud: int, port: str,
         "|------|------|--------|--------|--------|----------|------|------|",
     ]
     for r in holding_rows:
+        addr = f"0x{r['address']:04X}"
         default = "—" if r["default"] is None else str(r["default"])
+        unit = r["unit"] or "—"
         desc = r["description"].replace("|", "\\|").replace("\n", " ")
         name = r["name"]
         if r["error"]:
             lines.append(
-                f"| 0x{r['address']:04X} | {name} | — | **读取失败:** {r['error']} | {default} | — | {r['unit'] or '—'} | {desc} |"
+                f"| {addr} | {name} | — | **读取失败:** {r['error']} | {default} | — "
+                f"| {unit} | {desc} |"
             )
             continue
         if r["is_command"]:
-            note = f"{r['raw_hex']} (命令型寄存器)"
             lines.append(
-                f"| 0x{r['address']:04X} | {name} | {r['raw_hex']} | {note} | {default} | — | {r['unit'] or '—'} | {desc} |"
+                f"| {addr} | {name} | — | (命令型寄存器，未读取) | {default} | — "
+                f"| {unit} | {desc} |"
             )
             continue
         lines.append(
-            f"| 0x{r['address']:04X} | {name} | {r['raw_hex']} | {r['value']} | {default} | {r['match']} | {r['unit'] or '—'} | {desc} |"
+            f"| {addr} | {name} | {r['raw_hex']} | {r['value']} | {default} | {r['match']} "
+            f"| {unit} | {desc} |"
         )
 
     lines += [
@@ -147,16 +217,14 @@ def render_md(slave_id: int, baud: int, port: str,
         "|------|------|--------|--------|------|------|",
     ]
     for r in input_rows:
+        addr = f"0x{r['address']:04X}"
+        unit = r["unit"] or "—"
         desc = r["description"].replace("|", "\\|").replace("\n", " ")
         name = r["name"]
         if r["error"]:
-            lines.append(
-                f"| 0x{r['address']:04X} | {name} | — | **读取失败:** {r['error']} | {r['unit'] or '—'} | {desc} |"
-            )
+            lines.append(f"| {addr} | {name} | — | **读取失败:** {r['error']} | {unit} | {desc} |")
             continue
-        lines.append(
-            f"| 0x{r['address']:04X} | {name} | {r['raw_hex']} | {r['value']} | {r['unit'] or '—'} | {desc} |"
-        )
+        lines.append(f"| {addr} | {name} | {r['raw_hex']} | {r['value']} | {unit} | {desc} |")
 
     # 报警/错误码解读
     lines += ["", "## 报警解读", ""]
@@ -184,6 +252,9 @@ def main() -> int:
     ap.add_argument("--slave", type=int, default=1, help="从站地址 (默认 1)")
     ap.add_argument("--baud", type=int, default=115200, help="波特率 (默认 115200)")
     ap.add_argument("--out", default="reports/params_baseline.md", help="输出 Markdown 路径")
+    ap.add_argument("--gap", type=int, default=0,
+                    help="块内允许夹带的未定义地址数 (默认 0 为 15 次事务；"
+                         "从站不拒绝时 4 为 9 次、8 为 6 次)")
     args = ap.parse_args()
 
     out_path = (ROOT / args.out).resolve()
@@ -194,12 +265,19 @@ def main() -> int:
     mb = ModbusRTU()
 
     print(f"连接 {args.port} @ {args.baud}, slave={args.slave}")
-    print(f"开始读取 {len(HOLDING_REGISTERS)} 个保持寄存器...")
+    started = time.perf_counter()
+    results, transactions = read_all(
+        sp, mb, args.slave, HOLDING_REGISTERS + INPUT_REGISTERS, max_gap=args.gap,
+    )
+    elapsed = time.perf_counter() - started
+    sp.close()
+    print(f"读取完成: {transactions} 次事务, {elapsed:.2f} s")
 
+    print(f"\n{len(HOLDING_REGISTERS)} 个保持寄存器:")
     holding_rows = []
     for reg in HOLDING_REGISTERS:
         is_cmd = reg.address in COMMAND_ONLY_ADDRS
-        decoded, raw_hex, err = read_register(sp, mb, args.slave, reg)
+        decoded, raw_hex, err = results.get((RegisterType.HOLDING, reg.address), (None, "", ""))
         row = {
             "address": reg.address,
             "name": reg.name,
@@ -217,10 +295,10 @@ def main() -> int:
         status = "OK" if not err else f"ERR({err})"
         print(f"  0x{reg.address:04X} {reg.name:<20} {row['raw_hex']:>12}  {status}")
 
-    print(f"\n开始读取 {len(INPUT_REGISTERS)} 个输入寄存器...")
+    print(f"\n{len(INPUT_REGISTERS)} 个输入寄存器:")
     input_rows = []
     for reg in INPUT_REGISTERS:
-        decoded, raw_hex, err = read_register(sp, mb, args.slave, reg)
+        decoded, raw_hex, err = results.get((RegisterType.INPUT, reg.address), (None, "", ""))
         row = {
             "address": reg.address,
             "name": reg.name,
@@ -235,8 +313,6 @@ def main() -> int:
         status = "OK" if not err else f"ERR({err})"
         print(f"  0x{reg.address:04X} {reg.name:<22} {row['raw_hex']:>12}  {status}")
 
-    sp.close()
-
     md = render_md(args.slave, args.baud, args.port, holding_rows, input_rows)
     out_path.write_text(md, encoding="utf-8")
     print(f"\n报告已保存: {out_path}")
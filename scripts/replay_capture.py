@@ -0,0 +1,119 @@
+"""把抓包文件中的请求流回放到虚拟驱动器，输出延迟与吞吐报告。
+
+用法:
+    python scripts/replay_capture.py session.nimcap [--speed 1.0 | --fast] [--window 1]
+        [--slave 1] [--baud 115200] [--port /dev/ttyUSB0] [--json report.json]
+
+缺省在 pty 上启动与抓包中从站地址相同的虚拟驱动器；--port 可改为回放到真实串口。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+from pathlib import Path
+
+# 让脚本在仓库根目录直接运行
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from PyQt5.QtCore import QCoreApplication
+
+from nimotion.communication.capture import CaptureReader
+from nimotion.communication.replay import Replayer, ReplayReport, load_session
+from nimotion.communication.serial_port import SerialConfig
+from nimotion.communication.worker import CommWorker
+from nimotion.simulator import DriveServer, SimulatedDrive
+
+
+def _print_hist(name: str, snap: dict) -> None:
+    print(
+        f"  {name:<10} n={snap['count']:<8} p50={snap['p50_ms']:7.2f}  "
+        f"p99={snap['p99_ms']:7.2f}  max={snap['max_ms']:7.2f} ms"
+    )
+
+
+def _run_in_thread(app: QCoreApplication, replayer: Replayer, items) -> ReplayReport:
+    """
+    Replayer.run 会阻塞等待响应，放到后台线程执行；
+    主线程继续处理 Qt 事件，通讯线程投递的回调与事件不会积压。
+    """
+    reports: list[ReplayReport] = []
+    errors: list[BaseException] = []
+
+    def target() -> None:
+        try:
+            reports.append(replayer.run(
+                items, progress=lambda r: print(f"  ... {r.requests} 条", end="\r"),
+            ))
+        except BaseException as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=target, name="replay")
+    thread.start()
+    while thread.is_alive():
+        app.processEvents()
+        thread.join(0.02)
+    app.processEvents()
+    if errors:
+        raise errors[0]
+    return reports[0]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="抓包回放基准")
+    ap.add_argument("capture", help="抓包文件 (.nimcap)")
+    ap.add_argument("--speed", type=float, default=1.0, help="相对原始节奏的倍速")
+    ap.add_argument("--fast", action="store_true", help="忽略原始节奏，尽快发送")
+    ap.add_argument("--window", type=int, default=1, help="最多在途请求数")
+    ap.add_argument("--slave", type=int, default=None, help="只回放该从站的请求")
+    ap.add_argument("--baud", type=int, default=None, help="波特率，缺省取抓包文件头")
+    ap.add_argument("--port", default=None, help="回放到该串口而非虚拟驱动器")
+    ap.add_argument("--json", default=None, help="报告另存为 JSON")
+    args = ap.parse_args()
+
+    app = QCoreApplication(sys.argv)  # QThread 需要应用对象
+    reader = CaptureReader(args.capture)
+    baudrate = args.baud or reader.baudrate or 115200
+    server = None
+    port = args.port
+    if port is None:
+        slaves = sorted({item.request.slave_id for item in load_session(reader, args.slave)})
+        server = DriveServer([SimulatedDrive(s) for s in slaves if s] or None, baudrate=baudrate)
+        port = server.start()
+
+    worker = CommWorker()
+    errors: list[str] = []
+    worker.connection_error.connect(errors.append)
+    worker.connect_port(SerialConfig(port=port, baudrate=baudrate))
+    if errors:
+        print(f"无法打开 {port}: {errors[0]}")
+        return 1
+    replayer = Replayer(worker, speed=None if args.fast else args.speed, window=args.window)
+    print(f"回放 {args.capture} ({len(reader)} 帧) → {port}")
+    try:
+        report = _run_in_thread(app, replayer, load_session(reader, args.slave))
+    finally:
+        worker.disconnect_port()
+        if server is not None:
+            server.stop()
+        reader.close()
+
+    snap = report.snapshot()
+    print(
+        f"请求 {snap['requests']}  成功 {snap['ok']}  错误 {snap['errors']}  "
+        f"与抓包不一致 {snap['mismatches']}"
+    )
+    print(f"耗时 {snap['duration_s']:.2f} s  吞吐 {snap['throughput']:.1f} 事务/s")
+    _print_hist("事务", snap["latency"])
+    _print_hist("响应", snap["response"])
+    _print_hist("抓包响应", snap["captured_response"])
+    if args.json:
+        Path(args.json).write_text(json.dumps(snap, indent=2, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""在 pty 上启动虚拟驱动器，供 GUI / 脚本在无硬件时连接。
+
+用法:
+    python scripts/run_simulator.py [--slaves 1 2 3] [--baud 115200] [--di1 -2000] [--delay-ms 0]
+
+启动后打印串口路径（如 /dev/pts/5），在界面或脚本中按该路径连接即可。
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# 让脚本在仓库根目录直接运行
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from nimotion.simulator import DriveServer, SimulatedDrive
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NiMotion 虚拟驱动器")
+    parser.add_argument("--slaves", type=int, nargs="+", default=[1], help="从站地址")
+    parser.add_argument("--baud", type=int, default=115200, help="模拟波特率（决定 t3.5）")
+    parser.add_argument("--di1", type=int, default=None, help="DI1 开关位置（脉冲），缺省无开关")
+    parser.add_argument("--delay-ms", type=float, default=0.0, help="附加应答延时（毫秒）")
+    args = parser.parse_args()
+
+    drives = [SimulatedDrive(slave_id) for slave_id in args.slaves]
+    for drive in drives:
+        drive.di1_position = args.di1
+    server = DriveServer(drives, baudrate=args.baud, response_delay=args.delay_ms / 1000)
+    port = server.start()
+    print(f"虚拟驱动器已启动: {port}  从站 {args.slaves}  (Ctrl+C 退出)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
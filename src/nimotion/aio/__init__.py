@@ -0,0 +1,10 @@
+"""
+无 Qt 的 asyncio 通讯接口，供产线控制器等无界面程序使用。
+本包不导入 PyQt5。
+"""
+
+from .client import AsyncModbusClient, ModbusError
+from .motor import AsyncMotor
+from .transport import AsyncSerialTransport
+
+__all__ = ["AsyncModbusClient", "AsyncMotor", "AsyncSerialTransport", "ModbusError"]
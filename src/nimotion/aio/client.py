@@ -0,0 +1,133 @@
+"""
+asyncio Modbus-RTU 客户端。
+请求/响应模型与 CommWorker 相同（ModbusRequest -> ModbusResponse），
+便捷读写方法在失败时抛出 ModbusError。
+"""
+
+from __future__ import annotations
+
+import time
+
+from ..communication.modbus_rtu import ModbusRTU
+from ..communication.serial_port import SerialConfig
+from ..models.error_codes import COMM_ERRORS, get_exception_text
+from ..models.types import FunctionCode, ModbusRequest, ModbusResponse
+from .transport import AsyncSerialTransport
+
+
+class ModbusError(IOError):
+    """Modbus 事务失败（超时/CRC/从站异常）"""
+
+    def __init__(self, request: ModbusRequest, response: ModbusResponse) -> None:
+        if response.error_code < 0:
+            reason = COMM_ERRORS.get(response.error_code, f"通讯错误 ({response.error_code})")
+        else:
+            reason = f"Modbus 异常: {get_exception_text(response.error_code)}"
+        super().__init__(
+            f"{reason} [从站 {request.slave_id} 功能码 0x{int(request.function_code):02X}"
+            f" 地址 0x{request.address:04X}]"
+        )
+        self.request = request
+        self.response = response
+
+
+class AsyncModbusClient:
+    """异步 Modbus 主站"""
+
+    def __init__(self, transport: AsyncSerialTransport | None = None) -> None:
+        self._transport = transport or AsyncSerialTransport()
+        self._modbus = ModbusRTU()
+
+    @classmethod
+    async def connect(cls, config: SerialConfig) -> AsyncModbusClient:
+        """打开串口并返回客户端"""
+        client = cls()
+        await client._transport.open(config)
+        return client
+
+    @property
+    def transport(self) -> AsyncSerialTransport:
+        return self._transport
+
+    def close(self) -> None:
+        self._transport.close()
+
+    async def __aenter__(self) -> AsyncModbusClient:
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        self.close()
+
+    async def transact(
+        self, request: ModbusRequest, timeout: float | None = None
+    ) -> ModbusResponse:
+        """
+        完成一次请求-响应往返，错误以 error_code 表示（与 CommWorker 相同）。
+        timeout 缺省取 request.timeout，均为 None 时按串口配置
+        """
+        encoded = self._modbus.encode(request)
+        frame = encoded.frame
+        if timeout is None:
+            timeout = request.timeout
+        raw_rx, crc_ok = await self._transport.transact(frame, timeout)
+        if not raw_rx:
+            return ModbusResponse(
+                slave_id=request.slave_id,
+                function_code=request.function_code,
+                data=b"",
+                is_error=True,
+                error_code=-2,  # 超时
+                raw_tx=frame,
+                timestamp=time.time(),
+            )
+        if crc_ok is None:
+            return ModbusResponse(
+                slave_id=raw_rx[0],
+                function_code=request.function_code,
+                data=b"",
+                is_error=True,
+                error_code=-3,  # 帧不完整
+                raw_tx=frame,
+                raw_rx=raw_rx,
+                timestamp=time.time(),
+            )
+        resp = self._modbus.parse_expected(raw_rx, request, encoded, crc_ok)
+        resp.raw_tx = frame
+        return resp
+
+    async def request(self, request: ModbusRequest) -> ModbusResponse:
+        """执行请求，失败抛出 ModbusError"""
+        resp = await self.transact(request)
+        if resp.is_error:
+            raise ModbusError(request, resp)
+        return resp
+
+    async def read_holding(self, slave_id: int, address: int, count: int = 1) -> list[int]:
+        """0x03 读保持寄存器"""
+        resp = await self.request(
+            ModbusRequest(slave_id, FunctionCode.READ_HOLDING, address, count)
+        )
+        return resp.values
+
+    async def read_input(self, slave_id: int, address: int, count: int = 1) -> list[int]:
+        """0x04 读输入寄存器"""
+        resp = await self.request(
+            ModbusRequest(slave_id, FunctionCode.READ_INPUT, address, count)
+        )
+        return resp.values
+
+    async def write_single(
+        self, slave_id: int, address: int, value: int, timeout: float | None = None,
+    ) -> None:
+        """0x06 写单个保持寄存器（timeout: 应答超时，None 按串口配置）"""
+        await self.request(ModbusRequest(
+            slave_id, FunctionCode.WRITE_SINGLE, address, values=[value & 0xFFFF],
+            timeout=timeout,
+        ))
+
+    async def write_multiple(self, slave_id: int, address: int, values: list[int]) -> None:
+        """0x10 写连续多个保持寄存器"""
+        await self.request(ModbusRequest(
+            slave_id, FunctionCode.WRITE_MULTIPLE, address,
+            count=len(values), values=[v & 0xFFFF for v in values],
+        ))
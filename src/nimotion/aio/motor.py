@@ -0,0 +1,177 @@
+"""
+asyncio 电机操作。
+方法与 MotorService 一一对应，改为协程：写命令等待从站确认后返回，
+读操作直接返回结果，失败抛出 ModbusError。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+from ..communication.modbus_rtu import ModbusRTU
+from ..models.status import STATUS_ADDR, STATUS_COUNT, parse_status_data
+from ..models.types import FunctionCode, ModbusRequest, MotorStatus, RunMode
+from .client import AsyncModbusClient
+
+
+class AsyncMotor:
+    """单个从站电机"""
+
+    # 写 EEPROM 的命令（保存参数/恢复默认）应答慢，单独给足超时
+    EEPROM_TIMEOUT = 2.0
+
+    def __init__(self, client: AsyncModbusClient, slave_id: int = 1) -> None:
+        self._client = client
+        self.slave_id = slave_id
+        self.last_status: MotorStatus | None = None
+
+    # -- 状态查询 --
+
+    async def refresh_status(self) -> MotorStatus:
+        """一次批量读取 0x17~0x26 输入寄存器并解析"""
+        resp = await self._client.request(
+            ModbusRequest(self.slave_id, FunctionCode.READ_INPUT, STATUS_ADDR, STATUS_COUNT)
+        )
+        status = parse_status_data(resp.data)
+        if status is None:
+            raise IOError(f"状态寄存器数量不足: {len(resp.data) // 2}")
+        self.last_status = status
+        return status
+
+    async def wait_idle(self, timeout: float = 30.0, interval: float = 0.05) -> MotorStatus:
+        """轮询状态直到运动结束（状态字 bit12 清零），超时抛出 TimeoutError"""
+        deadline = time.monotonic() + timeout
+        while True:
+            status = await self.refresh_status()
+            if not status.is_running:
+                return status
+            if time.monotonic() >= deadline:
+                raise TimeoutError("等待运动结束超时")
+            await asyncio.sleep(interval)
+
+    # -- 状态机控制 --
+
+    async def startup(self) -> None:
+        """无故障 -> 启动"""
+        await self._write_control_word(0x0006)
+
+    async def enable(self) -> None:
+        """启动 -> 使能"""
+        await self._write_control_word(0x0007)
+
+    async def run(self) -> None:
+        """使能 -> 运行"""
+        await self._write_control_word(0x000F)
+
+    async def stop(self) -> None:
+        """运行 -> 使能（减速停机）"""
+        await self._write_control_word(0x0007)
+
+    async def quick_stop(self) -> None:
+        """紧急停机"""
+        await self._write_control_word(0x0002)
+
+    async def disable(self) -> None:
+        """回到无故障状态"""
+        await self._write_control_word(0x0000)
+
+    async def clear_fault(self) -> None:
+        """清除故障"""
+        await self._write_control_word(0x0080)
+
+    # -- 运动控制 --
+
+    async def move_relative(self, position: int) -> None:
+        """相对位置运动（方向由 0x0052 决定，0x0053 只写正的幅值）"""
+        await self._write_control_word(0x0000)  # 先停机
+        await self._write_single(0x0039, int(RunMode.POSITION))  # 设置位置模式
+        await self._write_single(0x0052, 1 if position >= 0 else 0)  # 运行方向
+        await self._write_32bit(0x0053, abs(position))  # 步长幅值(必须为正)
+        await self._write_control_word(0x0006)  # 启动
+        await self._write_control_word(0x0007)  # 使能
+        await self._write_control_word(0x004F)  # 相对模式 + 运行
+        await self._write_control_word(0x005F)  # 触发新位置
+
+    async def move_absolute(self, position: int) -> None:
+        """绝对位置运动"""
+        await self._write_control_word(0x0000)  # 先停机
+        await self._write_single(0x0039, int(RunMode.POSITION))  # 设置位置模式
+        await self._write_32bit(0x0053, position)
+        await self._write_control_word(0x0006)  # 启动
+        await self._write_control_word(0x0007)  # 使能
+        await self._write_control_word(0x000F)  # 绝对模式 + 运行
+        await self._write_control_word(0x001F)  # 触发新位置
+
+    async def set_speed(self, speed: int, direction: int) -> None:
+        """速度模式运行"""
+        await self._write_control_word(0x0000)  # 先停机
+        await self._write_single(0x0039, int(RunMode.SPEED))  # 设置速度模式
+        await self._write_single(0x0052, direction)
+        await self._write_32bit(0x0055, speed)
+        await self._write_control_word(0x0006)  # 启动
+        await self._write_control_word(0x0007)  # 使能
+        await self._write_control_word(0x000F)  # 运行
+
+    async def start_homing(self) -> None:
+        """开始原点回归（不检查配置，直接启动）"""
+        await self._write_control_word(0x0006)  # 启动
+        await self._write_single(0x0039, int(RunMode.HOMING))  # 设置原点回归模式
+        await self._write_control_word(0x0006)  # 启动
+        await self._write_control_word(0x0007)  # 使能
+        await self._write_control_word(0x000F)  # 运行
+        await self._write_control_word(0x001F)  # 触发
+
+    # -- 参数操作 --
+
+    async def read_param(self, address: int, count: int = 1) -> list[int]:
+        """读取保持寄存器"""
+        return await self._client.read_holding(self.slave_id, address, count)
+
+    async def read_param_32bit(self, address: int, signed: bool = False) -> int:
+        """读取 32 位参数（2 个寄存器，高位在前）"""
+        high, low = await self._client.read_holding(self.slave_id, address, 2)
+        return ModbusRTU.combine_32bit(high, low, signed)
+
+    async def write_param(self, address: int, value: int) -> None:
+        """写入单个保持寄存器"""
+        await self._write_single(address, value)
+
+    async def write_param_32bit(self, address: int, value: int) -> None:
+        """写入 32 位参数（2 个寄存器）"""
+        await self._write_32bit(address, value)
+
+    async def save_params(self) -> None:
+        """保存所有参数到 EEPROM"""
+        await self._write_single(0x0008, 0x7376, timeout=self.EEPROM_TIMEOUT)
+
+    async def restore_defaults(self) -> None:
+        """恢复出厂默认参数"""
+        await self._write_single(0x000B, 0x6C64, timeout=self.EEPROM_TIMEOUT)
+
+    async def set_run_mode(self, mode: RunMode) -> None:
+        """设置运行模式"""
+        await self._write_single(0x0039, int(mode))
+
+    async def set_origin(self) -> None:
+        """设置原点"""
+        await self._write_single(0x0048, 0x5348)
+
+    async def set_zero(self) -> None:
+        """设置零点"""
+        await self._write_single(0x0047, 0x535A)
+
+    # -- 内部方法 --
+
+    async def _write_control_word(self, value: int) -> None:
+        await self._write_single(0x0051, value)
+
+    async def _write_single(
+        self, address: int, value: int, timeout: float | None = None,
+    ) -> None:
+        await self._client.write_single(self.slave_id, address, value, timeout)
+
+    async def _write_32bit(self, address: int, value: int) -> None:
+        await self._client.write_multiple(
+            self.slave_id, address, list(ModbusRTU.split_32bit(value)),
+        )
@@ -0,0 +1,148 @@
+"""
+asyncio 串口传输。
+POSIX 上用 loop.add_reader 监听串口 fd，收发不占线程；
+取不到 fd（如 Windows）时退回线程池中的阻塞读取。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from ..communication.frame_receiver import FrameReceiver
+from ..communication.serial_port import (
+    SerialConfig,
+    SerialPort,
+    char_time,
+    frame_time,
+    silent_interval,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSerialTransport:
+    """
+    异步 RTU 帧收发。
+    同一时刻只进行一次请求-响应往返（内部加锁），帧间保持 t3.5 静默，
+    响应按帧头推算的帧长或 t3.5 静默断帧，与 CommWorker 行为一致。
+    """
+
+    READ_CHUNK = 256
+
+    def __init__(self, port: SerialPort | None = None) -> None:
+        self._port = port or SerialPort()
+        self._receiver = FrameReceiver()
+        self._lock = asyncio.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._fd: int | None = None  # 已注册 add_reader 的 fd
+        self._rx = bytearray()
+        self._rx_event = asyncio.Event()
+        self._bus_idle_at = 0.0
+        self.turnaround = 0.0  # 最近一次从站响应时间（秒）
+
+    @property
+    def is_open(self) -> bool:
+        return self._port.is_open
+
+    @property
+    def config(self) -> SerialConfig:
+        return self._port.config
+
+    async def open(self, config: SerialConfig) -> None:
+        """打开串口并注册读事件"""
+        self.close()
+        self._port.open(config)
+        self._loop = asyncio.get_running_loop()
+        fd = self._port.fileno()
+        if fd is None:
+            return
+        try:
+            self._loop.add_reader(fd, self._on_readable)
+        except NotImplementedError:
+            # Windows Proactor 等不支持 fd 监听的事件循环
+            return
+        self._fd = fd
+
+    def close(self) -> None:
+        """注销读事件并关闭串口"""
+        if self._fd is not None and self._loop is not None:
+            self._loop.remove_reader(self._fd)
+        self._fd = None
+        self._port.close()
+        self._rx.clear()
+
+    def _on_readable(self) -> None:
+        try:
+            data = self._port.read(self.READ_CHUNK, timeout=0)
+        except OSError as e:
+            # 设备拔出: fd 持续可读却读不到数据，注销避免空转
+            logger.warning("串口读取失败，停止监听: %s", e)
+            if self._loop is not None and self._fd is not None:
+                self._loop.remove_reader(self._fd)
+            self._fd = None
+            data = b""
+        if data:
+            self._rx += data
+        self._rx_event.set()
+
+    async def _read(self, size: int, timeout: float) -> bytes:
+        """读取至多 size 字节；timeout 内无任何数据返回空"""
+        if self._fd is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self._port.read, size, timeout)
+        if not self._rx:
+            self._rx_event.clear()
+            try:
+                await asyncio.wait_for(self._rx_event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return b""
+        data = bytes(self._rx[:size])
+        del self._rx[:size]
+        return data
+
+    async def _wait_frame_gap(self) -> None:
+        config = self._port.config
+        gap = max(silent_interval(config.baudrate), config.frame_gap_floor)
+        remaining = self._bus_idle_at + gap - time.perf_counter()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+
+    async def transact(
+        self, frame: bytes, timeout: float | None = None
+    ) -> tuple[bytes, bool | None]:
+        """
+        发送一帧并接收响应。
+
+        参数:
+            frame: 完整请求帧（含 CRC）
+            timeout: 等待响应首字节的超时（秒），None 取串口配置
+
+        返回: (收到的字节, CRC 是否正确)；帧不完整时 CRC 为 None
+        """
+        if not self.is_open:
+            raise IOError("串口未打开")
+        config = self._port.config
+        async with self._lock:
+            await self._wait_frame_gap()
+            self._port.flush_input()
+            self._rx.clear()
+            written = self._port.write(frame)
+            tx_end = time.perf_counter() + frame_time(config.baudrate, written)
+
+            rx = self._receiver
+            rx.reset()
+            silence = max(silent_interval(config.baudrate), config.rx_silence_floor)
+            per_char = char_time(config.baudrate)
+            wait = config.timeout if timeout is None else timeout
+            while not rx.done:
+                data = await self._read(rx.needed if rx.received else 1, wait)
+                if not data:
+                    break
+                if not rx.received:
+                    self.turnaround = max(time.perf_counter() - tx_end, 0.0)
+                rx.feed(data)
+                wait = rx.needed * per_char + silence
+            self._bus_idle_at = time.perf_counter()
+            return rx.frame, (rx.crc_ok if rx.done else None)
@@ -0,0 +1,105 @@
+"""
+从站熔断。
+按从站统计连续超时，达到阈值即判定掉线（熔断）：该从站排队中的请求立即失败，
+新请求不再上线，改为定期发送一帧廉价探测，收到任何应答即恢复。
+掉线从站不再拖住总线，同一总线上的其它从站照常全速通讯。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from ..models.types import FunctionCode, ModbusRequest
+
+# 探测帧: 读输入寄存器 0x001F 运动状态字（1 个寄存器）
+PROBE_ADDR = 0x001F
+# 从站熔断期间未发送即失败的请求的错误码（与 ModbusResponse.error_code 一致）
+SLAVE_OFFLINE = -7
+
+
+@dataclass
+class _SlaveHealth:
+    timeouts: int = 0  # 连续超时次数
+    open: bool = False  # 已熔断
+    next_probe: float = 0.0  # 下一次探测时刻 (perf_counter)
+    probes: int = 0  # 熔断后已发送的探测次数
+
+
+class CircuitBreaker:
+    """
+    按从站的熔断器（非线程安全，由 CommWorker 在互斥锁内调用）。
+    只有超时（完全无应答）计入；异常应答、CRC 错误说明从站在线，清零计数。
+    """
+
+    THRESHOLD = 3  # 连续超时多少次后熔断
+    PROBE_INTERVAL = 0.5  # 探测间隔（秒）
+    PROBE_TIMEOUT = 0.1  # 探测帧等待响应的上限（秒）；CommWorker 按自适应估计缩短
+
+    def __init__(
+        self,
+        threshold: int = THRESHOLD,
+        probe_interval: float = PROBE_INTERVAL,
+        probe_timeout: float = PROBE_TIMEOUT,
+    ) -> None:
+        self.threshold = max(threshold, 1)
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self._slaves: dict[int, _SlaveHealth] = {}
+
+    def is_open(self, slave_id: int) -> bool:
+        """该从站是否已熔断"""
+        health = self._slaves.get(slave_id)
+        return health is not None and health.open
+
+    @property
+    def open_slaves(self) -> list[int]:
+        return sorted(s for s, h in self._slaves.items() if h.open)
+
+    def record_success(self, slave_id: int) -> bool:
+        """记录一次有应答的事务，返回是否由此恢复"""
+        health = self._slaves.pop(slave_id, None)
+        return health is not None and health.open
+
+    def record_timeout(self, slave_id: int, now: float) -> bool:
+        """记录一次超时，返回是否由此熔断"""
+        health = self._slaves.get(slave_id)
+        if health is None:
+            health = self._slaves[slave_id] = _SlaveHealth()
+        health.timeouts += 1
+        if health.open:
+            health.next_probe = now + self.probe_interval
+            return False
+        if health.timeouts < self.threshold:
+            return False
+        health.open = True
+        health.next_probe = now + self.probe_interval
+        return True
+
+    def due_probe(self, now: float) -> ModbusRequest | None:
+        """到期的探测请求（每次最多一个）；无到期探测返回 None"""
+        for slave_id, health in self._slaves.items():
+            if health.open and now >= health.next_probe:
+                # 探测失败前先排到下一周期，避免同一从站连续占用总线
+                health.next_probe = now + self.probe_interval
+                health.probes += 1
+                return ModbusRequest(
+                    slave_id, FunctionCode.READ_INPUT, PROBE_ADDR, 1,
+                    timeout=self.probe_timeout,
+                )
+        return None
+
+    def next_probe_in(self, now: float) -> float | None:
+        """距最近一次探测的秒数，无熔断从站时为 None"""
+        times = [h.next_probe for h in self._slaves.values() if h.open]
+        if not times:
+            return None
+        return max(min(times) - now, 0.0)
+
+    def snapshot(self) -> dict[int, dict[str, int | bool]]:
+        return {
+            slave_id: {"timeouts": h.timeouts, "open": h.open, "probes": h.probes}
+            for slave_id, h in sorted(self._slaves.items())
+        }
+
+    def reset(self) -> None:
+        self._slaves.clear()
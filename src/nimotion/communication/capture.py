@@ -0,0 +1,339 @@
+"""
+总线报文抓包。
+
+数据文件（.nimcap，只追加）:
+    文件头 32 字节: 魔数 "NIMCAP01" | 版本 u16 | 保留 u16 | 波特率 u32
+                    | 起始单调时钟 ns u64 | 起始墙钟 ns u64
+    记录: 时间戳 ns u64 | 方向 u8 | 从站 u8 | 长度 u16 | 报文
+索引文件（.nimcap.idx，与数据同步追加）:
+    每条记录 20 字节: 时间戳 u64 | 数据文件偏移 u64 | 方向 u8 | 从站 u8 | 长度 u16
+
+时间戳取 time.perf_counter_ns，与 ModbusResponse.trace 同一时钟；
+文件头的起始时钟对可换算为墙钟时间。全部小端。
+
+CaptureWriter 在后台线程落盘，通讯线程只做一次入队。
+CaptureReader 用 mmap 打开，按时间二分定位、按从站/方向筛选，不把文件读入内存；
+装有 numpy 时索引以结构化数组零拷贝访问，否则按需从 mmap 逐条 struct 解码。
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from operator import itemgetter
+from pathlib import Path
+from types import ModuleType
+from typing import Any, BinaryIO, Iterator
+
+np: ModuleType | None
+try:
+    import numpy as np
+except ImportError:  # numpy 为可选依赖
+    np = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"NIMCAP01"
+VERSION = 1
+TX = 0  # 主站发出
+RX = 1  # 从站应答
+
+_HEADER = struct.Struct("<8sHHIQQ")
+_RECORD = struct.Struct("<QBBH")
+_INDEX = struct.Struct("<QQBBH")
+
+if np is not None:
+    _INDEX_DTYPE = np.dtype([
+        ("ts", "<u8"), ("offset", "<u8"), ("direction", "u1"), ("slave", "u1"), ("length", "<u2"),
+    ])
+
+
+def index_path(path: str | os.PathLike) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + ".idx")
+
+
+_entry_ts = itemgetter(0)
+
+
+class _IndexEntries:
+    """无 numpy 时的索引视图：第 i 项按需从缓冲区解码，不把整个索引读入内存"""
+
+    __slots__ = ("_buf", "_count")
+
+    def __init__(self, buf: mmap.mmap, count: int) -> None:
+        self._buf = buf
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> tuple[int, int, int, int, int]:
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        return _INDEX.unpack_from(self._buf, i * _INDEX.size)
+
+
+@dataclass(frozen=True)
+class CaptureRecord:
+    """一条抓包记录"""
+
+    ts_ns: int
+    direction: int  # TX / RX
+    slave_id: int
+    data: bytes
+
+
+class CaptureWriter:
+    """
+    后台线程写抓包文件。
+    write() 只入队不阻塞；队列满（磁盘跟不上）时丢弃并计数，不拖慢通讯线程。
+    """
+
+    QUEUE_SIZE = 65536
+    FLUSH_INTERVAL = 0.5  # 秒，进程异常退出最多丢失这段时间的数据
+
+    def __init__(self, path: str | os.PathLike, baudrate: int = 0) -> None:
+        self.path = Path(path)
+        self.dropped = 0
+        self.written = 0
+        self._queue: queue.Queue = queue.Queue(self.QUEUE_SIZE)
+        self._closed = False
+        self._data = open(self.path, "wb")
+        self._index = open(index_path(self.path), "wb")
+        self._data.write(_HEADER.pack(
+            MAGIC, VERSION, 0, baudrate, time.perf_counter_ns(), time.time_ns(),
+        ))
+        self._offset = _HEADER.size
+        self._thread = threading.Thread(target=self._run, name="capture-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, direction: int, data: bytes, ts_ns: int | None = None) -> None:
+        """记录一帧（任意线程调用）"""
+        if self._closed or not data:
+            return
+        if ts_ns is None:
+            ts_ns = time.perf_counter_ns()
+        try:
+            self._queue.put_nowait((ts_ns, direction, data))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        """写完队列中剩余记录后关闭文件"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._data.close()
+        self._index.close()
+        if self.dropped:
+            logger.warning("抓包队列溢出，丢弃 %d 帧", self.dropped)
+
+    def __enter__(self) -> CaptureWriter:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def _run(self) -> None:
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                item = ()
+            if item is None:
+                break
+            if item:
+                self._append(*item)
+            # 一次写出队列中已积压的记录
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._flush()
+                    return
+                self._append(*item)
+            now = time.monotonic()
+            if now - last_flush >= self.FLUSH_INTERVAL:
+                self._flush()
+                last_flush = now
+        self._flush()
+
+    def _append(self, ts_ns: int, direction: int, data: bytes) -> None:
+        length = min(len(data), 0xFFFF)
+        slave = data[0]
+        self._data.write(_RECORD.pack(ts_ns, direction, slave, length))
+        self._data.write(data[:length])
+        self._index.write(_INDEX.pack(ts_ns, self._offset, direction, slave, length))
+        self._offset += _RECORD.size + length
+        self.written += 1
+
+    def _flush(self) -> None:
+        # 先落数据再落索引，索引不会指向未写出的数据
+        self._data.flush()
+        self._index.flush()
+
+
+class CaptureReader:
+    """
+    抓包文件只读访问。
+    索引文件缺失或不完整（如进程崩溃）时扫描数据文件重建，仅在内存中。
+    """
+
+    def __init__(self, path: str | os.PathLike) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size < _HEADER.size:
+            self._file.close()
+            raise ValueError(f"不是抓包文件: {self.path}")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.baudrate: int
+        self.start_ns: int
+        self.start_wall_ns: int
+        magic, version, _, self.baudrate, self.start_ns, self.start_wall_ns = (
+            _HEADER.unpack_from(self._mm, 0)
+        )
+        if magic != MAGIC:
+            self._mm.close()
+            self._file.close()
+            raise ValueError(f"不是抓包文件: {self.path}")
+        self.version = version
+        self._index_file: BinaryIO | None = None
+        self._index_mm: mmap.mmap | None = None
+        # 装有 numpy 时为结构化数组，否则为 (ts, offset, direction, slave, length) 序列
+        self._idx: Any = None
+        self._ts: Any = None  # numpy: 时间戳列
+        self._load_index(size)
+
+    # -- 索引 --
+
+    def _load_index(self, data_size: int) -> None:
+        idx = index_path(self.path)
+        count = 0
+        if idx.exists() and idx.stat().st_size >= _INDEX.size:
+            self._index_file = index_file = open(idx, "rb")
+            self._index_mm = index_mm = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+            count = len(index_mm) // _INDEX.size
+            # 只信任数据已完整落盘的索引项
+            while count:
+                _, offset, _, _, length = _INDEX.unpack_from(index_mm, (count - 1) * _INDEX.size)
+                if offset + _RECORD.size + length <= data_size:
+                    break
+                count -= 1
+        if count:
+            self._count = count
+            if np is not None:
+                self._idx = np.frombuffer(index_mm, dtype=_INDEX_DTYPE, count=count)
+                self._ts = self._idx["ts"]
+            else:
+                self._idx = _IndexEntries(index_mm, count)
+            return
+        self._rebuild_index(data_size)
+
+    def _rebuild_index(self, data_size: int) -> None:
+        entries = []
+        offset = _HEADER.size
+        while offset + _RECORD.size <= data_size:
+            ts, direction, slave, length = _RECORD.unpack_from(self._mm, offset)
+            if offset + _RECORD.size + length > data_size:
+                break  # 末尾残缺记录
+            entries.append((ts, offset, direction, slave, length))
+            offset += _RECORD.size + length
+        self._count = len(entries)
+        if np is not None:
+            self._idx = np.array(entries, dtype=_INDEX_DTYPE)
+            self._ts = self._idx["ts"]
+        else:
+            self._idx = entries
+
+    # -- 访问 --
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> CaptureRecord:
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError(i)
+        ts, offset, direction, slave, length = (
+            self._idx[i].tolist() if np is not None else self._idx[i]
+        )
+        start = offset + _RECORD.size
+        return CaptureRecord(ts, direction, slave, self._mm[start:start + length])
+
+    def __iter__(self) -> Iterator[CaptureRecord]:
+        for i in range(self._count):
+            yield self[i]
+
+    def seek_time(self, ts_ns: int) -> int:
+        """第一条时间戳 >= ts_ns 的记录序号"""
+        if np is not None:
+            return int(np.searchsorted(self._ts, ts_ns, side="left"))
+        return bisect_left(self._idx, ts_ns, key=_entry_ts)
+
+    def select(
+        self,
+        slave_id: int | None = None,
+        direction: int | None = None,
+        start_ns: int | None = None,
+        end_ns: int | None = None,
+    ):
+        """
+        按条件筛选记录序号（时间区间左闭右开）。
+        装有 numpy 时返回整数数组（向量化筛选，不触及报文数据），否则返回 list。
+        """
+        lo = 0 if start_ns is None else self.seek_time(start_ns)
+        hi = self._count if end_ns is None else self.seek_time(end_ns)
+        if np is not None:
+            part = self._idx[lo:hi]
+            mask = np.ones(len(part), dtype=bool)
+            if slave_id is not None:
+                mask &= part["slave"] == slave_id
+            if direction is not None:
+                mask &= part["direction"] == direction
+            return np.nonzero(mask)[0] + lo
+        return [
+            i for i in range(lo, hi)
+            if (slave_id is None or self._idx[i][3] == slave_id)
+            and (direction is None or self._idx[i][2] == direction)
+        ]
+
+    def records(self, indices) -> Iterator[CaptureRecord]:
+        for i in indices:
+            yield self[int(i)]
+
+    def wall_time(self, ts_ns: int) -> float:
+        """把记录时间戳换算为 Unix 时间（秒）"""
+        return (self.start_wall_ns + ts_ns - self.start_ns) / 1e9
+
+    def close(self) -> None:
+        self._idx = None  # 先释放对 mmap 的引用
+        self._ts = None
+        if self._index_mm is not None:
+            self._index_mm.close()
+            self._index_mm = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> CaptureReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
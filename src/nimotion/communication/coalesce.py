@@ -0,0 +1,118 @@
+"""
+读请求合并。
+把同一从站、同一功能码的多条待发读请求合并为尽量少的块读，
+再把块读结果按原请求拆回。纯数据处理，不涉及 IO。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from ..models.types import MAX_READ_COUNT, FunctionCode, ModbusRequest, ModbusResponse
+
+_READ_CODES = (FunctionCode.READ_HOLDING, FunctionCode.READ_INPUT)
+
+
+@dataclass
+class ReadBlock:
+    """一次块读及其覆盖的原始请求"""
+
+    request: ModbusRequest
+    parts: list[ModbusRequest] = field(default_factory=list)
+
+    @property
+    def merged(self) -> bool:
+        return len(self.parts) > 1
+
+    @property
+    def key(self) -> tuple[int, int, int, int]:
+        """(从站, 功能码, 起始地址, 数量)"""
+        r = self.request
+        return r.slave_id, int(r.function_code), r.address, r.count
+
+
+def is_read(request: ModbusRequest) -> bool:
+    return request.function_code in _READ_CODES
+
+
+def coalesce_reads(
+    requests: list[ModbusRequest],
+    max_gap: int = 8,
+    max_count: int = MAX_READ_COUNT,
+) -> list[ReadBlock]:
+    """
+    合并读请求。
+
+    参数:
+        requests: 待发读请求（可混合不同从站/功能码）
+        max_gap: 两段之间允许夹带的未请求寄存器数
+        max_count: 单块最大寄存器数
+
+    返回: 块列表，顺序按各块首个原始请求在 requests 中的位置
+    """
+    order = {id(r): i for i, r in enumerate(requests)}
+    groups: dict[tuple[int, int], list[ModbusRequest]] = {}
+    for r in requests:
+        groups.setdefault((r.slave_id, int(r.function_code)), []).append(r)
+
+    blocks: list[ReadBlock] = []
+    for (slave_id, fc), reqs in groups.items():
+        reqs.sort(key=lambda r: r.address)
+        start = end = -1  # 当前块 [start, end)
+        parts: list[ModbusRequest] = []
+        for r in reqs:
+            r_end = r.address + r.count
+            if parts and r.address <= end + max_gap and max(end, r_end) - start <= max_count:
+                end = max(end, r_end)
+                parts.append(r)
+                continue
+            if parts:
+                blocks.append(_make_block(slave_id, fc, start, end, parts))
+            start, end, parts = r.address, r_end, [r]
+        if parts:
+            blocks.append(_make_block(slave_id, fc, start, end, parts))
+
+    for block in blocks:
+        block.parts.sort(key=lambda r: order[id(r)])
+    blocks.sort(key=lambda b: order[id(b.parts[0])])
+    return blocks
+
+
+def _make_block(
+    slave_id: int, fc: int, start: int, end: int, parts: list[ModbusRequest]
+) -> ReadBlock:
+    if len(parts) == 1:
+        return ReadBlock(request=parts[0], parts=parts)
+    request = ModbusRequest(
+        slave_id=slave_id,
+        function_code=FunctionCode(fc),
+        address=start,
+        count=end - start,
+        priority=parts[0].priority,
+    )
+    return ReadBlock(request=request, parts=parts)
+
+
+def split_response(
+    block: ModbusRequest, resp: ModbusResponse, part: ModbusRequest
+) -> ModbusResponse:
+    """从块读响应中取出某个原始请求对应的部分"""
+    if resp.is_error:
+        return ModbusResponse(
+            slave_id=resp.slave_id,
+            function_code=resp.function_code,
+            data=resp.data,
+            is_error=True,
+            error_code=resp.error_code,
+            raw_rx=resp.raw_rx,
+            timestamp=resp.timestamp,
+        )
+    offset = part.address - block.address
+    return ModbusResponse(
+        slave_id=resp.slave_id,
+        function_code=resp.function_code,
+        data=resp.data[offset * 2:(offset + part.count) * 2],
+        values=resp.values[offset:offset + part.count],
+        raw_rx=resp.raw_rx,
+        timestamp=resp.timestamp,
+    )
@@ -1,29 +1,97 @@
-"""Modbus CRC16 计算（多项式 0xA001，初始值 0xFFFF）"""
+"""Modbus CRC16 计算（多项式 0xA001，初始值 0xFFFF）
+
+采用 256 项预计算表逐字节查表；另提供 Crc16 增量对象，接收路径可边收边算。
+"""
 
 from __future__ import annotations
 
+_POLY = 0xA001
+_INIT = 0xFFFF
 
-def calculate(data: bytes) -> int:
-    """计算 CRC16，返回 16 位整数"""
-    crc = 0xFFFF
+# 接收路径直接在 bytearray / memoryview 上校验，不先复制成 bytes
+Buffer = bytes | bytearray | memoryview
+
+
+def _build_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            if crc & 0x0001:
+                crc = (crc >> 1) ^ _POLY
+            else:
+                crc >>= 1
+        table.append(crc)
+    return tuple(table)
+
+
+_TABLE = _build_table()
+
+
+def calculate_bitwise(data: bytes) -> int:
+    """逐位移位的参考实现（仅用于校验查表结果与基准对比）"""
+    crc = _INIT
     for byte in data:
         crc ^= byte
         for _ in range(8):
             if crc & 0x0001:
-                crc = (crc >> 1) ^ 0xA001
+                crc = (crc >> 1) ^ _POLY
             else:
                 crc >>= 1
     return crc
 
 
-def append(data: bytes) -> bytes:
+def _update(crc: int, data: Buffer) -> int:
+    table = _TABLE
+    for byte in data:
+        crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+    return crc
+
+
+def calculate(data: Buffer) -> int:
+    """计算 CRC16，返回 16 位整数"""
+    return _update(_INIT, data)
+
+
+def append(data: Buffer) -> bytes:
     """在数据末尾追加 CRC16（低字节在前）"""
-    crc = calculate(data)
-    return data + bytes([crc & 0xFF, (crc >> 8) & 0xFF])
+    crc = _update(_INIT, data)
+    return bytes(data) + bytes((crc & 0xFF, crc >> 8))
 
 
-def verify(frame: bytes) -> bool:
+def verify(frame: Buffer) -> bool:
     """校验完整帧的 CRC16（帧包含末尾 2 字节 CRC）"""
     if len(frame) < 4:
         return False
-    return calculate(frame[:-2]) == (frame[-2] | (frame[-1] << 8))
+    # 对含 CRC 的整帧计算，余数为 0 即校验通过，无需切片复制
+    return _update(_INIT, frame) == 0
+
+
+class Crc16:
+    """
+    增量 CRC16。
+    数据可分块 update()，结果与对整段数据调用 calculate() 相同。
+    """
+
+    __slots__ = ("_crc",)
+
+    def __init__(self, data: Buffer = b"") -> None:
+        self._crc = _update(_INIT, data) if data else _INIT
+
+    def update(self, data: Buffer) -> None:
+        """追加一段数据"""
+        self._crc = _update(self._crc, data)
+
+    def reset(self) -> None:
+        """恢复初始值，便于复用同一对象"""
+        self._crc = _INIT
+
+    @property
+    def value(self) -> int:
+        """当前 CRC16 值"""
+        return self._crc
+
+    @property
+    def valid(self) -> bool:
+        """已喂入的数据（含末尾 2 字节 CRC）是否为一帧校验通过的完整帧"""
+        return self._crc == 0
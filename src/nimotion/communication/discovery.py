@@ -0,0 +1,222 @@
+"""
+设备自动发现。
+各串口并行扫描（同一串口上只能逐个事务）；每个串口先按常用程度依次尝试
+波特率 × 数据格式，用少量从站地址试探，收到第一帧 CRC 正确的应答即锁定该组合，
+再在该组合下扫描全部从站地址。超时按波特率估算并随实测响应时间收紧。
+
+不依赖 PyQt5，可在脚本中直接使用。
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from ..models.types import FunctionCode, ModbusRequest
+from .frame_receiver import FrameReceiver
+from .modbus_rtu import ModbusRTU
+from .serial_port import SerialConfig, SerialPort, char_time, frame_time, silent_interval
+
+logger = logging.getLogger(__name__)
+
+# 0x0001 波特率代码 -> 波特率（代码 0/1 均为 9600）
+BAUD_CODES: dict[int, int] = {
+    0: 9600, 1: 9600, 2: 19200, 3: 38400, 4: 57600,
+    5: 115200, 6: 256000, 7: 500000, 8: 1000000, 9: 1500000,
+}
+# 0x0002 网络数据格式代码 -> 名称
+FORMAT_CODES: dict[int, str] = {0: "8E1", 1: "8O1", 2: "8N1", 3: "8N2"}
+# 数据格式名称 -> (校验, 停止位)
+DATA_FORMATS: dict[str, tuple[str, float]] = {
+    "8N1": ("N", 1), "8E1": ("E", 1), "8O1": ("O", 1), "8N2": ("N", 2),
+}
+
+# 扫描顺序: 出厂默认 115200 8N1 在前；8N2 放最后（8N1 从站也能听懂 8N2 帧）
+BAUDRATES = (115200, 9600, 19200, 38400, 57600, 256000, 500000, 1000000, 1500000)
+FORMATS = ("8N1", "8E1", "8O1", "8N2")
+
+# 设备信息: 输入寄存器 0x0000 厂商名称 + 0x0002 产品序列号
+_INFO_ADDR = 0x0000
+_INFO_COUNT = 4
+
+
+@dataclass(frozen=True)
+class DiscoveredDevice:
+    """发现的从站"""
+
+    port: str
+    baudrate: int
+    data_format: str  # "8N1" 等
+    slave_id: int
+    serial_number: int
+    vendor: int = 0
+
+    def config(self) -> SerialConfig:
+        """连接该从站所用的串口配置"""
+        parity, stopbits = DATA_FORMATS[self.data_format]
+        return SerialConfig(
+            port=self.port, baudrate=self.baudrate, parity=parity, stopbits=stopbits,
+        )
+
+
+class _Prober:
+    """单个串口上的试探收发（非线程安全，每个串口一个）"""
+
+    FLOOR = 0.010  # 超时下限（秒）
+    MARGIN = 0.015  # 估算超时的余量: USB 转换器延迟与从站处理时间
+    FACTOR = 2.0  # 实测响应时间放大系数
+
+    def __init__(self, serial: SerialPort) -> None:
+        self.serial = serial
+        self.transactions = 0
+        self._rx = FrameReceiver()
+        self._max_latency: float | None = None
+
+    def reset_latency(self) -> None:
+        self._max_latency = None
+
+    def timeout(self, request_bytes: int, response_bytes: int) -> float:
+        baud = self.serial.config.baudrate
+        wire = frame_time(baud, request_bytes + response_bytes)
+        if self._max_latency is None:
+            return wire + self.MARGIN + self.FLOOR
+        return wire + max(self._max_latency * self.FACTOR, self.FLOOR)
+
+    def transact(self, request: ModbusRequest) -> tuple[bytes, bool]:
+        """发送请求，返回 (应答帧, CRC 是否正确)；无应答为 (b"", False)"""
+        frame = ModbusRTU.build_frame(request)
+        expected = ModbusRTU.expected_response_length(request)
+        config = self.serial.config
+        self.serial.flush_input()
+        start = time.perf_counter()
+        self.serial.write(frame)
+        self.transactions += 1
+        first = self.serial.read(1, self.timeout(len(frame), expected))
+        if not first:
+            return b"", False
+        latency = time.perf_counter() - start - frame_time(config.baudrate, len(frame) + 1)
+        rx = self._rx
+        rx.reset()
+        rx.feed(first)
+        silence = max(silent_interval(config.baudrate), config.rx_silence_floor)
+        while not rx.done:
+            chunk = self.serial.read(rx.needed, rx.needed * char_time(config.baudrate) + silence)
+            if not chunk:
+                break
+            rx.feed(chunk)
+        ok = rx.done and rx.crc_ok and rx.frame[0] == request.slave_id
+        if ok:
+            latency = max(latency, 0.0)
+            if self._max_latency is None or latency > self._max_latency:
+                self._max_latency = latency
+        return rx.frame, ok
+
+    def probe(self, slave_id: int) -> tuple[int, int] | None:
+        """读取设备信息，返回 (厂商, 序列号)；无有效应答返回 None"""
+        request = ModbusRequest(slave_id, FunctionCode.READ_INPUT, _INFO_ADDR, _INFO_COUNT)
+        raw, ok = self.transact(request)
+        if not ok:
+            return None
+        resp = ModbusRTU.parse_response(raw, request, True)
+        if resp.is_error:
+            return 0, 0  # 从站在线但不支持该地址
+        v = resp.values
+        return (v[0] << 16) | v[1], (v[2] << 16) | v[3]
+
+    def read_format(self, slave_id: int) -> str | None:
+        """读取从站自身配置的数据格式 (0x0002)"""
+        request = ModbusRequest(slave_id, FunctionCode.READ_HOLDING, 0x0002, 1)
+        raw, ok = self.transact(request)
+        if not ok:
+            return None
+        resp = ModbusRTU.parse_response(raw, request, True)
+        if resp.is_error or not resp.values:
+            return None
+        return FORMAT_CODES.get(resp.values[0])
+
+
+def scan_port(
+    port: str,
+    baudrates: Iterable[int] = BAUDRATES,
+    formats: Iterable[str] = FORMATS,
+    slave_ids: Iterable[int] = range(1, 248),
+    probe_ids: Iterable[int] = range(1, 9),
+    all_combinations: bool = False,
+    serial_factory: Callable[[], SerialPort] = SerialPort,
+) -> list[DiscoveredDevice]:
+    """
+    扫描一个串口。
+    每个 波特率×格式 组合先试探 probe_ids，收到有效应答后在该组合下扫描 slave_ids。
+    all_combinations=False 时找到第一个有应答的组合即停止（同一总线上的从站通讯参数一致）。
+    """
+    serial = serial_factory()
+    prober = _Prober(serial)
+    probe_ids = list(probe_ids)
+    slave_ids = list(slave_ids)
+    devices: list[DiscoveredDevice] = []
+    try:
+        for baudrate in baudrates:
+            for fmt in formats:
+                parity, stopbits = DATA_FORMATS[fmt]
+                try:
+                    serial.open(SerialConfig(
+                        port=port, baudrate=baudrate, parity=parity, stopbits=stopbits,
+                        rx_silence_floor=0.005,
+                    ))
+                except Exception as exc:  # 平台不支持的波特率等
+                    logger.debug("%s 无法以 %d %s 打开: %s", port, baudrate, fmt, exc)
+                    continue
+                prober.reset_latency()
+                found: dict[int, tuple[int, int]] = {}
+                for slave_id in probe_ids:
+                    info = prober.probe(slave_id)
+                    if info is not None:
+                        found[slave_id] = info
+                        break
+                if not found:
+                    continue
+                for slave_id in slave_ids:
+                    if slave_id not in found:
+                        info = prober.probe(slave_id)
+                        if info is not None:
+                            found[slave_id] = info
+                for slave_id, (vendor, serial_number) in sorted(found.items()):
+                    devices.append(DiscoveredDevice(
+                        port, baudrate, prober.read_format(slave_id) or fmt,
+                        slave_id, serial_number, vendor,
+                    ))
+                logger.info(
+                    "%s: %d %s 发现 %d 个从站（%d 次事务）",
+                    port, baudrate, fmt, len(found), prober.transactions,
+                )
+                if not all_combinations:
+                    return devices
+    finally:
+        serial.close()
+    return devices
+
+
+def discover(
+    ports: Iterable[str] | None = None,
+    max_workers: int | None = None,
+    **scan_options,
+) -> list[DiscoveredDevice]:
+    """
+    并行扫描多个串口（缺省为 SerialPort.list_ports() 全部），
+    返回按 (串口, 从站地址) 排序的设备列表。scan_options 透传给 scan_port。
+    """
+    ports = list(SerialPort.list_ports() if ports is None else ports)
+    if not ports:
+        return []
+    devices: list[DiscoveredDevice] = []
+    with ThreadPoolExecutor(max_workers=max_workers or len(ports)) as pool:
+        futures = [pool.submit(scan_port, port, **scan_options) for port in ports]
+        for port, future in zip(ports, futures):
+            try:
+                devices.extend(future.result())
+            except Exception as exc:
+                logger.warning("扫描 %s 失败: %s", port, exc)
+    return sorted(devices, key=lambda d: (d.port, d.slave_id))
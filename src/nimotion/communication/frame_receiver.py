@@ -0,0 +1,100 @@
+"""
+RTU 响应帧接收状态机。
+先收帧头推算真实帧长，再按字节数或 t3.5 静默断帧；边收边算 CRC。
+已知预期响应（写请求的回显）时改为收齐后逐字节比对，相同即免算 CRC。
+不涉及串口 IO，由通讯线程喂入数据。
+"""
+
+from __future__ import annotations
+
+from enum import IntEnum
+
+from . import crc16
+from .crc16 import Crc16
+from .modbus_rtu import ModbusRTU
+
+
+class RxState(IntEnum):
+    """接收状态"""
+
+    HEADER = 0  # 等待帧头（从站 + 功能码 + 字节数/地址高位）
+    BODY = 1  # 帧长已知，接收剩余字节
+    DONE = 2  # 按字节数收齐
+
+
+class FrameReceiver:
+    """
+    响应帧接收器。
+    用法: reset() 后反复 feed(serial.read(needed))，直到 done 或读超时(静默)。
+    """
+
+    HEADER_SIZE = 3
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._crc = Crc16()
+        self._expected = self.HEADER_SIZE
+        self._state = RxState.HEADER
+        self._expect: bytes | None = None
+
+    def reset(self, expect: bytes | None = None) -> None:
+        """
+        开始接收新一帧。
+        expect: 预期的完整响应帧；给出时不边收边算 CRC，收齐后与之比对，不同才补算
+        """
+        self._buf.clear()
+        self._crc.reset()
+        self._expected = self.HEADER_SIZE
+        self._state = RxState.HEADER
+        self._expect = expect
+
+    @property
+    def state(self) -> RxState:
+        return self._state
+
+    @property
+    def done(self) -> bool:
+        return self._state == RxState.DONE
+
+    @property
+    def needed(self) -> int:
+        """完成当前阶段还需的字节数"""
+        return max(self._expected - len(self._buf), 0)
+
+    @property
+    def received(self) -> int:
+        return len(self._buf)
+
+    @property
+    def frame(self) -> bytes:
+        """已收到的数据（可能不完整）"""
+        return bytes(self._buf)
+
+    @property
+    def crc_ok(self) -> bool:
+        """已收数据是否构成 CRC 正确的完整帧"""
+        if self._state != RxState.DONE:
+            return False
+        if self._expect is not None:
+            return self._buf == self._expect or crc16.verify(self._buf)
+        return self._crc.valid
+
+    def feed(self, data: bytes) -> bool:
+        """
+        喂入新收到的字节（不应超过 needed）。
+
+        返回: 是否已按字节数收齐一帧
+        """
+        if not data or self._state == RxState.DONE:
+            return self.done
+        self._buf += data
+        if self._expect is None:
+            self._crc.update(data)
+        if self._state == RxState.HEADER and len(self._buf) >= self.HEADER_SIZE:
+            length = ModbusRTU.frame_length(self._buf)
+            # 功能码未知: 收到最大帧长为止，实际靠静默断帧
+            self._expected = length or ModbusRTU.MAX_FRAME_SIZE
+            self._state = RxState.BODY
+        if self._state == RxState.BODY and len(self._buf) >= self._expected:
+            self._state = RxState.DONE
+        return self.done
@@ -0,0 +1,71 @@
+"""
+请求句柄。
+每条提交给 CommWorker 的请求对应一个句柄，响应只交付给该句柄。
+多帧命令可编为事务组，组内首帧失败即取消其余帧，整组只报告一次。
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable
+
+from ..models.types import ModbusRequest, ModbusResponse
+
+ResponseCallback = Callable[[ModbusResponse], None]
+
+
+class RequestHandle(Future):
+    """
+    Modbus 事务句柄（concurrent.futures.Future）。
+    - result(timeout) 可在任意非通讯线程阻塞等待 ModbusResponse
+    - callback 在主线程（CommWorker 所在线程）调用，可直接操作 Qt 对象
+    - add_done_callback 注册的回调在通讯线程调用
+    """
+
+    def __init__(
+        self, request_id: int, request: ModbusRequest,
+        callback: ResponseCallback | None = None,
+    ) -> None:
+        super().__init__()
+        self.request_id = request_id
+        self.request = request
+        self.callback = callback
+        self.enqueued_ns = 0  # 入队时刻（time.perf_counter_ns）
+        self.group: RequestGroup | None = None  # 所属事务组
+
+
+@dataclass
+class GroupResult:
+    """事务组的结果"""
+
+    ok: bool
+    responses: list[ModbusResponse]  # 按提交顺序，含被取消的请求（error_code -4）
+    sent: int = 0  # 实际发送上线的帧数
+    latency_ns: int = 0  # 首帧入队 → 整组完成
+    failed: ModbusResponse | None = None  # 首个失败的响应
+    failed_request: ModbusRequest | None = None
+
+
+GroupCallback = Callable[[GroupResult], None]
+
+
+class RequestGroup(Future):
+    """
+    事务组（concurrent.futures.Future，结果为 GroupResult）。
+    组内请求按提交顺序执行；任一请求失败后，其余尚未发送的请求以 -4 取消，
+    之后提交到该组的请求也直接取消。组关闭且全部请求结束后完成一次，
+    callback 在主线程调用。组内各请求仍有自己的句柄与回调。
+    """
+
+    def __init__(
+        self, request_id: int, name: str = "", callback: GroupCallback | None = None,
+    ) -> None:
+        super().__init__()
+        self.request_id = request_id
+        self.name = name
+        self.callback = callback
+        self.handles: list[RequestHandle] = []
+        self.failed: RequestHandle | None = None  # 首个失败的成员
+        self.sealed = False  # 已关闭，不再加入新请求
+        self.closed = False  # 已判定完成（只结算一次）
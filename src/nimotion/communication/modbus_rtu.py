@@ -1,16 +1,114 @@
 """
 Modbus-RTU 帧构建与解析。
 不涉及串口 IO，纯数据处理。
+状态轮询、控制字等反复发送的相同请求经 ModbusRTU.encode 的 LRU 缓存取帧，
+连同预期响应（长度、帧头、写请求的完整回显）一并预先算好，热路径不再编码与算 CRC。
+读响应的寄存器数据经 decode_registers 整块解码，不逐寄存器移位拼接。
 """
 
 from __future__ import annotations
 
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+
 from . import crc16
+from ..models.layout import words_struct
 from ..models.types import FunctionCode, ModbusRequest, ModbusResponse
 
+_HEADER = struct.Struct(">BBHH")  # 从站, 功能码, 地址, 数量/值
+_CRC = struct.Struct("<H")  # CRC 低字节在前
+
+
+# 寄存器数达到该值后改用 array 整块字节序翻转（实测 64 个起快于 Struct）
+_ARRAY_MIN = 64
+_SWAP = sys.byteorder == "little"
+
+
+def decode_registers(data: bytes, count: int | None = None, offset: int = 0) -> list[int]:
+    """大端寄存器数据 -> 16 位寄存器值列表（count 缺省按数据长度）"""
+    if count is None:
+        count = (len(data) - offset) // 2
+    if count < _ARRAY_MIN:
+        return list(words_struct(count).unpack_from(data, offset))
+    words = array("H")
+    words.frombytes(data[offset:offset + count * 2])
+    if _SWAP:
+        words.byteswap()
+    return words.tolist()
+
+
+@dataclass(frozen=True)
+class EncodedFrame:
+    """编码好的请求帧及其正常响应的预期形态（不可变，可在多次请求间共享）"""
+
+    frame: bytes  # 完整请求帧（含 CRC）
+    expected_length: int  # 正常响应帧长
+    prefix: bytes  # 正常响应的固定开头: 读为 [从站][功能码][字节数]，写为回显的前 6 字节
+    echo: bytes | None = None  # 写请求的完整正常响应（含 CRC）；读请求为 None
+
 
 class ModbusRTU:
-    """Modbus-RTU 协议处理器"""
+    """
+    Modbus-RTU 协议处理器。
+    编解码方法均为静态方法；实例另持有按请求内容缓存的帧（encode），非线程安全。
+    """
+
+    # 最长 RTU 帧: 从站(1) + PDU(≤253) + CRC(2)
+    MAX_FRAME_SIZE = 256
+    FRAME_CACHE_SIZE = 256  # 缓存的不同请求帧数
+
+    def __init__(self, cache_size: int = FRAME_CACHE_SIZE) -> None:
+        self.cache_size = cache_size
+        self._frames: OrderedDict[tuple, EncodedFrame] = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def encode(self, request: ModbusRequest) -> EncodedFrame:
+        """
+        取请求对应的编码帧，按 (从站, 功能码, 地址, 数量, 写入值) LRU 缓存。
+        命中时不再编码与计算 CRC。
+        """
+        key = (
+            request.slave_id, request.function_code, request.address,
+            request.count, tuple(request.values),
+        )
+        frames = self._frames
+        encoded = frames.get(key)
+        if encoded is not None:
+            frames.move_to_end(key)
+            self.cache_hits += 1
+            return encoded
+        self.cache_misses += 1
+        encoded = ModbusRTU.encode_uncached(request)
+        if self.cache_size > 0:
+            frames[key] = encoded
+            if len(frames) > self.cache_size:
+                frames.popitem(last=False)
+        return encoded
+
+    @staticmethod
+    def encode_uncached(request: ModbusRequest) -> EncodedFrame:
+        """编码请求帧并推算正常响应的形态（不经缓存）"""
+        frame = ModbusRTU.build_frame(request)
+        fc = request.function_code
+        if fc in (FunctionCode.READ_HOLDING, FunctionCode.READ_INPUT):
+            byte_count = (request.count * 2) & 0xFF
+            return EncodedFrame(frame, 5 + byte_count, bytes((frame[0], frame[1], byte_count)))
+        if fc == FunctionCode.WRITE_SINGLE:
+            # 正常响应为请求原样回显
+            return EncodedFrame(frame, 8, frame[:6], frame)
+        # 0x10 响应: 请求前 6 字节（从站/功能码/地址/数量）+ CRC
+        head = frame[:6]
+        return EncodedFrame(frame, 8, head, crc16.append(head))
+
+    def cache_info(self) -> dict[str, int]:
+        return {"hits": self.cache_hits, "misses": self.cache_misses, "size": len(self._frames)}
+
+    def clear_cache(self) -> None:
+        self._frames.clear()
 
     @staticmethod
     def build_frame(request: ModbusRequest) -> bytes:
@@ -19,57 +117,66 @@ class ModbusRTU:
 
         返回: 完整 RTU 帧 bytes
         """
+        buf = bytearray(ModbusRTU.MAX_FRAME_SIZE)
+        length = ModbusRTU.build_frame_into(buf, request)
+        return bytes(buf[:length])
+
+    @staticmethod
+    def build_frame_into(buf: bytearray, request: ModbusRequest) -> int:
+        """
+        将完整帧（含 CRC）直接编码到调用方提供的缓冲区，不产生中间对象。
+        调用方可自行复用同一块缓冲区（build_frame 每次新建一块）。
+
+        参数:
+            buf: 可写缓冲区（bytearray / 可写 memoryview），长度需 ≥ 帧长
+            request: 请求
+
+        返回: 帧长度（字节）
+        """
         fc = request.function_code
+        address = request.address & 0xFFFF
         if fc in (FunctionCode.READ_HOLDING, FunctionCode.READ_INPUT):
             # 0x03/0x04: [从站][功能码][地址H][地址L][数量H][数量L]
-            pdu = bytes([
-                request.slave_id,
-                fc,
-                (request.address >> 8) & 0xFF,
-                request.address & 0xFF,
-                (request.count >> 8) & 0xFF,
-                request.count & 0xFF,
-            ])
+            _HEADER.pack_into(buf, 0, request.slave_id, fc, address, request.count & 0xFFFF)
+            length = 6
         elif fc == FunctionCode.WRITE_SINGLE:
             # 0x06: [从站][功能码][地址H][地址L][值H][值L]
-            value = request.values[0] if request.values else 0
-            pdu = bytes([
-                request.slave_id,
-                fc,
-                (request.address >> 8) & 0xFF,
-                request.address & 0xFF,
-                (value >> 8) & 0xFF,
-                value & 0xFF,
-            ])
+            value = request.values[0] & 0xFFFF if request.values else 0
+            _HEADER.pack_into(buf, 0, request.slave_id, fc, address, value)
+            length = 6
         elif fc == FunctionCode.WRITE_MULTIPLE:
             # 0x10: [从站][功能码][地址H][地址L][数量H][数量L][字节数][数据...]
-            count = len(request.values)
-            byte_count = count * 2
-            data_bytes = b""
-            for v in request.values:
-                data_bytes += bytes([(v >> 8) & 0xFF, v & 0xFF])
-            pdu = bytes([
-                request.slave_id,
-                fc,
-                (request.address >> 8) & 0xFF,
-                request.address & 0xFF,
-                (count >> 8) & 0xFF,
-                count & 0xFF,
-                byte_count,
-            ]) + data_bytes
+            values = request.values
+            count = len(values)
+            _HEADER.pack_into(buf, 0, request.slave_id, fc, address, count)
+            buf[6] = (count * 2) & 0xFF
+            try:
+                words_struct(count).pack_into(buf, 7, *values)
+            except struct.error:
+                if len(buf) < 9 + count * 2:
+                    raise ValueError(f"缓冲区不足: 需要 {9 + count * 2} 字节") from None
+                # 超出 16 位的值按低 16 位截断（与逐字节编码行为一致）
+                words_struct(count).pack_into(buf, 7, *(v & 0xFFFF for v in values))
+            length = 7 + count * 2
         else:
             raise ValueError(f"不支持的功能码: 0x{fc:02X}")
 
-        return crc16.append(pdu)
+        with memoryview(buf) as view:
+            crc = crc16.calculate(view[:length])
+        _CRC.pack_into(buf, length, crc)
+        return length + 2
 
     @staticmethod
-    def parse_response(raw: bytes, request: ModbusRequest) -> ModbusResponse:
+    def parse_response(
+        raw: bytes, request: ModbusRequest, crc_ok: bool | None = None
+    ) -> ModbusResponse:
         """
         解析响应帧。
 
         参数:
             raw: 完整接收帧（含 CRC）
             request: 对应的请求（用于上下文判断）
+            crc_ok: 接收时已增量算出的 CRC 结果；None 表示在此重新校验
 
         返回: ModbusResponse
         """
@@ -92,7 +199,9 @@ class ModbusRTU:
         )
 
         # CRC 校验
-        if not crc16.verify(raw):
+        if crc_ok is None:
+            crc_ok = crc16.verify(raw)
+        if not crc_ok:
             resp.is_error = True
             resp.error_code = -1  # CRC 错误特殊码
             return resp
@@ -116,8 +225,7 @@ class ModbusRTU:
                 resp.error_code = -3
                 return resp
             # 将字节数据解析为 16 位寄存器值列表
-            for i in range(0, byte_count - 1, 2):
-                resp.values.append((resp.data[i] << 8) | resp.data[i + 1])
+            resp.values = decode_registers(resp.data, byte_count // 2)
         elif fc == FunctionCode.WRITE_SINGLE:
             # 响应: [从站][功能码][地址H][地址L][值H][值L]
             if len(raw) < 8:
@@ -137,6 +245,68 @@ class ModbusRTU:
 
         return resp
 
+    @staticmethod
+    def parse_expected(
+        raw: bytes,
+        request: ModbusRequest,
+        encoded: EncodedFrame,
+        crc_ok: bool | None = None,
+    ) -> ModbusResponse:
+        """
+        按 encode 预先算好的形态解析响应。
+        写请求的响应与预期回显逐字节相同时无需再校验 CRC；读响应帧头与长度相符时
+        直接按寄存器数解包。其余情况（异常响应、长度不符等）交给 parse_response。
+        """
+        if encoded.echo is not None:
+            if raw == encoded.echo:
+                return ModbusResponse(
+                    slave_id=raw[0],
+                    function_code=raw[1],
+                    data=raw[2:6],
+                    values=[(raw[4] << 8) | raw[5]],
+                    raw_rx=raw,
+                )
+        elif len(raw) == encoded.expected_length and raw[:3] == encoded.prefix:
+            if crc_ok is None:
+                crc_ok = crc16.verify(raw)
+            if crc_ok:
+                return ModbusResponse(
+                    slave_id=raw[0],
+                    function_code=raw[1],
+                    data=raw[3:-2],
+                    values=decode_registers(raw, (len(raw) - 5) // 2, 3),
+                    raw_rx=raw,
+                )
+        return ModbusRTU.parse_response(raw, request, crc_ok)
+
+    @staticmethod
+    def parse_request(raw: bytes) -> ModbusRequest | None:
+        """
+        由主站请求帧（含 CRC）还原 ModbusRequest，用于抓包回放。
+
+        返回: 请求；CRC 错误、长度不符或功能码不支持时返回 None
+        """
+        if len(raw) < 8 or not crc16.verify(raw):
+            return None
+        fc = raw[1]
+        if fc not in FunctionCode._value2member_map_:
+            return None
+        slave_id, _, address, word = _HEADER.unpack_from(raw, 0)
+        if fc in (FunctionCode.READ_HOLDING, FunctionCode.READ_INPUT):
+            if len(raw) != 8:
+                return None
+            return ModbusRequest(slave_id, FunctionCode(fc), address, word)
+        if fc == FunctionCode.WRITE_SINGLE:
+            if len(raw) != 8:
+                return None
+            return ModbusRequest(slave_id, FunctionCode(fc), address, 1, [word])
+        # 0x10: 数量与字节数须与帧长一致
+        if raw[6] != word * 2 or len(raw) != 9 + word * 2:
+            return None
+        return ModbusRequest(
+            slave_id, FunctionCode(fc), address, word, list(words_struct(word).unpack_from(raw, 7)),
+        )
+
     @staticmethod
     def expected_response_length(request: ModbusRequest) -> int:
         """计算期望的响应帧长度（用于读取判断）"""
@@ -148,6 +318,24 @@ class ModbusRTU:
             return 8
         return 8
 
+    @staticmethod
+    def frame_length(header: crc16.Buffer) -> int:
+        """
+        根据响应帧前 3 字节（从站/功能码/字节数或地址高位）推算整帧长度。
+
+        返回: 整帧字节数（含 CRC）；功能码未知时返回 0，由调用方按静默间隔断帧
+        """
+        fc = header[1]
+        if fc & 0x80:
+            # 异常响应: [从站][功能码|0x80][异常码][CRC×2]
+            return 5
+        if fc in (FunctionCode.READ_HOLDING, FunctionCode.READ_INPUT):
+            # [从站][功能码][字节数][数据...][CRC×2]
+            return 5 + header[2]
+        if fc in (FunctionCode.WRITE_SINGLE, FunctionCode.WRITE_MULTIPLE):
+            return 8
+        return 0
+
     @staticmethod
     def combine_32bit(high: int, low: int, signed: bool = False) -> int:
         """将两个 16 位寄存器值合并为 32 位值"""
@@ -0,0 +1,164 @@
+"""
+抓包回放。
+从抓包文件还原主站请求流，经真实 CommWorker/ModbusRTU 重新发送
+（通常连到 simulator.DriveServer），按原始节奏或尽快发送，
+统计延迟、吞吐与响应差异，作为基于真实负载的回归基准。
+
+回放在调用线程阻塞执行（等待 RequestHandle.result），不可在主线程调用。
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Iterator
+
+from ..models.types import ModbusRequest, ModbusResponse
+from .capture import RX, TX, CaptureReader
+from .modbus_rtu import ModbusRTU
+from .stats import LatencyHistogram
+
+
+@dataclass
+class ReplayItem:
+    """一条待回放请求"""
+
+    offset_ns: int  # 相对会话起点的发送时刻
+    request: ModbusRequest
+    captured_rx: bytes = b""  # 抓包中的原始响应（无应答为空）
+    captured_latency_ns: int = 0  # 抓包中 请求 → 响应首字节
+
+
+def load_session(
+    reader: CaptureReader,
+    slave_id: int | None = None,
+    start_ns: int | None = None,
+    end_ns: int | None = None,
+) -> Iterator[ReplayItem]:
+    """
+    按时间顺序产出抓包中的请求及其原始响应。
+    响应取请求之后、下一条请求之前同一从站的第一条 RX 记录；
+    无法解码的 TX（如串口调试模式发出的任意数据）跳过。
+    """
+    indices = reader.select(start_ns=start_ns, end_ns=end_ns)
+    origin: int | None = None
+    pending: ReplayItem | None = None
+    pending_ts = 0
+    for rec in reader.records(indices):
+        if rec.direction == RX:
+            if (
+                pending is not None
+                and not pending.captured_rx
+                and rec.slave_id == pending.request.slave_id
+            ):
+                pending.captured_rx = rec.data
+                pending.captured_latency_ns = rec.ts_ns - pending_ts
+            continue
+        if rec.direction != TX:
+            continue
+        request = ModbusRTU.parse_request(rec.data)
+        if request is None or (slave_id is not None and request.slave_id != slave_id):
+            continue
+        if pending is not None:
+            yield pending
+        if origin is None:
+            origin = rec.ts_ns
+        pending = ReplayItem(rec.ts_ns - origin, request)
+        pending_ts = rec.ts_ns
+    if pending is not None:
+        yield pending
+
+
+@dataclass
+class ReplayReport:
+    """回放结果"""
+
+    requests: int = 0
+    ok: int = 0
+    errors: dict[int, int] = field(default_factory=dict)  # error_code -> 次数
+    mismatches: int = 0  # 回放结果与抓包不一致（成功/异常/无应答 状态或数据长度不同）
+    duration: float = 0.0  # 秒
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)  # 入队 → 完成
+    response: LatencyHistogram = field(default_factory=LatencyHistogram)  # 发送 → 响应首字节
+    captured: LatencyHistogram = field(default_factory=LatencyHistogram)  # 抓包中的响应时间
+
+    @property
+    def throughput(self) -> float:
+        """每秒完成的事务数"""
+        return self.requests / self.duration if self.duration > 0 else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "requests": self.requests,
+            "ok": self.ok,
+            "errors": dict(self.errors),
+            "mismatches": self.mismatches,
+            "duration_s": self.duration,
+            "throughput": self.throughput,
+            "latency": self.latency.snapshot(),
+            "response": self.response.snapshot(),
+            "captured_response": self.captured.snapshot(),
+        }
+
+
+def _outcome(raw_rx: bytes) -> tuple[str, int]:
+    """响应帧的 (类别, 长度)，用于与抓包比较"""
+    if not raw_rx:
+        return "none", 0
+    if len(raw_rx) >= 2 and raw_rx[1] & 0x80:
+        return "exception", len(raw_rx)
+    return "ok", len(raw_rx)
+
+
+class Replayer:
+    """
+    把 ReplayItem 序列提交给已连接的 CommWorker。
+
+    speed: 相对原始节奏的倍速，None = 尽快发送（只受 window 限制）
+    window: 最多同时在途的请求数；1 = 严格逐条往返，结果可复现
+    """
+
+    def __init__(self, worker, speed: float | None = 1.0, window: int = 1) -> None:
+        self._worker = worker
+        self.speed = speed
+        self.window = max(window, 1)
+        self.result_timeout = 10.0  # 单条请求等待上限（秒）
+
+    def run(
+        self,
+        items: Iterable[ReplayItem],
+        progress: Callable[[ReplayReport], None] | None = None,
+    ) -> ReplayReport:
+        report = ReplayReport()
+        inflight: list[tuple[ReplayItem, object]] = []
+        start = time.perf_counter()
+        for item in items:
+            if self.speed is not None:
+                delay = start + item.offset_ns / 1e9 / self.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if len(inflight) >= self.window:
+                self._collect(report, *inflight.pop(0))
+                if progress is not None and report.requests % 1000 == 0:
+                    progress(report)
+            inflight.append((item, self._worker.send_modbus(item.request)))
+        for item, handle in inflight:
+            self._collect(report, item, handle)
+        report.duration = time.perf_counter() - start
+        return report
+
+    def _collect(self, report: ReplayReport, item: ReplayItem, handle) -> None:
+        resp: ModbusResponse = handle.result(self.result_timeout)
+        report.requests += 1
+        if resp.is_error:
+            report.errors[resp.error_code] = report.errors.get(resp.error_code, 0) + 1
+        else:
+            report.ok += 1
+        if _outcome(resp.raw_rx) != _outcome(item.captured_rx):
+            report.mismatches += 1
+        if resp.trace is not None:
+            report.latency.record(resp.trace.total_ns / 1e9)
+            if resp.trace.first_rx_ns:
+                report.response.record(resp.trace.response_ns / 1e9)
+        if item.captured_latency_ns:
+            report.captured.record(item.captured_latency_ns / 1e9)
@@ -0,0 +1,233 @@
+"""
+请求调度器。
+按优先级分通道排队，安全通道（急停/脱机）总是下一帧发送。
+各通道有容量上限；带截止时刻的请求过期后在发送前丢弃，总线变慢时
+积压有界，不会越排越久。
+非线程安全 - 由 CommWorker 在互斥锁内调用。
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+
+from ..models.types import MAX_READ_COUNT, ModbusRequest, Priority
+from .coalesce import ReadBlock, coalesce_reads
+
+# 被丢弃请求的错误码（与 ModbusResponse.error_code 一致）
+OVERFLOW = -5  # 通道已满
+EXPIRED = -6  # 超过截止时刻
+
+# 各通道容量，None = 不限。后台通道满时挤掉最旧的轮询，运动通道满时拒绝新命令
+DEFAULT_CAPACITY: dict[Priority, int | None] = {
+    Priority.SAFETY: None,
+    Priority.MOTION: 256,
+    Priority.BACKGROUND: 64,
+}
+
+
+@dataclass
+class LaneStats:
+    """单个通道的统计"""
+
+    enqueued: int = 0
+    sent: int = 0
+    dropped: int = 0  # 被安全命令、从站熔断或事务组中止取消的请求数
+    overflow: int = 0  # 通道已满被丢弃的请求数
+    expired: int = 0  # 过期未发送的请求数
+    total_wait: float = 0.0  # 已发送请求的排队时间累计（秒）
+    max_wait: float = 0.0
+    last_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.sent if self.sent else 0.0
+
+
+def _expired(request: ModbusRequest, now: float) -> bool:
+    return request.deadline is not None and now > request.deadline
+
+
+class RequestScheduler:
+    """多通道优先级队列，同一通道内保持 FIFO"""
+
+    def __init__(self, capacity: dict[Priority, int | None] | None = None) -> None:
+        self._lanes: dict[Priority, deque[tuple[ModbusRequest, float]]] = {
+            lane: deque() for lane in Priority
+        }
+        self._stats: dict[Priority, LaneStats] = {lane: LaneStats() for lane in Priority}
+        self.capacity = dict(DEFAULT_CAPACITY if capacity is None else capacity)
+        # 因溢出/过期被丢弃、尚未交还调用方的请求: (请求, 错误码)
+        self._discarded: list[tuple[ModbusRequest, int]] = []
+
+    def __len__(self) -> int:
+        return sum(len(q) for q in self._lanes.values())
+
+    def __bool__(self) -> bool:
+        return any(self._lanes.values())
+
+    def push(self, request: ModbusRequest, now: float) -> list[ModbusRequest]:
+        """
+        入队。安全命令会取消同从站尚未发送的运动命令（避免急停后旧运动序列继续执行）。
+
+        返回: 被取消的请求
+        """
+        lane = request.lane
+        dropped: list[ModbusRequest] = []
+        if lane == Priority.SAFETY:
+            dropped = self._cancel(Priority.MOTION, request.slave_id)
+        stats = self._stats[lane]
+        stats.enqueued += 1
+        limit = self.capacity.get(lane)
+        if limit is not None and len(self._lanes[lane]) >= limit:
+            self._expire(lane, now)
+        queue = self._lanes[lane]
+        if limit is not None and len(queue) >= limit:
+            stats.overflow += 1
+            if lane == Priority.BACKGROUND:
+                # 最旧的轮询结果价值最低，让位于新请求
+                self._discarded.append((queue.popleft()[0], OVERFLOW))
+            else:
+                self._discarded.append((request, OVERFLOW))
+                return dropped
+        queue.append((request, now))
+        return dropped
+
+    def take_discarded(self) -> list[tuple[ModbusRequest, int]]:
+        """取走因溢出/过期被丢弃的请求 (请求, 错误码)，由调用方完成其句柄"""
+        discarded, self._discarded = self._discarded, []
+        return discarded
+
+    def pop(self, now: float) -> ModbusRequest | None:
+        """取出优先级最高的请求；队列为空返回 None"""
+        for lane, queue in self._lanes.items():
+            while queue and _expired(queue[0][0], now):
+                self._discarded.append((queue.popleft()[0], EXPIRED))
+                self._stats[lane].expired += 1
+            if queue:
+                request, enqueued_at = queue.popleft()
+                wait = now - enqueued_at
+                stats = self._stats[lane]
+                stats.sent += 1
+                stats.total_wait += wait
+                stats.last_wait = wait
+                if wait > stats.max_wait:
+                    stats.max_wait = wait
+                return request
+        return None
+
+    def pop_reads(
+        self, first: ModbusRequest, now: float, max_gap: int,
+        max_count: int = MAX_READ_COUNT,
+    ) -> ReadBlock:
+        """
+        以刚取出的读请求 first 为起点，从同通道取走可与之合并的读请求。
+        不能并入同一块的请求留在原位。
+
+        返回: 包含 first 的块（未合并时 parts 仅 first）
+        """
+        queue = self._lanes[first.lane]
+        candidates = [
+            r for r, _ in queue
+            if r.slave_id == first.slave_id and r.function_code == first.function_code
+            and not _expired(r, now)
+        ]
+        if not candidates:
+            return ReadBlock(request=first, parts=[first])
+        block = next(
+            b for b in coalesce_reads([first, *candidates], max_gap, max_count)
+            if any(p is first for p in b.parts)
+        )
+        taken = {id(p) for p in block.parts if p is not first}
+        if taken:
+            stats = self._stats[first.lane]
+            kept: deque[tuple[ModbusRequest, float]] = deque()
+            for item in queue:
+                if id(item[0]) in taken:
+                    wait = now - item[1]
+                    stats.sent += 1
+                    stats.total_wait += wait
+                    stats.max_wait = max(stats.max_wait, wait)
+                else:
+                    kept.append(item)
+            self._lanes[first.lane] = kept
+        return block
+
+    def requeue(self, requests: list[ModbusRequest], now: float) -> None:
+        """把已取出但未发送的请求按原顺序放回各自通道的队首（如被拒合并读的各部分）"""
+        for request in reversed(requests):
+            self._lanes[request.lane].appendleft((request, now))
+            self._stats[request.lane].sent -= 1
+
+    def cancel_slave(self, slave_id: int) -> list[ModbusRequest]:
+        """取消该从站在运动/后台通道排队的全部请求（从站熔断），安全通道保留"""
+        return self._cancel(Priority.MOTION, slave_id) + self._cancel(Priority.BACKGROUND, slave_id)
+
+    def remove(self, requests: list[ModbusRequest]) -> list[ModbusRequest]:
+        """移除仍在排队的指定请求（按对象身份），返回实际移除的请求"""
+        targets = {id(r) for r in requests}
+        removed: list[ModbusRequest] = []
+        for lane, queue in self._lanes.items():
+            if not any(id(item[0]) in targets for item in queue):
+                continue
+            kept: deque[tuple[ModbusRequest, float]] = deque()
+            for item in queue:
+                if id(item[0]) in targets:
+                    removed.append(item[0])
+                    self._stats[lane].dropped += 1
+                else:
+                    kept.append(item)
+            self._lanes[lane] = kept
+        return removed
+
+    def clear(self) -> None:
+        for queue in self._lanes.values():
+            queue.clear()
+
+    def depth(self, lane: Priority) -> int:
+        return len(self._lanes[lane])
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        """各通道深度与排队时间统计（毫秒）"""
+        result: dict[str, dict[str, float]] = {}
+        for lane, stats in self._stats.items():
+            result[lane.name.lower()] = {
+                "depth": len(self._lanes[lane]),
+                "enqueued": stats.enqueued,
+                "sent": stats.sent,
+                "dropped": stats.dropped,
+                "overflow": stats.overflow,
+                "expired": stats.expired,
+                "avg_wait_ms": stats.avg_wait * 1000,
+                "max_wait_ms": stats.max_wait * 1000,
+                "last_wait_ms": stats.last_wait * 1000,
+            }
+        return result
+
+    def reset_stats(self) -> None:
+        self._stats = {lane: LaneStats() for lane in Priority}
+
+    def _expire(self, lane: Priority, now: float) -> None:
+        """丢弃通道内全部已过期的请求"""
+        queue = self._lanes[lane]
+        kept: deque[tuple[ModbusRequest, float]] = deque()
+        for item in queue:
+            if _expired(item[0], now):
+                self._discarded.append((item[0], EXPIRED))
+                self._stats[lane].expired += 1
+            else:
+                kept.append(item)
+        self._lanes[lane] = kept
+
+    def _cancel(self, lane: Priority, slave_id: int) -> list[ModbusRequest]:
+        queue = self._lanes[lane]
+        kept: deque[tuple[ModbusRequest, float]] = deque()
+        dropped: list[ModbusRequest] = []
+        for item in queue:
+            if item[0].slave_id == slave_id:
+                dropped.append(item[0])
+            else:
+                kept.append(item)
+        self._lanes[lane] = kept
+        self._stats[lane].dropped += len(dropped)
+        return dropped
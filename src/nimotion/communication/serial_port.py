@@ -18,6 +18,31 @@ class SerialConfig:
     parity: str = "N"  # "N" / "E" / "O"
     stopbits: float = 1  # 1 / 2
     timeout: float = 0.5  # 读超时（秒）
+    # 帧内静默判定下限（秒）。t3.5 在高波特率下仅 1.75ms，
+    # USB-RS485 转换器的缓冲延迟会把一帧拆成几段到达，需留出余量。
+    rx_silence_floor: float = 0.02
+    # 帧间间隔下限（秒）。实际间隔取 max(t3.5, 本值)，响应慢的从站可调大。
+    frame_gap_floor: float = 0.0
+
+
+def char_time(baudrate: int) -> float:
+    """单个 RTU 字符（11 位: 起始+8 数据+校验/停止+停止）在线上的时长（秒）"""
+    return 11.0 / baudrate
+
+
+def frame_time(baudrate: int, nbytes: int) -> float:
+    """nbytes 字节的帧在线上的传输时长（秒）"""
+    return nbytes * char_time(baudrate)
+
+
+def silent_interval(baudrate: int) -> float:
+    """
+    Modbus-RTU 帧间静默 t3.5（秒）。
+    波特率 > 19200 时规范规定固定为 1.75ms。
+    """
+    if baudrate > 19200:
+        return 0.00175
+    return 3.5 * char_time(baudrate)
 
 
 class SerialPort:
@@ -29,6 +54,7 @@ class SerialPort:
     def __init__(self) -> None:
         self._serial: serial.Serial | None = None
         self._config = SerialConfig()
+        self._timeout: float | None = None  # 当前生效的读超时
 
     @property
     def is_open(self) -> bool:
@@ -55,6 +81,7 @@ class SerialPort:
             stopbits=config.stopbits,
             timeout=config.timeout,
         )
+        self._timeout = config.timeout
 
     def close(self) -> None:
         """关闭串口"""
@@ -68,10 +95,16 @@ class SerialPort:
             raise IOError("串口未打开")
         return self._serial.write(data)  # type: ignore[union-attr]
 
-    def read(self, size: int) -> bytes:
-        """读取指定字节数（可能因超时返回不足）"""
+    def read(self, size: int, timeout: float | None = None) -> bytes:
+        """
+        读取指定字节数（可能因超时返回不足）。
+        timeout 为本次读取的超时（秒），None 表示沿用当前设置。
+        """
         if not self.is_open:
             raise IOError("串口未打开")
+        if timeout is not None and timeout != self._timeout:
+            self._serial.timeout = timeout  # type: ignore[union-attr]
+            self._timeout = timeout
         return self._serial.read(size)  # type: ignore[union-attr]
 
     def read_all(self) -> bytes:
@@ -80,6 +113,15 @@ class SerialPort:
             raise IOError("串口未打开")
         return self._serial.read_all()  # type: ignore[union-attr]
 
+    def fileno(self) -> int | None:
+        """底层文件描述符（POSIX），不支持的平台返回 None"""
+        if not self.is_open:
+            return None
+        try:
+            return self._serial.fileno()  # type: ignore[union-attr]
+        except (AttributeError, OSError):
+            return None
+
     def flush_input(self) -> None:
         """清空输入缓冲区"""
         if self.is_open:
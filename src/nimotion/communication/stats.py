@@ -0,0 +1,223 @@
+"""
+通讯延迟与总线健康统计。
+LatencyHistogram 为 HDR 风格的对数-线性分桶直方图：
+记录开销为 O(1)，任意百分位的相对误差不超过约 3%，内存固定。
+BusStats 按 (从站, 功能码) 汇总错误计数与各阶段延迟。
+"""
+
+from __future__ import annotations
+
+import threading
+
+_SUB_BITS = 6
+_SUB_COUNT = 1 << _SUB_BITS  # 每个量级内的线性子桶数
+_HALF = _SUB_COUNT >> 1
+_MAX_US = (1 << 27) - 1  # 约 134 秒，超出按上限计
+
+
+def _index(us: int) -> int:
+    if us < _SUB_COUNT:
+        return us
+    shift = us.bit_length() - _SUB_BITS
+    return _SUB_COUNT + (shift - 1) * _HALF + ((us >> shift) - _HALF)
+
+
+def _upper(index: int) -> int:
+    """桶内最大值（微秒），百分位按此取值，只会偏大不会偏小"""
+    if index < _SUB_COUNT:
+        return index
+    k = index - _SUB_COUNT
+    shift = k // _HALF + 1
+    return (((k % _HALF) + _HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """延迟直方图，单位秒，内部以微秒分桶"""
+
+    __slots__ = ("_counts", "_total", "_sum", "_min", "_max")
+
+    def __init__(self) -> None:
+        self._counts = [0] * (_index(_MAX_US) + 1)
+        self._total = 0
+        self._sum = 0
+        self._min = 0
+        self._max = 0
+
+    def record(self, seconds: float) -> None:
+        us = min(max(int(seconds * 1_000_000), 0), _MAX_US)
+        self._counts[_index(us)] += 1
+        if self._total == 0 or us < self._min:
+            self._min = us
+        if us > self._max:
+            self._max = us
+        self._total += 1
+        self._sum += us
+
+    @property
+    def count(self) -> int:
+        return self._total
+
+    @property
+    def min(self) -> float:
+        return self._min / 1_000_000
+
+    @property
+    def max(self) -> float:
+        return self._max / 1_000_000
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._total / 1_000_000 if self._total else 0.0
+
+    def percentile(self, p: float) -> float:
+        """第 p 百分位（0~100），无样本时返回 0"""
+        if self._total == 0:
+            return 0.0
+        rank = max(int(self._total * p / 100.0 + 0.999999), 1)
+        seen = 0
+        for index, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank:
+                return min(_upper(index), self._max) / 1_000_000
+        return self.max
+
+    def reset(self) -> None:
+        self._counts = [0] * len(self._counts)
+        self._total = self._sum = self._min = self._max = 0
+
+    def decay(self) -> None:
+        """各桶计数减半，让旧样本逐步让位于新样本（最小/最大值保留）"""
+        self._counts = [n >> 1 for n in self._counts]
+        total = sum(self._counts)
+        self._sum = self._sum * total // self._total if self._total else 0
+        self._total = total
+
+    def merge(self, other: LatencyHistogram) -> None:
+        if other._total == 0:
+            return
+        for index, n in enumerate(other._counts):
+            if n:
+                self._counts[index] += n
+        if self._total == 0 or other._min < self._min:
+            self._min = other._min
+        self._max = max(self._max, other._max)
+        self._total += other._total
+        self._sum += other._sum
+
+    def snapshot(self) -> dict[str, float]:
+        """常用统计量，时间单位毫秒"""
+        return {
+            "count": self._total,
+            "mean_ms": self.mean * 1000,
+            "min_ms": self.min * 1000,
+            "p50_ms": self.percentile(50) * 1000,
+            "p90_ms": self.percentile(90) * 1000,
+            "p99_ms": self.percentile(99) * 1000,
+            "p999_ms": self.percentile(99.9) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class LinkStats:
+    """单个 (从站, 功能码) 的计数与延迟分布"""
+
+    __slots__ = (
+        "ok", "crc_errors", "timeouts", "short_frames", "exceptions",
+        "queue", "response", "total",
+    )
+
+    def __init__(self) -> None:
+        self.ok = 0
+        self.crc_errors = 0  # -1
+        self.timeouts = 0  # -2
+        self.short_frames = 0  # -3
+        self.exceptions = 0  # 从站异常应答
+        self.queue = LatencyHistogram()  # 入队 → 开始发送
+        self.response = LatencyHistogram()  # 开始发送 → 响应首字节
+        self.total = LatencyHistogram()  # 入队 → 完成
+
+    @property
+    def transactions(self) -> int:
+        return self.ok + self.errors
+
+    @property
+    def errors(self) -> int:
+        return self.crc_errors + self.timeouts + self.short_frames + self.exceptions
+
+    def snapshot(self) -> dict:
+        return {
+            "transactions": self.transactions,
+            "ok": self.ok,
+            "crc_errors": self.crc_errors,
+            "timeouts": self.timeouts,
+            "short_frames": self.short_frames,
+            "exceptions": self.exceptions,
+            "queue": self.queue.snapshot(),
+            "response": self.response.snapshot(),
+            "total": self.total.snapshot(),
+        }
+
+
+class BusStats:
+    """
+    总线健康统计，按 (从站, 功能码) 分组。
+    通讯线程记录，其他线程随时取快照（内部加锁）。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._links: dict[tuple[int, int], LinkStats] = {}
+
+    def _link(self, slave_id: int, function_code: int) -> LinkStats:
+        key = (slave_id, int(function_code))
+        link = self._links.get(key)
+        if link is None:
+            link = self._links[key] = LinkStats()
+        return link
+
+    def record_wire(self, slave_id: int, function_code: int, error_code: int,
+                    response_ns: int) -> None:
+        """记录一次线上往返的结果（error_code 同 ModbusResponse）"""
+        with self._lock:
+            link = self._link(slave_id, function_code)
+            if error_code == 0:
+                link.ok += 1
+            elif error_code == -1:
+                link.crc_errors += 1
+            elif error_code == -2:
+                link.timeouts += 1
+            elif error_code == -3:
+                link.short_frames += 1
+            else:
+                link.exceptions += 1
+            if response_ns:
+                link.response.record(response_ns / 1e9)
+
+    def record_request(self, slave_id: int, function_code: int, queue_ns: int,
+                       total_ns: int) -> None:
+        """记录一条请求从入队到完成的耗时"""
+        with self._lock:
+            link = self._link(slave_id, function_code)
+            link.queue.record(queue_ns / 1e9)
+            link.total.record(total_ns / 1e9)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._links.clear()
+
+    def snapshot(self) -> dict:
+        """
+        返回 {"links": {"从站/0x功能码": {...}}, "total": {...}}，
+        total 汇总所有分组的计数与延迟分布。
+        """
+        with self._lock:
+            total = LinkStats()
+            links = {}
+            for (slave, fc), link in sorted(self._links.items()):
+                links[f"{slave}/0x{fc:02X}"] = link.snapshot()
+                for name in ("ok", "crc_errors", "timeouts", "short_frames", "exceptions"):
+                    setattr(total, name, getattr(total, name) + getattr(link, name))
+                total.queue.merge(link.queue)
+                total.response.merge(link.response)
+                total.total.merge(link.total)
+            return {"links": links, "total": total.snapshot()}
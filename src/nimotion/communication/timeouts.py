@@ -0,0 +1,72 @@
+"""
+自适应响应超时。
+按 (从站, 功能码) 统计从站响应时间（请求离线 → 响应首字节），
+超时取高百分位 × 系数 + 余量并限幅；掉线设备只损失几十毫秒而非固定 0.5s。
+"""
+
+from __future__ import annotations
+
+from .stats import LatencyHistogram
+
+_ANY = -1  # 不区分从站的汇总键
+
+
+class AdaptiveTimeout:
+    """
+    响应超时估计器（非线程安全，仅在通讯线程使用）。
+    样本不足时依次退回同功能码的全端口统计、调用方给定的默认值。
+    """
+
+    PERCENTILE = 99.0
+    FACTOR = 2.0  # 百分位放大系数
+    MARGIN = 0.010  # 固定余量（秒），吸收 USB 转换器与系统调度抖动
+    FLOOR = 0.020  # 下限（秒）
+    MIN_SAMPLES = 20  # 样本数达到后才采用统计值
+    WINDOW = 512  # 样本超过该数时旧样本计数减半
+    MAX_BACKOFF = 4.0  # 连续超时后的放大上限（相对统计估计），掉线从站仍能快速失败
+
+    def __init__(self) -> None:
+        self._hist: dict[tuple[int, int], LatencyHistogram] = {}
+        self._backoff: dict[tuple[int, int], float] = {}
+
+    def record(self, slave_id: int, function_code: int, latency: float) -> None:
+        """记录一次成功响应的从站响应时间（秒）"""
+        key = (slave_id, int(function_code))
+        for k in (key, (_ANY, key[1])):
+            hist = self._hist.get(k)
+            if hist is None:
+                hist = self._hist[k] = LatencyHistogram()
+            if hist.count >= self.WINDOW:
+                hist.decay()
+            hist.record(latency)
+        self._backoff.pop(key, None)
+
+    def on_timeout(self, slave_id: int, function_code: int) -> None:
+        """
+        记录一次超时。下一次对该从站/功能码的等待时间翻倍，至多 MAX_BACKOFF 倍，
+        让偶发的慢响应有机会被收到并学入统计；掉线从站连续超时也不会退回默认值。
+        """
+        key = (slave_id, int(function_code))
+        self._backoff[key] = min(self._backoff.get(key, 1.0) * 2, self.MAX_BACKOFF)
+
+    def histogram(self, slave_id: int, function_code: int) -> LatencyHistogram | None:
+        return self._hist.get((slave_id, int(function_code)))
+
+    def timeout_for(self, slave_id: int, function_code: int, default: float) -> float:
+        """
+        本次请求等待响应首字节的时长（秒，不含请求帧自身的发送时长）。
+        default 为无统计时的取值，同时作为上限。
+        """
+        key = (slave_id, int(function_code))
+        hist = self._hist.get(key)
+        if hist is None or hist.count < self.MIN_SAMPLES:
+            hist = self._hist.get((_ANY, key[1]))
+        if hist is None or hist.count < self.MIN_SAMPLES:
+            return default
+        estimate = hist.percentile(self.PERCENTILE) * self.FACTOR + self.MARGIN
+        estimate *= self._backoff.get(key, 1.0)
+        return min(max(estimate, self.FLOOR), default)
+
+    def reset(self) -> None:
+        self._hist.clear()
+        self._backoff.clear()
@@ -5,16 +5,36 @@
 
 from __future__ import annotations
 
+import dataclasses
+import itertools
 import logging
+import os
+import select
+import threading
 import time
+from typing import Any
 
 from PyQt5.QtCore import QMutex, QThread, QWaitCondition, pyqtSignal
 
 logger = logging.getLogger(__name__)
 
-from ..models.types import ModbusRequest, ModbusResponse
+from ..models.types import ModbusRequest, ModbusResponse, Priority, TransactionTrace
+from .breaker import SLAVE_OFFLINE, CircuitBreaker
+from .capture import RX, TX, CaptureWriter
+from .coalesce import ReadBlock, is_read, split_response
+from .frame_receiver import FrameReceiver
+from .handle import GroupCallback, GroupResult, RequestGroup, RequestHandle, ResponseCallback
 from .modbus_rtu import ModbusRTU
-from .serial_port import SerialConfig, SerialPort
+from .scheduler import OVERFLOW, RequestScheduler
+from .serial_port import (
+    SerialConfig,
+    SerialPort,
+    char_time,
+    frame_time,
+    silent_interval,
+)
+from .stats import BusStats
+from .timeouts import AdaptiveTimeout
 
 
 class CommWorker(QThread):
@@ -24,18 +44,40 @@ class CommWorker(QThread):
     connected = pyqtSignal()  # 串口已连接
     disconnected = pyqtSignal()  # 串口已断开
     connection_error = pyqtSignal(str)  # 连接失败
-    response_received = pyqtSignal(object)  # ModbusResponse
+    response_received = pyqtSignal(object)  # ModbusResponse（仅未指定回调的请求）
     raw_data_received = pyqtSignal(bytes)  # 原始数据（串口调试模式）
     raw_data_sent = pyqtSignal(bytes)  # 原始数据已发送
     bytes_count_updated = pyqtSignal(int, int)  # (tx_total, rx_total)
+    queue_overflow = pyqtSignal(str, int)  # (通道名, 本次因通道已满丢弃的请求数)
+    slave_online_changed = pyqtSignal(int, bool)  # (从站, 是否在线): 熔断/恢复
+    # 批量模式下代替 raw_data_sent/raw_data_received/response_received:
+    # [(EVENT_*, bytes 或 ModbusResponse, 墙钟时间), ...]，按发生顺序
+    events_batched = pyqtSignal(list)
+    _callback_ready = pyqtSignal(object, object)  # (RequestHandle, ModbusResponse)，内部用
+    _group_ready = pyqtSignal(object, object)  # (RequestGroup, GroupResult)，内部用
+    _batch_ready = pyqtSignal(object, object)  # (事件列表, 收发计数或 None)，内部用
+
+    # -- 批量事件类型 --
+    EVENT_TX = "tx"
+    EVENT_RX = "rx"
+    EVENT_RESPONSE = "response"
+    _EVENT_CALLBACK = "callback"  # 请求回调，不对外发布
+    _EVENT_GROUP = "group"  # 事务组回调，不对外发布
 
     # -- 内部常量 --
-    MIN_FRAME_GAP = 0.005  # 帧间最小间隔（秒）
+    TURNAROUND_ALPHA = 0.2  # 从站响应时间 EWMA 平滑系数
+    COALESCE_MAX_GAP = 8  # 合并读请求时允许夹带的未请求寄存器数
+    IDLE_POLL_MS = 50  # 无法监视串口 fd 时（如 Windows）的空闲轮询周期
+    IDLE_WAIT = 1.0  # 监视 fd 时空闲等待的上限（秒），仅作兜底
 
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self._serial = SerialPort()
         self._modbus = ModbusRTU()
+        self._receiver = FrameReceiver()
+        self._bus_idle_at = 0.0  # 上一帧收发结束时刻 (perf_counter)
+        self._first_rx_at = 0.0  # 本次响应首字节到达时刻
+        self._turnaround: float | None = None  # 从站响应时间 EWMA（秒）
         self._running = False
         self._tx_bytes = 0
         self._rx_bytes = 0
@@ -43,9 +85,41 @@ class CommWorker(QThread):
         # 请求队列 (用 mutex + condition 实现)
         self._mutex = QMutex()
         self._condition = QWaitCondition()
-        self._request_queue: list[ModbusRequest] = []
+        self._scheduler = RequestScheduler()
         self._pending_raw: bytes | None = None
         self._raw_mode = False  # True = 串口调试模式
+        # 唤醒管道: 空闲时线程阻塞在 select(串口 fd, 管道读端) 上，
+        # 新请求/断开时向写端写一字节唤醒。仅线程运行期间存在，受 _mutex 保护
+        self._wake_r: int | None = None
+        self._wake_w: int | None = None
+        # 后台读请求合并: 允许的地址间隙，None = 不合并
+        self.coalesce_gap: int | None = self.COALESCE_MAX_GAP
+        # 按实测响应时间估算的响应超时，None = 固定使用 SerialConfig.timeout
+        self.adaptive_timeout: AdaptiveTimeout | None = AdaptiveTimeout()
+        # 从站熔断: 连续超时的从站快速失败并定期探测，None = 不熔断（受 _mutex 保护）
+        self.breaker: CircuitBreaker | None = CircuitBreaker()
+        # 被从站拒绝过的合并块 (从站, 功能码, 起始地址, 数量)，不再尝试
+        self._rejected_blocks: set[tuple[int, int, int, int]] = set()
+        # 事务统计与最近一次线上往返的时间戳 (开始发送, 响应首字节, 完成)
+        self._bus_stats = BusStats()
+        self._wire_ns = (0, 0, 0)
+        self._first_rx_ns = 0
+        # 报文抓包（None = 未开启），由后台线程落盘
+        self._capture: CaptureWriter | None = None
+        # 在途请求 -> 句柄（键为请求对象 id，受 _mutex 保护）
+        self._handles: dict[int, RequestHandle] = {}
+        self._request_ids = itertools.count(1)
+        # 批量投递: 通讯线程攒下事件，按 set_batching 的频率一次性跨线程投递
+        self._batch_interval: float | None = None
+        self._events: list[tuple] = []
+        self._events_lock = threading.Lock()
+        self._events_urgent = False  # 有待执行的回调/响应，空闲时立即投递
+        self._counts_dirty = False
+        self._next_flush = 0.0
+        # 回调经排队连接回到本对象所在的主线程执行
+        self._callback_ready.connect(self._run_callback)
+        self._group_ready.connect(self._run_group_callback)
+        self._batch_ready.connect(self._dispatch_batch)
 
     # -- 公共方法（主线程调用）--
 
@@ -53,10 +127,24 @@ class CommWorker(QThread):
     def is_connected(self) -> bool:
         return self._serial.is_open
 
+    @property
+    def config(self) -> SerialConfig:
+        """当前（或最近一次）串口配置"""
+        return self._serial.config
+
+    @property
+    def byte_counts(self) -> tuple[int, int]:
+        """累计 (发送, 接收) 字节数"""
+        return self._tx_bytes, self._rx_bytes
+
     def connect_port(self, config: SerialConfig) -> None:
         """请求连接串口"""
         try:
             self._serial.open(config)
+            self._mutex.lock()
+            if self.breaker is not None:
+                self.breaker.reset()
+            self._mutex.unlock()
             self._running = True
             if not self.isRunning():
                 self.start()
@@ -67,27 +155,171 @@ class CommWorker(QThread):
     def disconnect_port(self) -> None:
         """请求断开串口"""
         self._running = False
-        self._condition.wakeAll()
+        self._mutex.lock()
+        self._wake()
+        self._mutex.unlock()
         self.wait(2000)
         self._serial.close()
+        # 未发送的请求随断开一并取消
+        self._mutex.lock()
+        pending = list(self._handles.values())
+        self._handles.clear()
+        self._scheduler.clear()
+        self._mutex.unlock()
+        for handle in pending:
+            self._deliver(handle, self._cancelled_response(handle.request))
+        self._flush_events()
         self.disconnected.emit()
 
-    def send_modbus(self, request: ModbusRequest) -> None:
-        """提交 Modbus 请求（主线程调用），支持连续多条排队"""
+    def send_modbus(
+        self,
+        request: ModbusRequest,
+        callback: ResponseCallback | None = None,
+        group: RequestGroup | None = None,
+    ) -> RequestHandle:
+        """
+        提交 Modbus 请求（任意线程可调用），支持连续多条排队。
+        按 request.lane 分通道调度：安全 > 运动 > 后台，通道内先进先出。
+        通道已满或 request.deadline 已过时，句柄以 error_code -5/-6 完成，不发送；
+        目标从站已熔断时（安全通道除外）立即以 -7 完成。
+
+        参数:
+            request: 请求
+            callback: 响应回调，在主线程调用；为 None 时响应经 response_received 广播
+            group: 所属事务组（begin_group 创建）；组已中止时请求直接以 -4 取消
+
+        返回: 请求句柄，可 result() 等待或 add_done_callback()
+        """
         self._mutex.lock()
-        self._request_queue.append(request)
+        if id(request) in self._handles:
+            # 同一请求对象重复提交时复制一份，保证句柄一一对应
+            request = dataclasses.replace(request)
+        handle = RequestHandle(next(self._request_ids), request, callback)
+        handle.enqueued_ns = time.perf_counter_ns()
+        if group is not None:
+            handle.group = group
+            group.handles.append(handle)
+            if group.failed is not None:
+                self._mutex.unlock()
+                self._deliver(handle, self._cancelled_response(request))
+                return handle
+        if (
+            self.breaker is not None
+            and request.lane != Priority.SAFETY
+            and self.breaker.is_open(request.slave_id)
+        ):
+            self._mutex.unlock()
+            self._deliver(handle, self._cancelled_response(request, SLAVE_OFFLINE))
+            return handle
+        self._handles[id(request)] = handle
+        dropped = self._scheduler.push(request, time.perf_counter())
+        dropped_handles = [self._handles.pop(id(r)) for r in dropped]
+        discarded = self._take_discarded()
         self._raw_mode = False
-        self._condition.wakeOne()
+        self._wake()
+        self._mutex.unlock()
+        if dropped:
+            logger.info(
+                "安全命令取消了从站 %d 的 %d 条待发运动命令", request.slave_id, len(dropped),
+            )
+            for h in dropped_handles:
+                self._deliver(h, self._cancelled_response(h.request))
+        self._finish_discarded(discarded)
+        return handle
+
+    def begin_group(self, name: str = "", callback: GroupCallback | None = None) -> RequestGroup:
+        """
+        创建事务组（任意线程可调用）。
+        随后以 send_modbus(..., group=组) 依次提交组内请求，最后调用 end_group。
+        组内请求须走同一调度通道才能保证按提交顺序执行（多帧写命令均在运动通道）。
+        """
+        return RequestGroup(next(self._request_ids), name, callback)
+
+    def end_group(self, group: RequestGroup) -> RequestGroup:
+        """关闭事务组，不再加入请求；组内请求均已结束时立即完成"""
+        self._mutex.lock()
+        group.sealed = True
+        finished = self._group_finished(group)
         self._mutex.unlock()
+        if finished:
+            self._finish_group(group)
+        return group
+
+    def queue_stats(self) -> dict[str, dict[str, float]]:
+        """各调度通道的队列深度与排队时间统计（可在任意线程调用）"""
+        self._mutex.lock()
+        try:
+            return self._scheduler.snapshot()
+        finally:
+            self._mutex.unlock()
 
     def send_raw(self, data: bytes) -> None:
         """发送原始数据（串口调试模式）"""
         self._mutex.lock()
         self._pending_raw = data
         self._raw_mode = True
-        self._condition.wakeOne()
+        self._wake()
         self._mutex.unlock()
 
+    @property
+    def turnaround(self) -> float | None:
+        """
+        实测从站响应时间（请求最后一字节离线 → 响应首字节到达）的平滑值（秒）。
+        尚无成功响应时为 None。
+        """
+        return self._turnaround
+
+    def stats(self) -> dict:
+        """
+        通讯统计快照（可在任意线程调用）:
+        links/total 为按 (从站, 功能码) 的错误计数与 queue/response/total 延迟分布，
+        另附队列状态、从站熔断状态、响应时间、收发字节数与帧缓存命中数。
+        """
+        snapshot = self._bus_stats.snapshot()
+        snapshot["queue"] = self.queue_stats()
+        self._mutex.lock()
+        snapshot["breaker"] = self.breaker.snapshot() if self.breaker is not None else {}
+        self._mutex.unlock()
+        turnaround = self._turnaround
+        snapshot["turnaround_ms"] = None if turnaround is None else turnaround * 1000
+        snapshot["tx_bytes"], snapshot["rx_bytes"] = self._tx_bytes, self._rx_bytes
+        snapshot["frame_cache"] = self._modbus.cache_info()
+        return snapshot
+
+    def reset_stats(self) -> None:
+        """清空事务统计"""
+        self._bus_stats.reset()
+
+    def start_capture(self, path: str) -> CaptureWriter:
+        """开始把收发报文写入抓包文件（已在抓包时先结束上一个文件）"""
+        self.stop_capture()
+        self._capture = CaptureWriter(path, self._serial.config.baudrate)
+        return self._capture
+
+    def stop_capture(self) -> None:
+        """结束抓包，等待剩余记录落盘"""
+        capture, self._capture = self._capture, None
+        if capture is not None:
+            capture.close()
+
+    @property
+    def capture(self) -> CaptureWriter | None:
+        return self._capture
+
+    def set_batching(self, rate_hz: float | None) -> None:
+        """
+        开启/关闭批量投递。
+        开启后收发帧、广播响应与请求回调在通讯线程攒批，最多每秒投递 rate_hz 次
+        （总线空闲且有回调待执行时立即投递），收发帧与响应改经 events_batched 发布，
+        bytes_count_updated 每批一次。None/0 = 逐条发信号。
+        """
+        self._batch_interval = 1.0 / rate_hz if rate_hz else None
+
+    @property
+    def batching(self) -> float | None:
+        """当前批量投递频率（Hz），未开启为 None"""
+        return 1.0 / self._batch_interval if self._batch_interval else None
+
     def reset_counters(self) -> None:
         """重置收发计数器"""
         self._tx_bytes = 0
@@ -97,35 +329,51 @@ class CommWorker(QThread):
     # -- 线程主循环 --
 
     def run(self) -> None:
+        self._open_wakeup()
+        try:
+            self._loop()
+        finally:
+            self._flush_events()
+            self._close_wakeup()
+
+    def _loop(self) -> None:
         while self._running:
             self._mutex.lock()
-            # 等待请求或超时（超时用于检测串口调试模式的持续接收）
-            if not self._request_queue and self._pending_raw is None:
-                self._condition.wait(self._mutex, 50)  # 50ms 轮询
-            # 取出所有排队的请求
-            requests = list(self._request_queue)
-            self._request_queue.clear()
+            # 空闲时等待新请求或串口来数据（串口调试模式的持续接收）
+            if not self._scheduler and self._pending_raw is None and self._running:
+                self._wait_idle()
+            # 每次只取一条（或一个合并读块），保证新到的高优先级请求能插到下一帧
+            now = time.perf_counter()
+            probe = self._next_probe(now)
+            request, block = (None, None) if probe is not None else self._pop_next(now)
             raw = self._pending_raw
             raw_mode = self._raw_mode
             self._pending_raw = None
+            discarded = self._take_discarded()
             self._mutex.unlock()
+            if discarded:
+                self._finish_discarded(discarded)
 
             try:
                 if raw_mode and raw is not None:
                     self._handle_raw_send(raw)
-                else:
-                    for request in requests:
-                        if not self._running:
-                            break
-                        self._handle_modbus(request)
-
-                # 串口调试模式：持续接收
-                if self._serial.is_open:
+                elif block is not None and block.merged:
+                    self._handle_block(block)
+                elif request is not None:
+                    self._handle_modbus(request)
+                elif probe is not None:
+                    self._handle_probe(probe)
+
+                # 串口调试模式：空闲时持续接收
+                if request is None and probe is None and self._serial.is_open:
                     incoming = self._serial.read_all()
                     if incoming:
                         self._rx_bytes += len(incoming)
-                        self.raw_data_received.emit(incoming)
-                        self.bytes_count_updated.emit(self._tx_bytes, self._rx_bytes)
+                        capture = self._capture
+                        if capture is not None:
+                            capture.write(RX, incoming)
+                        self._publish(self.EVENT_RX, incoming)
+                        self._publish_counts()
             except Exception as exc:
                 logger.exception("通讯线程异常")
                 if self._running:
@@ -133,30 +381,393 @@ class CommWorker(QThread):
                     self.connection_error.emit(f"通讯异常: {exc}")
                     self.disconnected.emit()
                     self._running = False
+            if (self._events or self._counts_dirty) and time.perf_counter() >= self._next_flush:
+                self._flush_events()
+
+    def _wake(self) -> None:
+        """唤醒空闲等待中的通讯线程（调用方持有 _mutex）"""
+        self._condition.wakeAll()
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass  # 管道已满: 线程必然会被唤醒
+
+    def _open_wakeup(self) -> None:
+        if os.name != "posix":
+            return  # Windows 的 select 不支持管道与串口句柄，退回条件变量轮询
+        r, w = os.pipe()
+        os.set_blocking(r, False)
+        os.set_blocking(w, False)
+        self._mutex.lock()
+        self._wake_r, self._wake_w = r, w
+        self._mutex.unlock()
+
+    def _close_wakeup(self) -> None:
+        self._mutex.lock()
+        fds = (self._wake_r, self._wake_w)
+        self._wake_r = self._wake_w = None
+        self._mutex.unlock()
+        for fd in fds:
+            if fd is not None:
+                os.close(fd)
+
+    def _wait_idle(self) -> None:
+        """
+        空闲等待（进入与返回时均持有 _mutex）。
+        阻塞在串口 fd 与唤醒管道上，空闲时不占 CPU，串口来数据即刻返回；
+        拿不到 fd 时退回条件变量定时轮询。
+        """
+        wait = self.IDLE_WAIT
+        if self._events or self._counts_dirty:
+            if self._events_urgent:
+                self._flush_events()  # 可能有回调等着发下一条请求
+            else:
+                wait = min(max(self._next_flush - time.perf_counter(), 0.0), wait)
+        if self.breaker is not None:
+            probe_in = self.breaker.next_probe_in(time.perf_counter())
+            if probe_in is not None:
+                wait = min(probe_in, wait)
+        wake_r = self._wake_r
+        fd = self._serial.fileno() if wake_r is not None else None
+        if fd is None or wake_r is None:
+            self._condition.wait(self._mutex, min(self.IDLE_POLL_MS, int(wait * 1000) + 1))
+            return
+        self._mutex.unlock()
+        try:
+            select.select([fd, wake_r], [], [], wait)
+            os.read(wake_r, 4096)  # 清空唤醒字节
+        except BlockingIOError:
+            pass  # 因串口数据返回，管道为空
+        except (OSError, ValueError):
+            time.sleep(self.IDLE_POLL_MS / 1000)  # 串口正被关闭
+        self._mutex.lock()
 
     def _handle_raw_send(self, data: bytes) -> None:
         """发送原始数据"""
+        capture = self._capture
+        if capture is not None:
+            capture.write(TX, data)
         self._serial.write(data)
         self._tx_bytes += len(data)
-        self.raw_data_sent.emit(data)
-        self.bytes_count_updated.emit(self._tx_bytes, self._rx_bytes)
+        self._publish(self.EVENT_TX, data)
+        self._publish_counts()
 
     def _handle_modbus(self, request: ModbusRequest) -> None:
         """发送 Modbus 请求并等待响应"""
-        frame = self._modbus.build_frame(request)
+        resp = self._transact(request)
+        self._complete(request, resp)
+        self._track_health(request, resp)
+        self._publish_counts()
+
+    def _pop_next(self, now: float) -> tuple[ModbusRequest | None, ReadBlock | None]:
+        """
+        取出下一条请求，后台读请求顺带取走可合并的读（调用方持有 _mutex）。
+        返回 (请求, 合并块)；未合并时块为 None。
+        已知会被从站拒绝的块: 其余部分放回队首，本轮只发该请求，
+        之后每轮仍由调度器挑选下一帧（安全命令可随时插入）。
+        """
+        request = self._scheduler.pop(now)
+        if (
+            request is None
+            or self.coalesce_gap is None
+            or request.lane != Priority.BACKGROUND
+            or not is_read(request)
+        ):
+            return request, None
+        block = self._scheduler.pop_reads(request, now, self.coalesce_gap)
+        if not block.merged:
+            return request, None
+        if block.key in self._rejected_blocks:
+            self._scheduler.requeue([p for p in block.parts if p is not request], now)
+            return request, None
+        return request, block
+
+    def _next_probe(self, now: float) -> ModbusRequest | None:
+        """到期的熔断探测（调用方持有 _mutex）；安全命令排队时让其先发，不等探测超时"""
+        if self.breaker is None or self._raw_mode or self._scheduler.depth(Priority.SAFETY):
+            return None
+        return self.breaker.due_probe(now)
+
+    def _handle_probe(self, probe: ModbusRequest) -> None:
+        """
+        向已熔断的从站发送探测帧，有应答即恢复（探测结果不上报）。
+        等待时长按该从站/功能码的自适应估计，探测自带的 timeout 仅为上限，
+        掉线从站每次探测只占用与正常应答相当的总线时间。
+        """
+        if self.adaptive_timeout is not None and probe.timeout is not None:
+            probe.timeout = self.adaptive_timeout.timeout_for(
+                probe.slave_id, probe.function_code, probe.timeout,
+            )
+        resp = self._transact(probe)
+        self._track_health(probe, resp)
+        self._publish_counts()
+
+    def _handle_block(self, block: ReadBlock) -> None:
+        """
+        发送合并后的块读，并把结果按原请求拆分逐条回报。
+        从站以异常拒绝（如块内含非法地址）时记住该块，各部分放回队首，
+        由主循环逐条发送（不在此一次发完，以免挡住新到的安全命令）。
+        """
+        resp = self._transact(block.request)
+        if resp.is_error and resp.error_code > 0:
+            logger.info(
+                "合并读 0x%04X×%d 被从站拒绝(异常码 %d)，改为逐条读取",
+                block.request.address, block.request.count, resp.error_code,
+            )
+            self._rejected_blocks.add(block.key)
+            self._mutex.lock()
+            self._scheduler.requeue(block.parts, time.perf_counter())
+            self._mutex.unlock()
+            self._track_health(block.request, resp)
+            return
+        for part in block.parts:
+            part_resp = split_response(block.request, resp, part)
+            # raw_tx 按原请求重建，下游仍可从中取起始地址
+            part_resp.raw_tx = self._modbus.encode(part).frame
+            self._complete(part, part_resp)
+        self._track_health(block.request, resp)
+        self._publish_counts()
+
+    def _complete(self, request: ModbusRequest, resp: ModbusResponse) -> None:
+        """把响应交付给发起该请求的句柄"""
+        self._mutex.lock()
+        handle = self._handles.pop(id(request), None)
+        self._mutex.unlock()
+        tx_start, first_rx, done = self._wire_ns
+        enqueued = handle.enqueued_ns if handle is not None and handle.enqueued_ns else tx_start
+        resp.trace = TransactionTrace(enqueued, tx_start, first_rx, done)
+        self._bus_stats.record_request(
+            request.slave_id, request.function_code, resp.trace.queue_ns, resp.trace.total_ns,
+        )
+        if handle is None:
+            # 未经 send_modbus 提交（如内部探测帧）
+            self._publish(self.EVENT_RESPONSE, resp)
+            return
+        self._deliver(handle, resp)
+
+    def _deliver(self, handle: RequestHandle, resp: ModbusResponse) -> None:
+        resp.request_id = handle.request_id
+        handle.set_result(resp)
+        if handle.callback is not None:
+            self._publish(self._EVENT_CALLBACK, (handle, resp))
+        else:
+            self._publish(self.EVENT_RESPONSE, resp)
+        if handle.group is not None:
+            self._group_progress(handle, resp)
+
+    def _group_progress(self, handle: RequestHandle, resp: ModbusResponse) -> None:
+        """事务组成员结束: 首个失败时取消组内尚在排队的请求，全部结束后结算"""
+        group = handle.group
+        assert group is not None
+        cancelled: list[RequestHandle] = []
+        self._mutex.lock()
+        if resp.is_error and group.failed is None:
+            group.failed = handle
+            pending = [h.request for h in group.handles if not h.done()]
+            cancelled = [self._handles.pop(id(r)) for r in self._scheduler.remove(pending)]
+        finished = self._group_finished(group)
+        self._mutex.unlock()
+        if cancelled:
+            logger.info(
+                "事务组 %s 第 %d 帧失败，取消其余 %d 帧",
+                group.name or group.request_id, group.handles.index(handle) + 1, len(cancelled),
+            )
+        for h in cancelled:
+            self._deliver(h, self._cancelled_response(h.request))
+        if finished:
+            self._finish_group(group)
+
+    @staticmethod
+    def _group_finished(group: RequestGroup) -> bool:
+        """组已关闭且成员全部结束（调用方持有 _mutex；每组只返回一次 True）"""
+        if group.closed or not group.sealed or not all(h.done() for h in group.handles):
+            return False
+        group.closed = True
+        return True
+
+    def _finish_group(self, group: RequestGroup) -> None:
+        responses = [h.result() for h in group.handles]
+        start = min((h.enqueued_ns for h in group.handles), default=0)
+        failed = group.failed
+        result = GroupResult(
+            ok=failed is None,
+            responses=responses,
+            sent=sum(1 for r in responses if r.trace is not None),
+            latency_ns=time.perf_counter_ns() - start if start else 0,
+            failed=failed.result() if failed is not None else None,
+            failed_request=failed.request if failed is not None else None,
+        )
+        group.set_result(result)
+        if group.callback is not None:
+            self._publish(self._EVENT_GROUP, (group, result))
+
+    def _publish(self, kind: str, payload: Any) -> None:
+        """发布一个事件: 逐条模式直接发信号，批量模式暂存（任意线程）"""
+        if self._batch_interval is None:
+            if kind == self.EVENT_TX:
+                self.raw_data_sent.emit(payload)
+            elif kind == self.EVENT_RX:
+                self.raw_data_received.emit(payload)
+            elif kind == self.EVENT_RESPONSE:
+                self.response_received.emit(payload)
+            elif kind == self._EVENT_GROUP:
+                self._group_ready.emit(*payload)
+            else:
+                self._callback_ready.emit(*payload)
+            return
+        with self._events_lock:
+            self._events.append((kind, payload, time.time()))
+            if kind in (self.EVENT_RESPONSE, self._EVENT_CALLBACK, self._EVENT_GROUP):
+                self._events_urgent = True
+
+    def _publish_counts(self) -> None:
+        if self._batch_interval is None:
+            self.bytes_count_updated.emit(self._tx_bytes, self._rx_bytes)
+        else:
+            self._counts_dirty = True
+
+    def _flush_events(self) -> None:
+        """把暂存的事件作为一个信号投递到主线程"""
+        with self._events_lock:
+            events, self._events = self._events, []
+            self._events_urgent = False
+        counts = (self._tx_bytes, self._rx_bytes) if self._counts_dirty else None
+        self._counts_dirty = False
+        self._next_flush = time.perf_counter() + (self._batch_interval or 0.0)
+        if events or counts is not None:
+            self._batch_ready.emit(events, counts)
+
+    def _dispatch_batch(self, events: list, counts: tuple[int, int] | None) -> None:
+        """主线程: 执行回调，其余事件经 events_batched 一次发布"""
+        published = []
+        for event in events:
+            if event[0] == self._EVENT_CALLBACK:
+                self._run_callback(*event[1])
+            elif event[0] == self._EVENT_GROUP:
+                self._run_group_callback(*event[1])
+            else:
+                published.append(event)
+        if published:
+            self.events_batched.emit(published)
+        if counts is not None:
+            self.bytes_count_updated.emit(*counts)
+
+    def _run_callback(self, handle: RequestHandle, resp: ModbusResponse) -> None:
+        if handle.callback is None:
+            return
+        try:
+            handle.callback(resp)
+        except Exception:
+            logger.exception("请求 #%d 回调异常", handle.request_id)
+
+    def _run_group_callback(self, group: RequestGroup, result: GroupResult) -> None:
+        if group.callback is None:
+            return
+        try:
+            group.callback(result)
+        except Exception:
+            logger.exception("事务组 #%d 回调异常", group.request_id)
+
+    def _track_health(self, request: ModbusRequest, resp: ModbusResponse) -> None:
+        """
+        按事务结果更新从站熔断状态。
+        只有超时计入；熔断时该从站排队中的请求立即以 -7 结束，不再逐条等超时。
+        """
+        breaker = self.breaker
+        if breaker is None or request.slave_id == 0:
+            return  # 广播帧本无应答
+        slave_id = request.slave_id
+        self._mutex.lock()
+        if resp.error_code != -2:
+            recovered = breaker.record_success(slave_id)
+            self._mutex.unlock()
+            if recovered:
+                logger.info("从站 %d 恢复应答", slave_id)
+                self.slave_online_changed.emit(slave_id, True)
+            return
+        tripped = breaker.record_timeout(slave_id, time.perf_counter())
+        cancelled = []
+        if tripped:
+            cancelled = [self._handles.pop(id(r)) for r in self._scheduler.cancel_slave(slave_id)]
+        self._mutex.unlock()
+        if not tripped:
+            return
+        logger.warning(
+            "从站 %d 连续 %d 次无应答，暂停通讯并定期探测（取消 %d 条排队请求）",
+            slave_id, breaker.threshold, len(cancelled),
+        )
+        self.slave_online_changed.emit(slave_id, False)
+        for handle in cancelled:
+            self._deliver(handle, self._cancelled_response(handle.request, SLAVE_OFFLINE))
+
+    def _take_discarded(self) -> list[tuple[RequestHandle, int]]:
+        """取出调度器丢弃的请求对应的句柄（调用方持有 _mutex）"""
+        return [
+            (self._handles.pop(id(r)), code)
+            for r, code in self._scheduler.take_discarded()
+            if id(r) in self._handles
+        ]
+
+    def _finish_discarded(self, discarded: list[tuple[RequestHandle, int]]) -> None:
+        """完成被丢弃请求的句柄，并报告通道溢出"""
+        overflow: dict[str, int] = {}
+        for handle, code in discarded:
+            if code == OVERFLOW:
+                lane = handle.request.lane.name.lower()
+                overflow[lane] = overflow.get(lane, 0) + 1
+            self._deliver(handle, self._cancelled_response(handle.request, code))
+        for lane, count in overflow.items():
+            logger.warning("%s 通道已满，丢弃 %d 条请求", lane, count)
+            self.queue_overflow.emit(lane, count)
+
+    @staticmethod
+    def _cancelled_response(request: ModbusRequest, error_code: int = -4) -> ModbusResponse:
+        """未发送即结束的请求: -4 被取消, -5 通道已满, -6 已过期, -7 从站已熔断"""
+        return ModbusResponse(
+            slave_id=request.slave_id,
+            function_code=request.function_code,
+            data=b"",
+            is_error=True,
+            error_code=error_code,
+            timestamp=time.time(),
+        )
+
+    def _transact(self, request: ModbusRequest) -> ModbusResponse:
+        """完成一次请求-响应往返，返回解析后的响应（不发信号）"""
+        # 重复的请求（状态轮询、控制字）直接取缓存的帧，信号与 raw_tx 共用这一份
+        encoded = self._modbus.encode(request)
+        frame = encoded.frame
+        config = self._serial.config
+        self._wait_frame_gap(config)
         self._serial.flush_input()
+        tx_start_ns = time.perf_counter_ns()
         written = self._serial.write(frame)
+        # 估算请求最后一字节离线时刻，用于测量从站响应时间
+        tx_end = time.perf_counter() + frame_time(config.baudrate, written)
         self._tx_bytes += written
         if written != len(frame):
             logger.warning("串口写入不完整: 期望 %d 字节, 实际 %d", len(frame), written)
-        self.raw_data_sent.emit(frame)
-
-        time.sleep(self.MIN_FRAME_GAP)
+        self._publish(self.EVENT_TX, frame)
 
-        expected_len = self._modbus.expected_response_length(request)
-        raw_rx = self._serial.read(expected_len)
+        wait = self._response_timeout(request, config)
+        raw_rx, crc_ok = self._receive_frame(tx_end - time.perf_counter() + wait, encoded.echo)
+        self._bus_idle_at = time.perf_counter()
         self._rx_bytes += len(raw_rx)
+        capture = self._capture
+        if capture is not None:
+            capture.write(TX, frame, tx_start_ns)
+            if raw_rx:
+                capture.write(RX, raw_rx, self._first_rx_ns)
+        if raw_rx:
+            latency = self._first_rx_at - tx_end
+            self._update_turnaround(latency)
+            if self.adaptive_timeout is not None:
+                self.adaptive_timeout.record(request.slave_id, request.function_code, latency)
+        elif self.adaptive_timeout is not None:
+            self.adaptive_timeout.on_timeout(request.slave_id, request.function_code)
 
+        first_rx_ns = self._first_rx_ns if raw_rx else 0
         if len(raw_rx) == 0:
             resp = ModbusResponse(
                 slave_id=request.slave_id,
@@ -168,10 +779,83 @@ class CommWorker(QThread):
                 raw_rx=b"",
                 timestamp=time.time(),
             )
+        elif crc_ok is None:
+            # 静默断帧时长度仍不足
+            resp = ModbusResponse(
+                slave_id=raw_rx[0],
+                function_code=request.function_code,
+                data=b"",
+                is_error=True,
+                error_code=-3,  # 帧长度不足
+                raw_tx=frame,
+                raw_rx=raw_rx,
+                timestamp=time.time(),
+            )
         else:
-            resp = self._modbus.parse_response(raw_rx, request)
+            resp = self._modbus.parse_expected(raw_rx, request, encoded, crc_ok)
             resp.raw_tx = frame
             resp.timestamp = time.time()
+        self._wire_ns = (tx_start_ns, first_rx_ns, time.perf_counter_ns())
+        self._bus_stats.record_wire(
+            request.slave_id, request.function_code, resp.error_code,
+            first_rx_ns - tx_start_ns if first_rx_ns else 0,
+        )
+        return resp
+
+    def _wait_frame_gap(self, config: SerialConfig) -> None:
+        """保证与上一帧之间至少间隔 max(t3.5, 配置下限)，已过去的时间不再补睡"""
+        gap = max(silent_interval(config.baudrate), config.frame_gap_floor)
+        remaining = self._bus_idle_at + gap - time.perf_counter()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def _update_turnaround(self, sample: float) -> None:
+        sample = max(sample, 0.0)
+        if self._turnaround is None:
+            self._turnaround = sample
+        else:
+            self._turnaround += self.TURNAROUND_ALPHA * (sample - self._turnaround)
+
+    def _response_timeout(self, request: ModbusRequest, config: SerialConfig) -> float:
+        """
+        从请求离线起等待响应首字节的时长（秒）。
+        请求自带 timeout 时以其为准（如 EEPROM 保存）；否则按实测响应时间自适应，
+        以 SerialConfig.timeout 为上限。
+        """
+        if request.timeout is not None:
+            return request.timeout
+        if self.adaptive_timeout is None:
+            return config.timeout
+        return self.adaptive_timeout.timeout_for(
+            request.slave_id, request.function_code, config.timeout,
+        )
+
+    def _receive_frame(
+        self, timeout: float | None = None, expect: bytes | None = None,
+    ) -> tuple[bytes, bool | None]:
+        """
+        接收一帧响应。
+        首字节按 timeout（None 取串口配置）等待；之后按帧头推算的长度读取，
+        剩余字节在"传输时长 + 静默间隔"内未到即视为帧结束。
+        expect 为预期的完整响应（写请求回显），收到相同帧时免算 CRC。
 
-        self.response_received.emit(resp)
-        self.bytes_count_updated.emit(self._tx_bytes, self._rx_bytes)
+        返回: (已收数据, CRC 是否正确；帧未收齐时为 None)
+        """
+        config = self._serial.config
+        rx = self._receiver
+        rx.reset(expect)
+        first = self._serial.read(1, config.timeout if timeout is None else max(timeout, 0.0))
+        if not first:
+            return b"", None
+        self._first_rx_at = time.perf_counter()
+        self._first_rx_ns = time.perf_counter_ns()
+        rx.feed(first)
+        silence = max(silent_interval(config.baudrate), config.rx_silence_floor)
+        per_byte = char_time(config.baudrate)
+        while not rx.done:
+            needed = rx.needed
+            chunk = self._serial.read(needed, needed * per_byte + silence)
+            if not chunk:
+                break  # 静默: 帧在长度不足处结束
+            rx.feed(chunk)
+        return rx.frame, (rx.crc_ok if rx.done else None)
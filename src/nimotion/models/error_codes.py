@@ -26,6 +26,17 @@ MODBUS_EXCEPTIONS: dict[int, str] = {
     0x06: "从设备忙",
 }
 
+# 通讯层错误（ModbusResponse.error_code 取负值，与从站异常码区分）
+COMM_ERRORS: dict[int, str] = {
+    -1: "CRC 校验失败",
+    -2: "通讯超时",
+    -3: "响应帧不完整",
+    -4: "请求已取消",
+    -5: "请求队列已满，请求被丢弃",
+    -6: "请求已过期，未发送",
+    -7: "从站无响应，请求未发送",
+}
+
 
 def get_error_text(code: int) -> str:
     """根据错误码获取中文描述"""
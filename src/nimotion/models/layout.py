@@ -0,0 +1,76 @@
+"""
+寄存器块的类型化视图。
+按 (字段, 相对起始地址的偏移, 数据类型) 把一段连续寄存器预编译为一个大端 Struct，
+一次 unpack 直接得到各字段的 16/32 位有/无符号值，不再逐寄存器拼接 32 位值。
+"""
+
+from __future__ import annotations
+
+import struct
+from functools import lru_cache
+from typing import Generic, Hashable, Iterable, TypeVar
+
+from .types import DataType
+
+K = TypeVar("K", bound=Hashable)
+
+# 数据类型 -> (Struct 格式码, 寄存器数)
+_CODES: dict[DataType, tuple[str, int]] = {
+    DataType.UINT16: ("H", 1),
+    DataType.INT16: ("h", 1),
+    DataType.UINT32: ("I", 2),  # 高 16 位在前，与大端 32 位整数字节序一致
+    DataType.INT32: ("i", 2),
+}
+
+
+@lru_cache(maxsize=None)
+def words_struct(count: int) -> struct.Struct:
+    """count 个大端 16 位寄存器的 Struct（按数量缓存）"""
+    return struct.Struct(f">{count}H")
+
+
+def pack_words(values: list[int]) -> bytes:
+    """16 位寄存器值列表 -> 大端字节（只有寄存器值、没有原始数据时使用）"""
+    return words_struct(len(values)).pack(*values)
+
+
+class RegisterLayout(Generic[K]):
+    """
+    一段连续寄存器的字段布局（不可变，可在多线程间共享）。
+    fields: (字段名, 偏移, 数据类型)；未列出的寄存器按填充跳过。
+    """
+
+    def __init__(self, fields: Iterable[tuple[K, int, DataType]], count: int | None = None) -> None:
+        fmt = [">"]
+        names: list[K] = []
+        pos = 0
+        for name, offset, data_type in sorted(fields, key=lambda f: f[1]):
+            code, width = _CODES[data_type]
+            if offset < pos:
+                raise ValueError(f"字段 {name!r} 与前一字段重叠 (偏移 {offset})")
+            if offset > pos:
+                fmt.append(f"{(offset - pos) * 2}x")
+            fmt.append(code)
+            names.append(name)
+            pos = offset + width
+        if count is not None:
+            if count < pos:
+                raise ValueError(f"寄存器数 {count} 不足以容纳字段（至少 {pos}）")
+            if count > pos:
+                fmt.append(f"{(count - pos) * 2}x")
+            pos = count
+        self.names: tuple[K, ...] = tuple(names)
+        self.count = pos  # 覆盖的寄存器数
+        self._struct = struct.Struct("".join(fmt))
+        # unpack(data, offset=0): 从寄存器原始数据（大端字节）按字段顺序取值。
+        # 直接绑定 Struct.unpack_from，热路径上不多一层 Python 调用
+        self.unpack = self._struct.unpack_from
+
+    @property
+    def size(self) -> int:
+        """覆盖的字节数"""
+        return self._struct.size
+
+    def decode(self, data: bytes, offset: int = 0) -> dict[K, int]:
+        """{字段名: 值}"""
+        return dict(zip(self.names, self._struct.unpack_from(data, offset)))
@@ -5,7 +5,12 @@
 
 from __future__ import annotations
 
-from .types import DataType, RegisterDef, RegisterType
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Iterable
+
+from .layout import RegisterLayout
+from .types import MAX_READ_COUNT, DataType, RegisterDef, RegisterType
 
 # 保持寄存器定义 (功能码 0x03 / 0x06 / 0x10)
 HOLDING_REGISTERS: list[RegisterDef] = [
@@ -396,3 +401,111 @@ def get_register(address: int, reg_type: RegisterType) -> RegisterDef | None:
     if reg_type == RegisterType.HOLDING:
         return _HOLDING_MAP.get(address)
     return _INPUT_MAP.get(address)
+
+
+# 写命令型寄存器：读取意义不大，部分固件读取返回 0 或异常，批量读取时避开
+COMMAND_ONLY_ADDRS: frozenset[int] = frozenset({
+    0x0008,  # 保存所有参数 (写 0x7376)
+    0x000B,  # 恢复默认参数 (写 0x6C64)
+    0x0047,  # 设置零点 (写 0x535A)
+    0x0048,  # 设置原点 (写 0x5348)
+    0x0051,  # 运动控制字
+    0x0073,  # 清空错误存储器 (写 0x6C64)
+    0x0074,  # 硬件自检 (写 0x7465)
+})
+
+
+def _skipped(reg: RegisterDef, skip: set[int]) -> bool:
+    # 命令型地址只针对保持寄存器，输入寄存器同号地址照常读取
+    return reg.reg_type == RegisterType.HOLDING and reg.address in skip
+
+
+def decode_value(reg: RegisterDef, values: list[int]) -> int:
+    """按数据类型解析寄存器原始值（32 位为 [高, 低]）"""
+    if reg.count == 1:
+        raw = values[0] & 0xFFFF
+        if reg.data_type == DataType.INT16 and raw >= 0x8000:
+            raw -= 0x10000
+        return raw
+    raw = ((values[0] & 0xFFFF) << 16) | (values[1] & 0xFFFF)
+    if reg.data_type == DataType.INT32 and raw >= 0x80000000:
+        raw -= 0x100000000
+    return raw
+
+
+@dataclass(frozen=True)
+class RegisterBlock:
+    """一次块读覆盖的地址区间及其中的寄存器定义"""
+
+    reg_type: RegisterType
+    address: int
+    count: int
+    registers: tuple[RegisterDef, ...]
+
+    def raw(self, values: list[int], reg: RegisterDef) -> list[int]:
+        """从块读结果中取出某个寄存器的原始值"""
+        offset = reg.address - self.address
+        return values[offset:offset + reg.count]
+
+    @cached_property
+    def layout(self) -> RegisterLayout[int]:
+        """块内各寄存器按地址偏移预编译的布局（字段名为寄存器地址）"""
+        return RegisterLayout(
+            ((reg.address, reg.address - self.address, reg.data_type) for reg in self.registers),
+            count=self.count,
+        )
+
+    def decode(self, values: list[int]) -> dict[int, int]:
+        """把块读结果（寄存器值列表）解析为 {地址: 值}"""
+        return {reg.address: decode_value(reg, self.raw(values, reg)) for reg in self.registers}
+
+    def decode_data(self, data: bytes) -> dict[int, int]:
+        """把块读响应的原始数据（ModbusResponse.data）解析为 {地址: 值}"""
+        return self.layout.decode(data)
+
+
+def plan_block_reads(
+    registers: Iterable[RegisterDef],
+    max_gap: int = 0,
+    max_count: int = MAX_READ_COUNT,
+    skip: Iterable[int] = COMMAND_ONLY_ADDRS,
+) -> list[RegisterBlock]:
+    """
+    把寄存器表规划为尽量少的块读。
+    块在未定义地址（读取会返回非法地址异常）与 skip 中的保持寄存器地址处断开；
+    max_gap > 0 时允许块内夹带至多该数量的未定义地址（须确认从站不拒绝）。
+    32 位寄存器不会被拆到两个块里。
+    """
+    skipped = set(skip)
+    ordered = sorted(
+        (r for r in registers if not _skipped(r, skipped)),
+        key=lambda r: (r.reg_type, r.address),
+    )
+    blocks: list[RegisterBlock] = []
+    current: list[RegisterDef] = []
+
+    def close() -> None:
+        if current:
+            start = current[0].address
+            end = current[-1].address + current[-1].count
+            blocks.append(RegisterBlock(current[0].reg_type, start, end - start, tuple(current)))
+            current.clear()
+
+    for reg in ordered:
+        if current:
+            prev = current[-1]
+            end = prev.address + prev.count
+            # 上一块与本寄存器之间夹着命令型地址时也必须断开
+            if (
+                reg.reg_type != prev.reg_type
+                or reg.address - end > max_gap
+                or reg.address + reg.count - current[0].address > max_count
+                or (
+                    reg.reg_type == RegisterType.HOLDING
+                    and any(a in skipped for a in range(end, reg.address))
+                )
+            ):
+                close()
+        current.append(reg)
+    close()
+    return blocks
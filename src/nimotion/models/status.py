@@ -0,0 +1,76 @@
+"""
+状态寄存器解析。
+输入寄存器 0x17~0x26 的批量读取结果 -> MotorStatus，
+Qt 服务层与 asyncio 客户端共用。
+"""
+
+from __future__ import annotations
+
+from .error_codes import get_error_text
+from .layout import RegisterLayout, pack_words
+from .types import DataType, MotorState, MotorStatus, RunMode
+
+STATUS_ADDR = 0x0017  # 批量状态读取起始地址
+STATUS_COUNT = 16  # 0x17 ~ 0x26
+
+# 偏移量基于起始地址 0x17；0x1A~0x1D 预留，0x25 错误寄存器不用
+STATUS_LAYOUT: RegisterLayout[str] = RegisterLayout(
+    [
+        ("voltage", 0, DataType.UINT16),  # 0x17
+        ("di", 1, DataType.UINT16),  # 0x18 = DI 32 位的高 16 位: DI 原始电平 (bit0=DI1)
+        ("mode", 7, DataType.UINT16),  # 0x1E 当前模式
+        ("word", 8, DataType.UINT16),  # 0x1F 状态字
+        ("direction", 9, DataType.UINT16),  # 0x20
+        ("position", 10, DataType.INT32),  # 0x21~0x22
+        ("speed", 12, DataType.UINT32),  # 0x23~0x24，值=实际x10
+        ("alarm", 15, DataType.UINT16),  # 0x26 当前报警码
+    ],
+    count=STATUS_COUNT,
+)
+
+
+def decode_state(word: int) -> MotorState:
+    """从状态字解码电机状态"""
+    if word & 0x0008:  # bit3 = 故障
+        return MotorState.FAULT
+    if word == 0x0050:
+        return MotorState.SWITCH_ON_DISABLED
+    if word == 0x0031:
+        return MotorState.READY_TO_SWITCH_ON
+    if word == 0x0033:
+        return MotorState.SWITCHED_ON
+    if word == 0x0037:
+        return MotorState.OPERATION_ENABLED
+    if word == 0x0017:
+        return MotorState.QUICK_STOP
+    return MotorState.UNKNOWN
+
+
+def parse_status(vals: list[int]) -> MotorStatus | None:
+    """从 0x17 起 16 个寄存器值解析电机状态，数量不足返回 None"""
+    if len(vals) < STATUS_COUNT:
+        return None
+    return parse_status_data(pack_words(vals[:STATUS_COUNT]))
+
+
+def parse_status_data(data: bytes) -> MotorStatus | None:
+    """
+    从 0x17 起 16 个寄存器的原始数据（响应中的大端字节）解析电机状态，
+    按 STATUS_LAYOUT 一次 unpack 取出全部字段。长度不足返回 None
+    """
+    if len(data) < STATUS_LAYOUT.size:
+        return None
+    voltage, di, mode, word, direction, position, speed, alarm = STATUS_LAYOUT.unpack(data)
+    status = MotorStatus()
+    status.voltage = voltage
+    status.current_mode = RunMode(mode) if mode in (1, 2, 3, 4) else None
+    status.status_word = word
+    status.state = decode_state(word)
+    status.is_running = bool(word & (1 << 12))
+    status.di_status = di
+    status.direction = direction
+    status.position = position
+    status.speed = speed // 10  # 值=实际x10
+    status.alarm_code = alarm
+    status.alarm_text = get_error_text(alarm) if alarm else ""
+    return status
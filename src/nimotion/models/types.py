@@ -15,6 +15,17 @@ class FunctionCode(IntEnum):
     WRITE_MULTIPLE = 0x10
 
 
+MAX_READ_COUNT = 125  # 0x03/0x04 单次最多读取的寄存器数
+
+
+class Priority(IntEnum):
+    """请求调度优先级（数值越小越先发送）"""
+
+    SAFETY = 0  # 急停/脱机：下一帧即发送，并丢弃同从站尚未发送的运动命令
+    MOTION = 1  # 运动命令/参数写入
+    BACKGROUND = 2  # 状态轮询/参数读取
+
+
 class MotorState(IntEnum):
     """电机状态机状态"""
 
@@ -82,6 +93,47 @@ class ModbusRequest:
     address: int
     count: int = 1  # 读取数量 / 写入数量
     values: list[int] = field(default_factory=list)  # 写入值
+    priority: Priority | None = None  # None = 按功能码: 写→MOTION, 读→BACKGROUND
+    timeout: float | None = None  # 响应超时（秒）；None = 按实测响应时间自适应
+    # 截止时刻（time.perf_counter）；排队超过该时刻仍未发送则丢弃。None = 不过期
+    deadline: float | None = None
+
+    @property
+    def lane(self) -> Priority:
+        """实际使用的调度通道"""
+        if self.priority is not None:
+            return self.priority
+        if self.function_code in (FunctionCode.READ_HOLDING, FunctionCode.READ_INPUT):
+            return Priority.BACKGROUND
+        return Priority.MOTION
+
+
+@dataclass
+class TransactionTrace:
+    """
+    单次事务的时间戳（time.perf_counter_ns）。
+    入队 → 开始发送 → 收到响应首字节 → 完成；无响应时 first_rx_ns 为 0。
+    """
+
+    enqueued_ns: int = 0
+    tx_start_ns: int = 0
+    first_rx_ns: int = 0
+    done_ns: int = 0
+
+    @property
+    def queue_ns(self) -> int:
+        """排队等待"""
+        return max(self.tx_start_ns - self.enqueued_ns, 0)
+
+    @property
+    def response_ns(self) -> int:
+        """开始发送 → 响应首字节（含请求帧发送时长）"""
+        return self.first_rx_ns - self.tx_start_ns if self.first_rx_ns else 0
+
+    @property
+    def total_ns(self) -> int:
+        """入队 → 完成"""
+        return self.done_ns - self.enqueued_ns
 
 
 @dataclass
@@ -97,6 +149,8 @@ class ModbusResponse:
     raw_tx: bytes = b""  # 原始发送帧
     raw_rx: bytes = b""  # 原始接收帧
     timestamp: float = 0.0
+    request_id: int = 0  # 对应 CommWorker.send_modbus 返回句柄的 request_id
+    trace: TransactionTrace | None = None  # 事务各阶段时间戳
 
 
 @dataclass
@@ -0,0 +1,131 @@
+"""
+多从站 RS-485 总线。
+一条总线只有一个 CommWorker，为每个从站地址提供独立的 MotorService，
+并集中调度状态轮询：每个节拍只轮询一个从站，按权重轮转，
+避免 N 个从站各自的轮询定时器同时挤占同一条线。
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Callable
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from ..communication.handle import RequestHandle
+from ..communication.worker import CommWorker
+from ..models.types import MotorStatus
+from .motor_service import MotorService
+
+
+class MotorBus(QObject):
+    """一条串口总线上的多个电机"""
+
+    status_updated = pyqtSignal(int, object)  # (从站地址, MotorStatus)
+
+    def __init__(self, worker: CommWorker, parent=None) -> None:
+        super().__init__(parent)
+        self._worker = worker
+        self._motors: dict[int, MotorService] = {}
+        self._weights: dict[int, int] = {}
+        self._credit: dict[int, int] = {}  # 平滑加权轮询的当前值
+        self._inflight: dict[int, RequestHandle] = {}  # 尚未完成的轮询
+        self._relays: dict[int, Callable[[MotorStatus], None]] = {}  # 从站 status_updated 的转发槽
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self._on_poll_timer)
+        self._worker.disconnected.connect(self._inflight.clear)
+
+    @property
+    def worker(self) -> CommWorker:
+        return self._worker
+
+    @property
+    def slaves(self) -> list[int]:
+        return list(self._motors)
+
+    def motor(self, slave_id: int, weight: int = 1) -> MotorService:
+        """取得（首次调用时创建）指定从站的电机服务并加入轮询"""
+        service = self._motors.get(slave_id)
+        if service is None:
+            service = MotorService(self._worker, slave_id)
+            relay = partial(self._relay_status, slave_id)
+            service.status_updated.connect(relay)
+            self._relays[slave_id] = relay
+            self._motors[slave_id] = service
+            self._credit[slave_id] = 0
+            self._weights[slave_id] = 1
+        self.set_weight(slave_id, weight)
+        return service
+
+    def remove(self, slave_id: int) -> None:
+        """移出总线，不再轮询，并释放该从站的电机服务"""
+        service = self._motors.pop(slave_id, None)
+        if service is None:
+            return
+        service.status_updated.disconnect(self._relays.pop(slave_id))
+        del self._weights[slave_id], self._credit[slave_id]
+        self._inflight.pop(slave_id, None)
+        service.close()
+        service.deleteLater()
+
+    def _relay_status(self, slave_id: int, status: MotorStatus) -> None:
+        self.status_updated.emit(slave_id, status)
+
+    def set_weight(self, slave_id: int, weight: int) -> None:
+        """
+        设置轮询权重（每轮被轮询的相对次数），0 表示不轮询。
+        例如运动中的从站设为 4、静止的设为 1。
+        """
+        if slave_id not in self._motors:
+            raise KeyError(f"从站 {slave_id} 不在总线上")
+        self._weights[slave_id] = max(weight, 0)
+
+    # -- 轮询 --
+
+    def start_polling(self, interval_ms: int) -> None:
+        """
+        启动轮询，每 interval_ms 轮询一个从站。
+        N 个等权从站各自的刷新周期约为 N × interval_ms。
+        """
+        self._poll_timer.start(interval_ms)
+
+    def stop_polling(self) -> None:
+        self._poll_timer.stop()
+
+    @property
+    def is_polling(self) -> bool:
+        return self._poll_timer.isActive()
+
+    def _on_poll_timer(self) -> None:
+        self.poll_next()
+
+    def _next_slave(self) -> int | None:
+        """
+        平滑加权轮询（smooth weighted round-robin）选出下一个从站。
+        上一次轮询尚未返回的从站本轮跳过，不在队列中堆积重复请求。
+        """
+        active = {sid: w for sid, w in self._weights.items() if w > 0}
+        ready = [sid for sid in active if not self._busy(sid)]
+        if not ready:
+            return None
+        total = sum(active.values())
+        for sid, weight in active.items():
+            # 等待响应的从站照常累积（上限一轮），返回后优先补上
+            self._credit[sid] = min(self._credit[sid] + weight, total)
+        chosen = max(ready, key=self._credit.__getitem__)
+        self._credit[chosen] -= total
+        return chosen
+
+    def _busy(self, slave_id: int) -> bool:
+        handle = self._inflight.get(slave_id)
+        return handle is not None and not handle.done()
+
+    def poll_next(self) -> int | None:
+        """轮询下一个从站的状态，返回其地址；均在等待响应时返回 None"""
+        if not self._worker.is_connected:
+            return None
+        slave_id = self._next_slave()
+        if slave_id is None:
+            return None
+        self._inflight[slave_id] = self._motors[slave_id].refresh_status()
+        return slave_id
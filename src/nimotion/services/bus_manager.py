@@ -0,0 +1,135 @@
+"""
+多串口总线管理。
+每个串口一个 CommWorker（各自的 I/O 线程），端口之间并行收发，
+吞吐量随端口数线性增长；请求按 (端口, 从站) 路由。
+"""
+
+from __future__ import annotations
+
+from functools import partial
+
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from ..communication.handle import RequestHandle, ResponseCallback
+from ..communication.serial_port import SerialConfig
+from ..communication.worker import CommWorker
+from ..models.types import ModbusRequest
+from .bus import MotorBus
+from .motor_service import MotorService
+
+
+class BusManager(QObject):
+    """多个串口总线的统一入口"""
+
+    port_connected = pyqtSignal(str)  # 端口名
+    port_disconnected = pyqtSignal(str)
+    port_error = pyqtSignal(str, str)  # (端口名, 错误信息)
+
+    def __init__(self, parent=None) -> None:
+        super().__init__(parent)
+        self._buses: dict[str, MotorBus] = {}
+
+    @property
+    def ports(self) -> list[str]:
+        return list(self._buses)
+
+    def open(self, config: SerialConfig) -> MotorBus:
+        """
+        打开一个串口（已打开则先关闭再按新配置打开），返回该端口的总线。
+        打开失败或通讯异常时移除该总线，再经 port_error 报告
+        """
+        if config.port in self._buses:
+            self.close(config.port)
+        worker = CommWorker(self)
+        port = config.port
+        bus = MotorBus(worker, self)
+        worker.connected.connect(lambda: self.port_connected.emit(port))
+        worker.disconnected.connect(lambda: self.port_disconnected.emit(port))
+        worker.connection_error.connect(partial(self._on_connection_error, port, bus))
+        self._buses[port] = bus
+        worker.connect_port(config)
+        return bus
+
+    def _on_connection_error(self, port: str, bus: MotorBus, message: str) -> None:
+        if self._buses.get(port) is bus:  # 同名端口已重新打开时不误删新总线
+            self.close(port)
+        self.port_error.emit(port, message)
+
+    def open_all(self, configs: list[SerialConfig]) -> None:
+        """批量打开串口；单个端口失败经 port_error 报告，不影响其余端口"""
+        for config in configs:
+            self.open(config)
+
+    def close(self, port: str) -> None:
+        """关闭并移除一个串口"""
+        bus = self._buses.pop(port, None)
+        if bus is None:
+            return
+        bus.stop_polling()
+        if bus.worker.is_connected:
+            bus.worker.disconnect_port()
+        bus.worker.deleteLater()
+        bus.deleteLater()
+
+    def close_all(self) -> None:
+        for port in list(self._buses):
+            self.close(port)
+
+    # -- 路由 --
+
+    def bus(self, port: str) -> MotorBus:
+        try:
+            return self._buses[port]
+        except KeyError:
+            raise KeyError(f"串口 {port} 未打开") from None
+
+    def motor(self, port: str, slave_id: int, weight: int = 1) -> MotorService:
+        """取得 (端口, 从站) 对应的电机服务"""
+        return self.bus(port).motor(slave_id, weight)
+
+    def send(
+        self, port: str, request: ModbusRequest, callback: ResponseCallback | None = None
+    ) -> RequestHandle:
+        """向指定端口提交请求，从站地址取自 request.slave_id"""
+        return self.bus(port).worker.send_modbus(request, callback)
+
+    def start_polling(self, interval_ms: int) -> None:
+        """所有端口同时开始轮询（各端口独立线程，互不排队）"""
+        for bus in self._buses.values():
+            bus.start_polling(interval_ms)
+
+    def stop_polling(self) -> None:
+        for bus in self._buses.values():
+            bus.stop_polling()
+
+    # -- 统计 --
+
+    def stats(self) -> dict[str, dict]:
+        """
+        各端口与汇总统计。
+        返回 {"ports": {端口: {...}}, "total": {...}}。
+        """
+        ports: dict[str, dict] = {}
+        total = {"connected": 0, "slaves": 0, "tx_bytes": 0, "rx_bytes": 0, "queued": 0}
+        for port, bus in self._buses.items():
+            worker = bus.worker
+            tx, rx = worker.byte_counts
+            queue = worker.queue_stats()
+            queued = sum(int(lane["depth"]) for lane in queue.values())
+            turnaround = worker.turnaround
+            ports[port] = {
+                "connected": worker.is_connected,
+                "baudrate": worker.config.baudrate,
+                "slaves": bus.slaves,
+                "tx_bytes": tx,
+                "rx_bytes": rx,
+                "queued": queued,
+                "turnaround_ms": None if turnaround is None else turnaround * 1000,
+                "queue": queue,
+            }
+            total["connected"] += int(worker.is_connected)
+            total["slaves"] += len(bus.slaves)
+            total["tx_bytes"] += tx
+            total["rx_bytes"] += rx
+            total["queued"] += queued
+        return {"ports": ports, "total": total}
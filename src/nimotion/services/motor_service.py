@@ -5,12 +5,26 @@
 
 from __future__ import annotations
 
+import time
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Iterator
+
 from PyQt5.QtCore import QObject, QTimer, pyqtSignal
 
+from ..communication.handle import GroupResult, RequestGroup, RequestHandle
 from ..communication.modbus_rtu import ModbusRTU
 from ..communication.worker import CommWorker
-from ..models.error_codes import get_error_text, get_exception_text
+from ..models.error_codes import COMM_ERRORS, get_exception_text
 from ..models.registers import get_register
+from ..models.status import (
+    STATUS_ADDR,
+    STATUS_COUNT,
+    STATUS_LAYOUT,
+    decode_state,
+    parse_status,
+    parse_status_data,
+)
 from ..models.types import (
     DataType,
     FunctionCode,
@@ -19,6 +33,7 @@ from ..models.types import (
     ModbusResponse,
     MotorState,
     MotorStatus,
+    Priority,
     RegisterType,
     RunMode,
 )
@@ -34,6 +49,23 @@ class MotorService(QObject):
     homing_config_status = pyqtSignal(str)  # 回零配置状态信息
     homing_done = pyqtSignal()  # 回零完成且 DI1 已恢复
     init_config_done = pyqtSignal(str)  # 首次连接参数校准完成
+    fused_probe_done = pyqtSignal(bool)  # 首次合并写的结果: 驱动器是否接受
+
+    # 运动控制字 0x0051、方向 0x0052、目标位置 0x0053/0x0054 地址连续，
+    # 驱动器支持时可用一帧 0x10 写入
+    _FUSED_ADDR = 0x0051
+    _FUSED_COUNT = 4
+    # 处于"运行使能"的控制字(位置模式绝对/相对, 含或不含触发位)
+    _ENABLED_CONTROLS = frozenset({0x000F, 0x001F, 0x004F, 0x005F})
+
+    # 写 EEPROM 的命令（保存参数/恢复默认）应答慢，不受自适应超时限制
+    EEPROM_TIMEOUT = 2.0
+
+    # 状态轮询排队超过该时长（秒）仍未发出即丢弃，总线慢时不积压过期轮询
+    STATUS_MAX_AGE = 1.0
+
+    # 回零恢复（DI1/加减速）连续失败多少次后停止主动轮询重试
+    HOMING_RESTORE_RETRIES = 3
 
     # 首次连接期望参数: (地址, 期望值, 名称, 是否32位)
     # 寄存器单位 Step/s (全步/秒), 实际 pulses/s = Step/s × 细分数
@@ -52,7 +84,15 @@ class MotorService(QObject):
         self._worker = worker
         self._slave_id = slave_id
         self._last_state = MotorState.UNKNOWN
-        self._worker.response_received.connect(self._on_response)
+        self._last_status: MotorStatus | None = None
+
+        # 合并写是否被接受，按 (串口, 从站) 记录；首次位置运动即为试探，重连不再试探
+        self._fused_cache: dict[tuple[str, int], bool] = {}
+        self._last_control: int | None = None  # 本服务最近写入的控制字
+        self._mode_written: RunMode | None = None  # 本服务最近写入的运行模式
+        self._direction_written: int | None = None  # 驱动器 0x0052 运行方向的已知值
+        # 正在组装的事务组（见 _transaction），期间 _send 的请求均加入该组
+        self._group: RequestGroup | None = None
 
         # 回零配置状态机
         self._homing_config: HomingConfig | None = None
@@ -75,6 +115,9 @@ class MotorService(QObject):
         # 回零使用的加减速为全局共用寄存器(0x005F/0x0061)，回零前改小、完成后恢复原值
         self._homing_accel_restore: int | None = None
         self._homing_decel_restore: int | None = None
+        # 回零恢复事务组在途（防止后续状态帧重复下发）/ 连续失败次数
+        self._homing_restoring = False
+        self._homing_restore_failures = 0
         self._homing_poll_timer = QTimer()
         self._homing_poll_timer.setInterval(500)
         self._homing_poll_timer.timeout.connect(self._poll_homing_done)
@@ -94,22 +137,44 @@ class MotorService(QObject):
     @slave_id.setter
     def slave_id(self, value: int) -> None:
         self._slave_id = value
+        # 换从站后缓存的状态失效（合并写结果按从站记录，无需清除）
+        self._last_state = MotorState.UNKNOWN
+        self._last_status = None
+        self._last_control = None
+        self._mode_written = None
+
+    def close(self) -> None:
+        """停止内部定时器（回零/参数校准），服务不再使用前调用"""
+        for timer in (
+            self._homing_timeout, self._homing_grace_timer,
+            self._homing_poll_timer, self._init_timeout,
+        ):
+            timer.stop()
+
+    @property
+    def fused_supported(self) -> bool | None:
+        """驱动器是否接受 0x0051~0x0054 合并写（None = 尚未试过）"""
+        return self._fused_cache.get(self._drive_key())
+
+    def _drive_key(self) -> tuple[str, int]:
+        return self._worker.config.port, self._slave_id
 
     # -- 状态查询 --
 
-    def refresh_status(self) -> None:
+    def refresh_status(self) -> RequestHandle:
         """
         读取电机实时状态。
         一次批量读取 0x17~0x26 范围的输入寄存器（16 个），
-        减少通讯次数。
+        减少通讯次数。返回请求句柄，可据此判断上一次轮询是否已完成。
         """
         req = ModbusRequest(
             slave_id=self._slave_id,
             function_code=FunctionCode.READ_INPUT,
-            address=0x0017,
-            count=16,  # 0x17 ~ 0x26
+            address=STATUS_ADDR,
+            count=STATUS_COUNT,  # 0x17 ~ 0x26
+            deadline=time.perf_counter() + self.STATUS_MAX_AGE,
         )
-        self._worker.send_modbus(req)
+        return self._send(req)
 
     # -- 状态机控制 --
 
@@ -130,12 +195,12 @@ class MotorService(QObject):
         self._write_control_word(0x0007)
 
     def quick_stop(self) -> None:
-        """紧急停机"""
-        self._write_control_word(0x0002)
+        """紧急停机（安全通道：插队发送并取消待发的运动命令）"""
+        self._write_control_word(0x0002, Priority.SAFETY)
 
     def disable(self) -> None:
-        """回到无故障状态"""
-        self._write_control_word(0x0000)
+        """回到无故障状态（安全通道）"""
+        self._write_control_word(0x0000, Priority.SAFETY)
 
     def clear_fault(self) -> None:
         """清除故障"""
@@ -151,43 +216,59 @@ class MotorService(QObject):
         正负设置方向寄存器（正=正转/位置增大），幅值取绝对值。
         """
         direction = 1 if position >= 0 else 0
-        self._write_control_word(0x0000)  # 先停机
-        self._write_single(0x0039, int(RunMode.POSITION))  # 设置位置模式
-        self._write_single(0x0052, direction)  # 运行方向: 正数=正转(位置增大)
-        self._write_32bit(0x0053, abs(position))  # 步长幅值(必须为正)
-        self._write_control_word(0x0006)  # 启动
-        self._write_control_word(0x0007)  # 使能
-        self._write_control_word(0x004F)  # 相对模式 + 运行
-        self._write_control_word(0x005F)  # 触发新位置
+        supported = self._fused_choice()
+        retry = partial(self.move_relative, position) if supported is None else None
+        with self._transaction("相对运动", retry=retry):
+            if supported is not False:
+                self._move_fused(direction, abs(position), relative=True)
+                return
+            self._write_control_word(0x0000)  # 先停机
+            self._write_single(0x0039, int(RunMode.POSITION))  # 设置位置模式
+            self._write_single(0x0052, direction)  # 运行方向: 正数=正转(位置增大)
+            self._write_32bit(0x0053, abs(position))  # 步长幅值(必须为正)
+            self._write_control_word(0x0006)  # 启动
+            self._write_control_word(0x0007)  # 使能
+            self._write_control_word(0x004F)  # 相对模式 + 运行
+            self._write_control_word(0x005F)  # 触发新位置
 
     def move_absolute(self, position: int) -> None:
         """绝对位置运动"""
-        self._write_control_word(0x0000)  # 先停机
-        self._write_single(0x0039, int(RunMode.POSITION))  # 设置位置模式
-        self._write_32bit(0x0053, position, signed=True)
-        self._write_control_word(0x0006)  # 启动
-        self._write_control_word(0x0007)  # 使能
-        self._write_control_word(0x000F)  # 绝对模式 + 运行
-        self._write_control_word(0x001F)  # 触发新位置
+        # 绝对运动不改方向寄存器：合并帧中写回驱动器已有的值，未知则不写 0x0052。
+        # 方向未知时不发合并帧，也就无从试探
+        supported = self._fused_choice(can_probe=self._direction_written is not None)
+        retry = partial(self.move_absolute, position) if supported is None else None
+        with self._transaction("绝对运动", retry=retry):
+            if supported is not False:
+                self._move_fused(self._direction_written, position, relative=False)
+                return
+            self._write_control_word(0x0000)  # 先停机
+            self._write_single(0x0039, int(RunMode.POSITION))  # 设置位置模式
+            self._write_32bit(0x0053, position, signed=True)
+            self._write_control_word(0x0006)  # 启动
+            self._write_control_word(0x0007)  # 使能
+            self._write_control_word(0x000F)  # 绝对模式 + 运行
+            self._write_control_word(0x001F)  # 触发新位置
 
     def set_speed(self, speed: int, direction: int) -> None:
         """速度模式运行"""
-        self._write_control_word(0x0000)  # 先停机
-        self._write_single(0x0039, int(RunMode.SPEED))  # 设置速度模式
-        self._write_single(0x0052, direction)
-        self._write_32bit(0x0055, speed)
-        self._write_control_word(0x0006)  # 启动
-        self._write_control_word(0x0007)  # 使能
-        self._write_control_word(0x000F)  # 运行
+        with self._transaction("速度运行"):
+            self._write_control_word(0x0000)  # 先停机
+            self._write_single(0x0039, int(RunMode.SPEED))  # 设置速度模式
+            self._write_single(0x0052, direction)
+            self._write_32bit(0x0055, speed)
+            self._write_control_word(0x0006)  # 启动
+            self._write_control_word(0x0007)  # 使能
+            self._write_control_word(0x000F)  # 运行
 
     def start_homing(self) -> None:
         """开始原点回归（不检查配置，直接启动）"""
-        self._write_control_word(0x0006)  # 启动
-        self._write_single(0x0039, int(RunMode.HOMING))  # 设置原点回归模式
-        self._write_control_word(0x0006)  # 启动
-        self._write_control_word(0x0007)  # 使能
-        self._write_control_word(0x000F)  # 运行
-        self._write_control_word(0x001F)  # 触发
+        with self._transaction("原点回归"):
+            self._write_control_word(0x0006)  # 启动
+            self._write_single(0x0039, int(RunMode.HOMING))  # 设置原点回归模式
+            self._write_control_word(0x0006)  # 启动
+            self._write_control_word(0x0007)  # 使能
+            self._write_control_word(0x000F)  # 运行
+            self._write_control_word(0x001F)  # 触发
         # 如果需要回零后恢复 DI1，启动轮询
         if self._homing_di_restore is not None:
             self._homing_poll_timer.start()
@@ -214,6 +295,103 @@ class MotorService(QObject):
         self.read_param(0x0061, 2)   # 减速度 (2 reg, UINT32) - 回零前改小，完成后恢复
         self.read_param(0x0072, 1)   # 零点回归 (1 reg)
 
+    # -- 合并写命令 --
+
+    def _fused_choice(self, can_probe: bool = True) -> bool | None:
+        """
+        本次位置运动是否走合并写；None 表示以本次运动试探
+        （须为最外层事务且会发出合并帧，否则尚未试过时按不支持处理）
+        """
+        supported = self.fused_supported
+        if supported is None and (self._group is not None or not can_probe):
+            return False
+        return supported
+
+    def _fused_rejected(self, result: GroupResult) -> bool:
+        """事务组是否因驱动器以异常应答拒绝 0x0051~0x0054 合并写而中止"""
+        req, failed = result.failed_request, result.failed
+        return (
+            req is not None
+            and failed is not None
+            and failed.error_code > 0
+            and req.function_code == FunctionCode.WRITE_MULTIPLE
+            and req.address == self._FUSED_ADDR
+            and req.count == self._FUSED_COUNT
+        )
+
+    def _on_fused_trial(self, result: GroupResult, retry: Callable[[], None]) -> bool:
+        """
+        试探合并写的运动组结束。被拒: 记为不支持并以逐帧序列重发，返回 True（不提示中止）；
+        合并帧已被接受（组内唯一的 0x10 帧成功应答）: 记为支持。
+        """
+        if self._fused_rejected(result):
+            self._set_fused_supported(False)
+            retry()
+            return True
+        if any(
+            r.function_code == FunctionCode.WRITE_MULTIPLE and not r.is_error
+            for r in result.responses
+        ):
+            self._set_fused_supported(True)
+        return False
+
+    def _set_fused_supported(self, supported: bool) -> None:
+        self._fused_cache[self._drive_key()] = supported
+        self.fused_probe_done.emit(supported)
+
+    def _move_fused(
+        self, direction: int | None, target: int, relative: bool,
+    ) -> None:
+        """
+        位置运动的合并写路径。
+        - 已在位置模式运行使能且空闲: [运行控制字, 方向, 目标] 一帧 + 触发 = 2 帧
+        - 位置模式、状态机正常: [启动, 方向, 目标] 一帧 + 使能 + 运行 + 触发 = 4 帧
+          (0x0006 同时起到停机作用，从运行使能退回就绪)
+        - 其他情况(急停/故障/模式未知等): 逐帧完整序列
+        direction 为 None（驱动器方向未知）时不写 0x0052，控制字与目标分两帧。
+        """
+        run_word = 0x004F if relative else 0x000F
+        status = self._last_status
+        in_position = (
+            self._mode_written == RunMode.POSITION
+            and status is not None
+            and status.current_mode == RunMode.POSITION
+        )
+        if (
+            in_position
+            and status is not None
+            and status.state == MotorState.OPERATION_ENABLED
+            and not status.is_running
+            and self._last_control in self._ENABLED_CONTROLS
+        ):
+            self._write_fused(run_word, direction, target, signed=not relative)
+            self._write_control_word(run_word | 0x0010)  # 触发新位置
+            return
+
+        if self._last_control in (None, 0x0002) or self._last_state in (
+            MotorState.QUICK_STOP,
+            MotorState.FAULT,
+            MotorState.UNKNOWN,
+        ):
+            self._write_control_word(0x0000)  # 先停机，回到无故障
+        if not in_position:
+            self._write_single(0x0039, int(RunMode.POSITION))  # 设置位置模式
+        self._write_fused(0x0006, direction, target, signed=not relative)  # 启动+方向+目标
+        self._write_control_word(0x0007)  # 使能
+        self._write_control_word(run_word)  # 运行
+        self._write_control_word(run_word | 0x0010)  # 触发新位置
+
+    def _write_fused(
+        self, control: int, direction: int | None, target: int, signed: bool,
+    ) -> None:
+        """[控制字, 方向, 目标] 一帧写入；方向未知时只写控制字与目标"""
+        if direction is None:
+            self._write_control_word(control)
+            self._write_32bit(0x0053, target, signed)
+            return
+        high, low = ModbusRTU.split_32bit(target)
+        self._write_block(self._FUSED_ADDR, [control, direction, high, low])
+
     # -- 首次连接参数校准 --
 
     def check_init_params(self) -> None:
@@ -267,7 +445,7 @@ class MotorService(QObject):
             address=address,
             count=count,
         )
-        self._worker.send_modbus(req)
+        self._send(req)
 
     def write_param(self, address: int, value: int) -> None:
         """写入单个保持寄存器"""
@@ -281,11 +459,11 @@ class MotorService(QObject):
 
     def save_params(self) -> None:
         """保存所有参数到 EEPROM"""
-        self._write_single(0x0008, 0x7376)
+        self._write_single(0x0008, 0x7376, timeout=self.EEPROM_TIMEOUT)
 
     def restore_defaults(self) -> None:
         """恢复出厂默认参数"""
-        self._write_single(0x000B, 0x6C64)
+        self._write_single(0x000B, 0x6C64, timeout=self.EEPROM_TIMEOUT)
 
     def set_run_mode(self, mode: RunMode) -> None:
         """设置运行模式"""
@@ -320,44 +498,150 @@ class MotorService(QObject):
             self._write_control_word(0x0006)
             self._write_control_word(0x0007)
 
-    def _write_control_word(self, value: int) -> None:
-        self._write_single(0x0051, value)
-
-    def _write_single(self, address: int, value: int) -> None:
+    def _write_control_word(self, value: int, priority: Priority | None = None) -> None:
+        self._write_single(0x0051, value, priority)
+
+    def _track_write(self, address: int, values: list[int]) -> None:
+        """记录本服务写入的控制字/运行模式，供合并写路径判断状态"""
+        for i, value in enumerate(values):
+            if address + i == 0x0051:
+                self._last_control = value
+            elif address + i == 0x0052:
+                self._direction_written = value
+            elif address + i == 0x0039:
+                self._mode_written = RunMode(value) if value in (1, 2, 3, 4) else None
+
+    def _write_single(
+        self,
+        address: int,
+        value: int,
+        priority: Priority | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        self._track_write(address, [value])
         req = ModbusRequest(
             slave_id=self._slave_id,
             function_code=FunctionCode.WRITE_SINGLE,
             address=address,
             values=[value & 0xFFFF],
+            priority=priority,
+            timeout=timeout,
         )
-        self._worker.send_modbus(req)
+        self._send(req)
 
     def _write_32bit(
         self, address: int, value: int, signed: bool = False
     ) -> None:
         high, low = ModbusRTU.split_32bit(value)
+        self._write_block(address, [high, low])
+
+    def _write_block(self, address: int, values: list[int]) -> None:
+        """0x10 写连续多个保持寄存器"""
+        self._track_write(address, values)
         req = ModbusRequest(
             slave_id=self._slave_id,
             function_code=FunctionCode.WRITE_MULTIPLE,
             address=address,
-            count=2,
-            values=[high, low],
+            count=len(values),
+            values=[v & 0xFFFF for v in values],
+        )
+        self._send(req)
+
+    def _send(self, req: ModbusRequest) -> RequestHandle:
+        """提交请求，响应经回调连同原请求一起送回本服务"""
+        group = self._group
+        if group is None:
+            return self._worker.send_modbus(req, callback=partial(self._on_response, request=req))
+        return self._worker.send_modbus(
+            req, callback=partial(self._on_response, request=req, grouped=True), group=group,
+        )
+
+    @contextmanager
+    def _transaction(
+        self,
+        name: str,
+        on_done: Callable[[GroupResult], None] | None = None,
+        retry: Callable[[], None] | None = None,
+    ) -> Iterator[None]:
+        """
+        其间提交的请求编为一个事务组: 按顺序发送，任一帧失败即放弃其余帧，
+        整组完成后只报告一次 operation_done（附总耗时）。可嵌套，内层并入外层组。
+        on_done: 整组结束后（提示之后）以 GroupResult 回调，须由最外层事务提供
+        retry: 本组在试探合并写；被驱动器拒绝时调用它以逐帧序列重发，须由最外层事务提供
+        """
+        if self._group is not None:
+            if on_done is not None or retry is not None:
+                raise RuntimeError(f"{name}: 嵌套事务不能单独接收完成回调")
+            yield
+            return
+        self._group = self._worker.begin_group(
+            name, partial(self._on_group_done, name=name, on_done=on_done, retry=retry),
+        )
+        try:
+            yield
+        finally:
+            group, self._group = self._group, None
+            self._worker.end_group(group)
+
+    def _on_group_done(
+        self,
+        result: GroupResult,
+        name: str,
+        on_done: Callable[[GroupResult], None] | None = None,
+        retry: Callable[[], None] | None = None,
+    ) -> None:
+        """事务组结束: 成功或失败都只提示一次，再交给 on_done"""
+        if retry is not None and self._on_fused_trial(result, retry):
+            return
+        self._report_group(result, name)
+        if on_done is not None:
+            on_done(result)
+
+    def _report_group(self, result: GroupResult, name: str) -> None:
+        if not result.responses:
+            return
+        total = len(result.responses)
+        elapsed = result.latency_ns / 1e6
+        if result.ok:
+            self.operation_done.emit(True, f"{name}完成（{total} 帧，{elapsed:.0f} ms）")
+            return
+        failed = result.failed
+        assert failed is not None
+        if failed.error_code == -4:
+            return  # 被安全命令取消，无需提示
+        self.operation_done.emit(
+            False,
+            f"{name}中止: {self._format_error(failed, result.failed_request)}"
+            f"（已发送 {result.sent}/{total} 帧）",
         )
-        self._worker.send_modbus(req)
 
-    def _on_response(self, resp: ModbusResponse) -> None:
-        """处理通讯线程返回的响应"""
+    def _on_response(
+        self,
+        resp: ModbusResponse,
+        request: ModbusRequest | None = None,
+        grouped: bool = False,
+    ) -> None:
+        """
+        处理通讯线程返回的响应（request 为发起该响应的请求）。
+        grouped: 属于事务组，成败由 _on_group_done 统一提示
+        """
+        if request is None:
+            request = self._request_from_frame(resp)
         if resp.is_error:
-            self.operation_done.emit(False, self._format_error(resp))
+            if grouped or resp.error_code in (-4, -6):
+                return  # 被安全命令取消 / 过期轮询，未发送，无需提示
+            if resp.error_code in (-5, -7) and resp.function_code == FunctionCode.READ_INPUT:
+                return  # 状态轮询被更新的轮询挤出队列 / 从站掉线（另有状态栏提示）
+            self.operation_done.emit(False, self._format_error(resp, request))
             return
 
         # 判断是状态查询响应还是参数响应
         if resp.function_code == FunctionCode.READ_INPUT:
             self._parse_status(resp)
         elif resp.function_code == FunctionCode.READ_HOLDING:
-            if not resp.raw_tx or len(resp.raw_tx) < 4:
+            if request is None:
                 return
-            start_addr = (resp.raw_tx[2] << 8) | resp.raw_tx[3]
+            start_addr = request.address
             values = resp.values
             # 检查是否为 32 位寄存器读取（2 个寄存器）
             reg = get_register(start_addr, RegisterType.HOLDING)
@@ -392,59 +676,33 @@ class MotorService(QObject):
                     for i, val in enumerate(values):
                         self._init_read_values[start_addr + i] = val
                 self._check_init_reads_complete()
-        else:
+        elif not grouped:
             self.operation_done.emit(True, "操作成功")
 
+    @staticmethod
+    def _request_from_frame(resp: ModbusResponse) -> ModbusRequest | None:
+        """无请求对象时（如直接注入的响应）从原始发送帧还原功能码与地址"""
+        if len(resp.raw_tx) < 4 or resp.raw_tx[1] not in FunctionCode._value2member_map_:
+            return None
+        return ModbusRequest(
+            slave_id=resp.raw_tx[0],
+            function_code=FunctionCode(resp.raw_tx[1]),
+            address=(resp.raw_tx[2] << 8) | resp.raw_tx[3],
+        )
+
     def _parse_status(self, resp: ModbusResponse) -> None:
-        """从批量读取结果中解析电机状态"""
-        vals = resp.values
-        if len(vals) < 16:
+        """从批量读取结果中解析电机状态（优先直接解包响应原始数据）"""
+        if len(resp.data) >= STATUS_LAYOUT.size:
+            status = parse_status_data(resp.data)
+        else:
+            status = parse_status(resp.values)
+        if status is None:
             return
-
-        # 偏移量基于起始地址 0x17
-        status = MotorStatus()
-        status.voltage = vals[0]  # 0x17
-        # vals[1], vals[2] = 0x18~0x19 (DI, 32位)
-        # vals[3]~vals[6] = 0x1A~0x1D (预留)
-        # vals[7] = 0x1E (当前模式)
-        status.current_mode = RunMode(vals[7]) if vals[7] in (1, 2, 3, 4) else None
-        # vals[8] = 0x1F (状态字)
-        status.status_word = vals[8]
-        status.state = self._decode_state(vals[8])
-        status.is_running = bool(vals[8] & (1 << 12))
-        # vals[1] = 0x18 高16位 = DI 原始电平 (bit0=DI1)
-        status.di_status = vals[1]
-        # vals[9] = 0x20 (方向)
-        status.direction = vals[9]
-        # vals[10], vals[11] = 0x21~0x22 (位置, 32位)
-        status.position = ModbusRTU.combine_32bit(vals[10], vals[11], signed=True)
-        # vals[12], vals[13] = 0x23~0x24 (速度, 32位, 值=实际x10)
-        raw_speed = ModbusRTU.combine_32bit(vals[12], vals[13])
-        status.speed = raw_speed // 10
-        # vals[14] = 0x25 (错误寄存器)
-        # vals[15] = 0x26 (当前报警码)
-        status.alarm_code = vals[15]
-        status.alarm_text = get_error_text(vals[15]) if vals[15] else ""
-
         self._last_state = status.state
+        self._last_status = status
         self.status_updated.emit(status)
 
-    @staticmethod
-    def _decode_state(word: int) -> MotorState:
-        """从状态字解码电机状态"""
-        if word & 0x0008:  # bit3 = 故障
-            return MotorState.FAULT
-        if word == 0x0050:
-            return MotorState.SWITCH_ON_DISABLED
-        if word == 0x0031:
-            return MotorState.READY_TO_SWITCH_ON
-        if word == 0x0033:
-            return MotorState.SWITCHED_ON
-        if word == 0x0037:
-            return MotorState.OPERATION_ENABLED
-        if word == 0x0017:
-            return MotorState.QUICK_STOP
-        return MotorState.UNKNOWN
+    _decode_state = staticmethod(decode_state)
 
     def _check_homing_reads_complete(self) -> None:
         """检查回零配置参数是否全部读取完毕"""
@@ -456,68 +714,72 @@ class MotorService(QObject):
         config = self._homing_config
         assert config is not None
 
-        # 先停机，确保参数可写入
-        self._write_control_word(0x0000)
-
-        # 比对设备值与期望值
-        # 0x002C: DI功能，DI1占bit[3:0]，回零时强制负限位
-        dev_di_func = self._homing_read_values[0x002C]
-        dev_di1 = dev_di_func & 0x0F
-        dev_method = self._homing_read_values[0x006B]
-        # 32位寄存器已在 _on_response 中合并存储
-        dev_offset = self._homing_read_values[0x0069]
-        dev_search_speed = self._homing_read_values[0x006C]
-        dev_zero_speed = self._homing_read_values[0x006E]
-        dev_accel = self._homing_read_values[0x005F]
-        dev_decel = self._homing_read_values[0x0061]
-        dev_zero_ret = self._homing_read_values[0x0072]
-
-        diffs: list[str] = []
-        # 回零时强制 DI1=neg_limit(1)，method 17 依赖负限位信号
-        if dev_di1 != 1:
-            new_di_func = (dev_di_func & ~0x0F) | 1
-            self._write_32bit(0x002C, new_di_func)
-            diffs.append(f"DI1功能 {dev_di1}->1(负限位)")
-        if dev_method != config.method:
-            self._write_single(0x006B, config.method)
-            diffs.append(f"回归方式 {dev_method}->{config.method}")
-        if dev_offset != config.origin_offset:
-            self._write_32bit(0x0069, config.origin_offset, signed=True)
-            diffs.append(f"原点偏移 {dev_offset}->{config.origin_offset}")
-        if dev_search_speed != config.search_speed:
-            self._write_32bit(0x006C, config.search_speed)
-            diffs.append(f"寻找开关速度 {dev_search_speed}->{config.search_speed}")
-        if dev_zero_speed != config.zero_speed:
-            self._write_32bit(0x006E, config.zero_speed)
-            diffs.append(f"寻找零位速度 {dev_zero_speed}->{config.zero_speed}")
-        # 回零加减速改小以提升重复定位精度；记录原值，回零完成后恢复(避免影响转盘定位)
-        if dev_accel != config.accel:
-            self._write_32bit(0x005F, config.accel)
-            diffs.append(f"回零加速度 {dev_accel}->{config.accel}")
-        if dev_decel != config.decel:
-            self._write_32bit(0x0061, config.decel)
-            diffs.append(f"回零减速度 {dev_decel}->{config.decel}")
-        self._homing_accel_restore = dev_accel
-        self._homing_decel_restore = dev_decel
-        if dev_zero_ret != config.zero_return:
-            self._write_single(0x0072, config.zero_return)
-            diffs.append(f"零点回归 {dev_zero_ret}->{config.zero_return}")
+        with self._transaction("回零配置"):
+            # 先停机，确保参数可写入
+            self._write_control_word(0x0000)
 
-        if diffs:
-            # 不写 EEPROM：回零参数每次回零都先读后写重新应用(立即生效)，无需持久化；
-            # 且 DI1/加减速是临时值(回零后在 _check_homing_running 恢复原值)，若存 EEPROM
-            # 会把加减速永久写成回零小值(断电后转盘定位变慢)，并且每次回零都磨损 EEPROM。
-            msg = "已更新: " + ", ".join(diffs)
-            self.homing_config_status.emit(msg)
-        else:
-            self.homing_config_status.emit("参数已一致，无需写入")
+            # 比对设备值与期望值
+            # 0x002C: DI功能，DI1占bit[3:0]，回零时强制负限位
+            dev_di_func = self._homing_read_values[0x002C]
+            dev_di1 = dev_di_func & 0x0F
+            dev_method = self._homing_read_values[0x006B]
+            # 32位寄存器已在 _on_response 中合并存储
+            dev_offset = self._homing_read_values[0x0069]
+            dev_search_speed = self._homing_read_values[0x006C]
+            dev_zero_speed = self._homing_read_values[0x006E]
+            dev_accel = self._homing_read_values[0x005F]
+            dev_decel = self._homing_read_values[0x0061]
+            dev_zero_ret = self._homing_read_values[0x0072]
+
+            diffs: list[str] = []
+            # 回零时强制 DI1=neg_limit(1)，method 17 依赖负限位信号
+            if dev_di1 != 1:
+                new_di_func = (dev_di_func & ~0x0F) | 1
+                self._write_32bit(0x002C, new_di_func)
+                diffs.append(f"DI1功能 {dev_di1}->1(负限位)")
+            if dev_method != config.method:
+                self._write_single(0x006B, config.method)
+                diffs.append(f"回归方式 {dev_method}->{config.method}")
+            if dev_offset != config.origin_offset:
+                self._write_32bit(0x0069, config.origin_offset, signed=True)
+                diffs.append(f"原点偏移 {dev_offset}->{config.origin_offset}")
+            if dev_search_speed != config.search_speed:
+                self._write_32bit(0x006C, config.search_speed)
+                diffs.append(f"寻找开关速度 {dev_search_speed}->{config.search_speed}")
+            if dev_zero_speed != config.zero_speed:
+                self._write_32bit(0x006E, config.zero_speed)
+                diffs.append(f"寻找零位速度 {dev_zero_speed}->{config.zero_speed}")
+            # 回零加减速改小以提升重复定位精度；记录原值，回零完成后恢复(避免影响转盘定位)
+            if dev_accel != config.accel:
+                self._write_32bit(0x005F, config.accel)
+                diffs.append(f"回零加速度 {dev_accel}->{config.accel}")
+            if dev_decel != config.decel:
+                self._write_32bit(0x0061, config.decel)
+                diffs.append(f"回零减速度 {dev_decel}->{config.decel}")
+            # 上次回零的恢复未成功时设备上仍是回零值，保留最初记录的原值
+            if self._homing_accel_restore is None:
+                self._homing_accel_restore = dev_accel
+                self._homing_decel_restore = dev_decel
+            if dev_zero_ret != config.zero_return:
+                self._write_single(0x0072, config.zero_return)
+                diffs.append(f"零点回归 {dev_zero_ret}->{config.zero_return}")
+
+            if diffs:
+                # 不写 EEPROM：回零参数每次回零都先读后写重新应用(立即生效)，无需持久化；
+                # 且 DI1/加减速是临时值(回零后在 _check_homing_running 恢复原值)，若存 EEPROM
+                # 会把加减速永久写成回零小值(断电后转盘定位变慢)，并且每次回零都磨损 EEPROM。
+                msg = "已更新: " + ", ".join(diffs)
+                self.homing_config_status.emit(msg)
+            else:
+                self.homing_config_status.emit("参数已一致，无需写入")
 
-        # 启动回零；完成后通过 status_updated 监测状态字恢复 DI1
-        self._homing_di_restore = dev_di_func  # 记录原始 DI 配置
-        self._homing_seen_running = False  # 等回零真正跑起来再判定完成
-        self._homing_grace_over = False    # grace 兜底(已在 home 点再回零)
-        self._homing_grace_timer.start()
-        self.start_homing()
+            # 启动回零；完成后通过 status_updated 监测状态字恢复 DI1
+            if self._homing_di_restore is None:
+                self._homing_di_restore = dev_di_func  # 记录原始 DI 配置
+            self._homing_seen_running = False  # 等回零真正跑起来再判定完成
+            self._homing_grace_over = False    # grace 兜底(已在 home 点再回零)
+            self._homing_grace_timer.start()
+            self.start_homing()
 
     def _poll_homing_done(self) -> None:
         """轮询回零是否完成，完成后恢复 DI1 为无动作(0)"""
@@ -539,23 +801,33 @@ class MotorService(QObject):
         if status.is_running:
             self._homing_seen_running = True
             return
+        if self._homing_restoring:
+            return
         if (self._homing_seen_running or self._homing_grace_over) and status.speed == 0:
             self._homing_grace_timer.stop()
             self._homing_poll_timer.stop()
+            self._restore_after_homing(self._homing_di_restore)
+
+    def _restore_after_homing(self, di_func: int) -> None:
+        """
+        回零完成后恢复 DI1 与加减速，并重新使能夹持。
+        整体作为一个事务组下发，原值在整组成功后才清除（见 _on_homing_restored）
+        """
+        accel = self._homing_accel_restore
+        decel = self._homing_decel_restore
+        msg = "回零完成，DI1 已恢复为无动作"
+        if accel is not None and decel is not None:
+            msg += f"，加减速已恢复为 {accel}"
+        self._homing_restoring = True
+        with self._transaction("回零恢复", partial(self._on_homing_restored, msg=msg)):
             # 先停机，避免写 DI 时 error=6 (slave busy)
             self._write_control_word(0x0000)
             # 恢复 DI1 为无动作(0)，保留其他 DI 配置
-            restore = (self._homing_di_restore & ~0x0F) | 0
-            self._write_32bit(0x002C, restore)
-            self._homing_di_restore = None
+            self._write_32bit(0x002C, (di_func & ~0x0F) | 0)
             # 恢复回零前改小的加减速为原值(0x005F/0x0061 全局共用，避免拖慢转盘定位)
-            msg = "回零完成，DI1 已恢复为无动作"
-            if self._homing_accel_restore is not None:
-                self._write_32bit(0x005F, self._homing_accel_restore)
-                self._write_32bit(0x0061, self._homing_decel_restore)
-                msg += f"，加减速已恢复为 {self._homing_accel_restore}"
-                self._homing_accel_restore = None
-                self._homing_decel_restore = None
+            if accel is not None and decel is not None:
+                self._write_32bit(0x005F, accel)
+                self._write_32bit(0x0061, decel)
             # 回零后保持使能并夹持力矩：上面为改 DI 写了 0x0000(脱机)。实测该驱动器
             # 仅 Operation Enabled(0x000F/0x0037) 才施加保持电流夹住电机，Switched On
             # (0x0007) 不夹持。这里从脱机态重新上电到 0x000F 保持力矩、停在 home。
@@ -565,9 +837,26 @@ class MotorService(QObject):
             self._write_control_word(0x0006)  # 就绪
             self._write_control_word(0x0007)  # 使能
             self._write_control_word(0x000F)  # 运行使能(保持力矩夹持)
-            msg += "，电机保持使能夹持"
-            self.homing_config_status.emit(msg)
-            self.homing_done.emit()
+
+    def _on_homing_restored(self, result: GroupResult, msg: str) -> None:
+        """
+        回零恢复事务组结束。失败时保留原值，由轮询的下一帧状态重试
+        （连续失败 HOMING_RESTORE_RETRIES 次后停止主动轮询，之后的状态帧仍会触发重试）
+        """
+        self._homing_restoring = False
+        if not result.ok:
+            self._homing_restore_failures += 1
+            if self._homing_restore_failures < self.HOMING_RESTORE_RETRIES:
+                self._homing_poll_timer.start()
+            else:
+                self.homing_config_status.emit("回零恢复失败，DI1/加减速仍为回零设置，将在下次状态刷新时重试")
+            return
+        self._homing_restore_failures = 0
+        self._homing_di_restore = None
+        self._homing_accel_restore = None
+        self._homing_decel_restore = None
+        self.homing_config_status.emit(msg + "，电机保持使能夹持")
+        self.homing_done.emit()
 
     def _on_homing_config_timeout(self) -> None:
         """回零配置读取超时"""
@@ -575,17 +864,15 @@ class MotorService(QObject):
         self.operation_done.emit(False, "读取回零参数超时")
 
     @staticmethod
-    def _format_error(resp: ModbusResponse) -> str:
-        if resp.error_code == -1:
-            return "CRC 校验失败"
-        if resp.error_code == -2:
-            return "通讯超时"
-        if resp.error_code == -3:
-            return "响应帧不完整"
+    def _format_error(
+        resp: ModbusResponse, request: ModbusRequest | None = None
+    ) -> str:
+        if resp.error_code < 0:
+            return COMM_ERRORS.get(resp.error_code, f"通讯错误 ({resp.error_code})")
         # 附带触发异常的功能码与寄存器地址，便于定位是哪条报文被拒
+        if request is None:
+            request = MotorService._request_from_frame(resp)
         detail = ""
-        if len(resp.raw_tx) >= 4:
-            func = resp.raw_tx[1]
-            addr = (resp.raw_tx[2] << 8) | resp.raw_tx[3]
-            detail = f" [功能码 0x{func:02X} 地址 0x{addr:04X}]"
+        if request is not None:
+            detail = f" [功能码 0x{int(request.function_code):02X} 地址 0x{request.address:04X}]"
         return f"Modbus 异常: {get_exception_text(resp.error_code)}{detail}"
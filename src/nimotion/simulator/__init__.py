@@ -0,0 +1,9 @@
+"""
+虚拟驱动器，供无硬件时的测试、回放与性能压测使用。
+本包不导入 PyQt5。
+"""
+
+from .drive import SimulatedDrive
+from .server import DriveServer
+
+__all__ = ["DriveServer", "SimulatedDrive"]
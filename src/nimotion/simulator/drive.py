@@ -0,0 +1,454 @@
+"""
+虚拟 NiMotion 驱动器。
+按 models/registers.py 的寄存器表应答 Modbus 请求，实现控制字状态机、
+梯形加减速运动（0x005B/0x005D/0x005F/0x0061）与 DI1 限位/原点开关。
+
+时间由可注入的时钟驱动：每次访问寄存器前按真实流逝时间推进运动，
+测试可传入手动时钟并调用 advance()。
+"""
+
+from __future__ import annotations
+
+import struct
+import time
+from typing import Callable
+
+from ..communication import crc16
+from ..models.registers import HOLDING_REGISTERS, INPUT_REGISTERS
+from ..models.types import DataType, FunctionCode, MotorState, RegisterDef, RunMode
+
+# Modbus 异常码
+ILLEGAL_FUNCTION = 0x01
+ILLEGAL_ADDRESS = 0x02
+ILLEGAL_VALUE = 0x03
+
+# 状态字
+SW_DISABLED = 0x0050
+SW_READY = 0x0031
+SW_SWITCHED_ON = 0x0033
+SW_ENABLED = 0x0037
+SW_QUICK_STOP = 0x0017
+SW_FAULT = 0x0008
+SW_RUNNING = 0x1000  # bit12: 运行过程中
+
+_STATE_WORDS = {
+    MotorState.SWITCH_ON_DISABLED: SW_DISABLED,
+    MotorState.READY_TO_SWITCH_ON: SW_READY,
+    MotorState.SWITCHED_ON: SW_SWITCHED_ON,
+    MotorState.OPERATION_ENABLED: SW_ENABLED,
+    MotorState.QUICK_STOP: SW_QUICK_STOP,
+}
+
+# 写入触发动作的命令寄存器: 地址 -> 口令
+_COMMANDS = {
+    0x0008: 0x7376,  # 保存所有参数
+    0x000B: 0x6C64,  # 恢复默认参数
+    0x0047: 0x535A,  # 设置零点
+    0x0048: 0x5348,  # 设置原点
+    0x0073: 0x6C64,  # 清空错误存储器
+    0x0074: 0x7465,  # 硬件自检
+}
+
+# DI 特殊功能 (0x002C 每 DI 4 位)
+DI_NEG_LIMIT = 1
+DI_POS_LIMIT = 2
+DI_HOME = 3
+
+ALARM_NEG_LIMIT = 0xFF0E  # 超负限位报警
+ALARM_POS_LIMIT = 0xFF0F  # 超正限位报警
+
+_STEP = 0.001  # 运动积分步长（秒）
+
+
+def _pair(value: int) -> tuple[int, int]:
+    value &= 0xFFFFFFFF
+    return value >> 16, value & 0xFFFF
+
+
+class SimulatedDrive:
+    """
+    单个从站。
+    handle(frame) 处理一帧请求并返回应答帧；广播或 CRC 错误时返回 None。
+    """
+
+    VENDOR_ID = 0x4E494D4F  # "NIMO"
+
+    def __init__(
+        self,
+        slave_id: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        reject_gaps: bool = False,
+    ) -> None:
+        self.slave_id = slave_id
+        self.serial_number = 0x00010000 + slave_id  # 产品序列号 (输入寄存器 0x0002)
+        self._clock = clock
+        self._last = clock()
+        # True: 读保持寄存器跨越表中未定义的地址时返回非法地址异常（用于验证读合并的回退）
+        self.reject_gaps = reject_gaps
+
+        self._defs: dict[int, RegisterDef] = {}
+        for reg in HOLDING_REGISTERS:
+            for i in range(reg.count):
+                self._defs[reg.address + i] = reg
+        self._holding: dict[int, int] = {}
+        self._eeprom: dict[int, int] = {}
+        self._load_defaults()
+        self._eeprom = dict(self._holding)
+        self._holding_end = max(self._defs) + 1
+        self._input_end = max(r.address + r.count for r in INPUT_REGISTERS)
+
+        self.state = MotorState.SWITCH_ON_DISABLED
+        self.position = 0.0  # 脉冲
+        self.velocity = 0.0  # Step/s，带符号
+        self._target: float | None = None  # 位置模式目标（脉冲）
+        self._cruise = 0.0  # 速度模式目标速度（Step/s，带符号）
+        self._homing = False
+        self.alarm_code = 0
+        self.alarm_history: list[int] = []
+        # DI1 开关所在位置（脉冲）；位置 <= 该值时开关动作。None = 无开关
+        self.di1_position: int | None = None
+        self.saves = 0  # EEPROM 写入次数
+        self.log: list[bytes] = []  # 收到的请求帧
+
+    # -- 寄存器 --
+
+    def _load_defaults(self) -> None:
+        for reg in HOLDING_REGISTERS:
+            value = reg.default_val or 0
+            if reg.count == 2:
+                self._holding[reg.address], self._holding[reg.address + 1] = _pair(value)
+            else:
+                self._holding[reg.address] = value & 0xFFFF
+        for addr in _COMMANDS:
+            self._holding[addr] = 1  # 读参数=1 表示支持该命令
+        self._holding[0x0051] = 0
+        self._holding[0x0000] = self.slave_id
+
+    def _u32(self, address: int) -> int:
+        return (self._holding[address] << 16) | self._holding[address + 1]
+
+    def _i32(self, address: int) -> int:
+        value = self._u32(address)
+        return value - 0x100000000 if value & 0x80000000 else value
+
+    @property
+    def microstep(self) -> int:
+        return 1 << min(self._holding[0x001A], 7)
+
+    @property
+    def mode(self) -> RunMode | None:
+        value = self._holding[0x0039]
+        return RunMode(value) if value in (1, 2, 3, 4) else None
+
+    @property
+    def moving(self) -> bool:
+        return self.velocity != 0.0 or self._target is not None or self._cruise != 0.0
+
+    @property
+    def status_word(self) -> int:
+        if self.state == MotorState.FAULT:
+            return SW_FAULT
+        word = _STATE_WORDS.get(self.state, SW_DISABLED)
+        if self.moving:
+            word |= SW_RUNNING
+        return word
+
+    @property
+    def di1_active(self) -> bool:
+        level = self.di1_position is not None and self.position <= self.di1_position
+        if self._holding[0x002E] & 0x01:  # 输入极性取反
+            level = not level
+        return level
+
+    @property
+    def di1_function(self) -> int:
+        return self._u32(0x002C) & 0x0F
+
+    def input_register(self, address: int) -> int:
+        """输入寄存器当前值"""
+        di_flags = 0
+        if self.di1_active:
+            di_flags |= {DI_NEG_LIMIT: 0x01, DI_POS_LIMIT: 0x02, DI_HOME: 0x04}.get(
+                self.di1_function, 0
+            )
+        pos_hi, pos_lo = _pair(round(self.position))
+        spd_hi, spd_lo = _pair(round(abs(self.velocity) * 10))
+        vendor_hi, vendor_lo = _pair(self.VENDOR_ID)
+        sn_hi, sn_lo = _pair(self.serial_number)
+        values = {
+            0x0000: vendor_hi, 0x0001: vendor_lo,
+            0x0002: sn_hi, 0x0003: sn_lo,
+            0x0016: 0,
+            0x0017: self._holding[0x0014],  # 输入电压
+            0x0018: int(self.di1_active), 0x0019: di_flags,
+            0x001E: self._holding[0x0039],
+            0x001F: self.status_word,
+            0x0020: 1 if self.velocity > 0 else 0,
+            0x0021: pos_hi, 0x0022: pos_lo,
+            0x0023: spd_hi, 0x0024: spd_lo,
+            0x0025: 0x0001 if self.alarm_code else 0,
+            0x0026: self.alarm_code,
+            0x0027: len(self.alarm_history),
+        }
+        if 0x0028 <= address <= 0x002F:
+            index = address - 0x0028
+            return self.alarm_history[index] if index < len(self.alarm_history) else 0
+        return values.get(address, 0)
+
+    def holding_register(self, address: int) -> int:
+        return self._holding.get(address, 0)
+
+    # -- 帧处理 --
+
+    def handle(self, frame: bytes) -> bytes | None:
+        """处理一帧请求，返回应答帧（含 CRC）"""
+        if len(frame) < 4 or not crc16.verify(frame):
+            return None
+        slave = frame[0]
+        if slave not in (0, self.slave_id):
+            return None
+        self.log.append(bytes(frame))
+        self.advance()
+        pdu = self._dispatch(frame[1], frame[2:-2])
+        if slave == 0:  # 广播不应答
+            return None
+        return crc16.append(bytes([self.slave_id]) + pdu)
+
+    def _dispatch(self, fc: int, body: bytes) -> bytes:
+        try:
+            if fc in (FunctionCode.READ_HOLDING, FunctionCode.READ_INPUT):
+                address, count = struct.unpack(">HH", body[:4])
+                values = self._read(fc, address, count)
+                return bytes([fc, count * 2]) + struct.pack(f">{count}H", *values)
+            if fc == FunctionCode.WRITE_SINGLE:
+                address, value = struct.unpack(">HH", body[:4])
+                self._write(address, [value])
+                return bytes([fc]) + body[:4]
+            if fc == FunctionCode.WRITE_MULTIPLE:
+                address, count, nbytes = struct.unpack(">HHB", body[:5])
+                if nbytes != count * 2 or len(body) < 5 + nbytes:
+                    raise _Exception(ILLEGAL_VALUE)
+                values = list(struct.unpack(f">{count}H", body[5:5 + nbytes]))
+                self._write(address, values)
+                return bytes([fc]) + body[:4]
+        except struct.error:
+            return bytes([fc | 0x80, ILLEGAL_VALUE])
+        except _Exception as e:
+            return bytes([fc | 0x80, e.code])
+        return bytes([fc | 0x80, ILLEGAL_FUNCTION])
+
+    def _read(self, fc: int, address: int, count: int) -> list[int]:
+        if not 1 <= count <= 125:
+            raise _Exception(ILLEGAL_VALUE)
+        end = address + count
+        if fc == FunctionCode.READ_INPUT:
+            if end > self._input_end:
+                raise _Exception(ILLEGAL_ADDRESS)
+            return [self.input_register(a) for a in range(address, end)]
+        if end > self._holding_end:
+            raise _Exception(ILLEGAL_ADDRESS)
+        if self.reject_gaps and any(a not in self._defs for a in range(address, end)):
+            raise _Exception(ILLEGAL_ADDRESS)
+        return [self._holding.get(a, 0) for a in range(address, end)]
+
+    def _write(self, address: int, values: list[int]) -> None:
+        end = address + len(values)
+        if not values or any(a not in self._defs for a in range(address, end)):
+            raise _Exception(ILLEGAL_ADDRESS)
+        staged = {address + i: v for i, v in enumerate(values)}
+        # 32 位寄存器需整体写入，逐个校验范围
+        checked: set[int] = set()
+        for a in staged:
+            reg = self._defs[a]
+            if reg.address in checked:
+                continue
+            checked.add(reg.address)
+            if not reg.writable:
+                raise _Exception(ILLEGAL_ADDRESS)
+            if reg.count == 2 and not (reg.address in staged and reg.address + 1 in staged):
+                raise _Exception(ILLEGAL_ADDRESS)
+            if reg.address in _COMMANDS or reg.address == 0x0051:
+                continue
+            value = staged[reg.address]
+            if reg.count == 2:
+                value = (value << 16) | staged[reg.address + 1]
+                if reg.data_type == DataType.INT32 and value & 0x80000000:
+                    value -= 0x100000000
+            if reg.min_val is not None and value < reg.min_val:
+                raise _Exception(ILLEGAL_VALUE)
+            if reg.max_val is not None and value > reg.max_val:
+                raise _Exception(ILLEGAL_VALUE)
+        # 最小速度不得高于最大速度
+        new_max = (staged[0x005B] << 16 | staged[0x005C]) if 0x005B in staged else self._u32(0x005B)
+        new_min = (staged[0x005D] << 16 | staged[0x005E]) if 0x005D in staged else self._u32(0x005D)
+        if (0x005B in staged or 0x005D in staged) and new_min > new_max:
+            raise _Exception(ILLEGAL_VALUE)
+
+        for a, v in staged.items():
+            if a in _COMMANDS:
+                self._command(a, v)
+            elif a == 0x0051:
+                self._control(v)
+            else:
+                self._holding[a] = v & 0xFFFF
+
+    def _command(self, address: int, value: int) -> None:
+        if value != _COMMANDS[address]:
+            raise _Exception(ILLEGAL_VALUE)
+        if address == 0x0008:
+            self._eeprom = dict(self._holding)
+            self.saves += 1
+        elif address == 0x000B:
+            self._load_defaults()
+        elif address in (0x0047, 0x0048):
+            self.position = 0.0
+        elif address == 0x0073:
+            self.alarm_history.clear()
+
+    # -- 控制字状态机 --
+
+    def _control(self, word: int) -> None:
+        previous = self._holding[0x0051]
+        self._holding[0x0051] = word
+        state = self.state
+        if word & 0x0080:  # 故障复位
+            if state == MotorState.FAULT:
+                self.alarm_code = 0
+                self.state = MotorState.SWITCH_ON_DISABLED
+            return
+        if state == MotorState.FAULT:
+            return
+        low = word & 0x000F
+        if low == 0x0000:
+            self._halt()
+            self.state = MotorState.SWITCH_ON_DISABLED
+        elif low == 0x0002:
+            self._stop()
+            self.state = MotorState.QUICK_STOP
+        elif low == 0x0006:
+            self._halt()
+            self.state = MotorState.READY_TO_SWITCH_ON
+        elif low == 0x0007:
+            if state == MotorState.OPERATION_ENABLED:
+                self._stop()  # 运行 -> 使能: 减速停机
+                self.state = MotorState.SWITCHED_ON
+            elif state in (MotorState.READY_TO_SWITCH_ON, MotorState.SWITCHED_ON):
+                self.state = MotorState.SWITCHED_ON
+        elif low == 0x000F:
+            if state in (MotorState.SWITCHED_ON, MotorState.OPERATION_ENABLED):
+                self.state = MotorState.OPERATION_ENABLED
+                if self.mode == RunMode.SPEED:
+                    speed = self._u32(0x0055)
+                    self._cruise = speed if self._holding[0x0052] else -speed
+                # bit4 上升沿: 新位置 / 启动回零
+                if word & 0x0010 and not previous & 0x0010:
+                    self._trigger(relative=bool(word & 0x0040))
+
+    def _trigger(self, relative: bool) -> None:
+        if self.mode == RunMode.POSITION:
+            if relative:
+                step = self._u32(0x0053)
+                direction = 1 if self._holding[0x0052] else -1
+                self._target = round(self.position) + direction * step
+            else:
+                self._target = self._i32(0x0053)
+        elif self.mode == RunMode.HOMING:
+            self._homing = True
+            self._cruise = -float(self._u32(0x006C))
+
+    def _halt(self) -> None:
+        """立即停止（断使能）"""
+        self.velocity = 0.0
+        self._cruise = 0.0
+        self._target = None
+        self._homing = False
+
+    def _stop(self) -> None:
+        """按减速度停机"""
+        self._cruise = 0.0
+        self._target = None
+        self._homing = False
+
+    def inject_fault(self, code: int) -> None:
+        """模拟驱动器报警（如 0x2200 过流）"""
+        self._halt()
+        self.alarm_code = code
+        self.alarm_history = ([code] + self.alarm_history)[:8]
+        self.state = MotorState.FAULT
+
+    # -- 运动 --
+
+    def advance(self, seconds: float | None = None) -> None:
+        """
+        推进仿真时间。
+        seconds 为 None 时按时钟推进到当前时刻；否则额外推进指定秒数（手动时钟下使用）。
+        """
+        now = self._clock()
+        dt = now - self._last if seconds is None else seconds
+        self._last = now
+        while dt > 0 and self.moving:
+            step = min(dt, _STEP)
+            self._integrate(step)
+            dt -= step
+
+    def _integrate(self, dt: float) -> None:
+        micro = self.microstep
+        v_max = float(self._u32(0x005B))
+        v_min = float(min(self._u32(0x005D), self._u32(0x005B)))
+        accel = float(max(self._u32(0x005F), 1))
+        decel = float(max(self._u32(0x0061), 1))
+        v = self.velocity
+
+        if self._target is not None:
+            remaining = (self._target - self.position) / micro  # Step，带符号
+            direction = 1.0 if remaining > 0 else -1.0
+            speed = abs(v) if v * direction >= 0 else 0.0
+            brake = max(speed * speed - v_min * v_min, 0.0) / (2 * decel)
+            if abs(remaining) <= brake:
+                speed = max(speed - decel * dt, v_min)
+            else:
+                speed = min(max(speed, v_min) + accel * dt, v_max)
+            travel = speed * dt
+            if travel >= abs(remaining):
+                self.position = float(self._target)
+                self.velocity = 0.0
+                self._target = None
+            else:
+                self.position += direction * travel * micro
+                self.velocity = direction * speed
+        else:
+            target_v = max(min(self._cruise, v_max), -v_max)
+            if v < target_v:
+                rate = accel if v >= 0 else decel
+                v = min(v + rate * dt, target_v)
+            elif v > target_v:
+                rate = accel if v <= 0 else decel
+                v = max(v - rate * dt, target_v)
+            if target_v == 0 and abs(v) < v_min:
+                v = 0.0
+            self.velocity = v
+            self.position += v * dt * micro
+        self._check_switch()
+
+    def _check_switch(self) -> None:
+        if not self.di1_active:
+            return
+        function = self.di1_function
+        if self._homing and function in (DI_NEG_LIMIT, DI_HOME):
+            # 回零完成: 停在开关处，当前位置设为原点偏移
+            self._halt()
+            self.position = float(self._i32(0x0069))
+        elif function == DI_NEG_LIMIT and self.velocity < 0:
+            self._halt()
+            self.alarm_code = ALARM_NEG_LIMIT
+        elif function == DI_POS_LIMIT and self.velocity > 0:
+            self._halt()
+            self.alarm_code = ALARM_POS_LIMIT
+
+
+class _Exception(Exception):
+    """内部: 以 Modbus 异常码应答"""
+
+    def __init__(self, code: int) -> None:
+        super().__init__(code)
+        self.code = code
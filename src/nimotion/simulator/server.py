@@ -0,0 +1,126 @@
+"""
+在 Linux pty 上提供虚拟驱动器。
+主端由后台线程读取请求帧并交给对应从站应答，从端路径可直接作为串口打开，
+上位机（GUI、脚本、nimotion.aio）无需修改即可连接。
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import threading
+import time
+import tty
+
+from ..communication import crc16
+from ..communication.modbus_rtu import ModbusRTU
+from ..communication.serial_port import silent_interval
+from ..models.types import FunctionCode
+from .drive import SimulatedDrive
+
+logger = logging.getLogger(__name__)
+
+
+def request_length(header: crc16.Buffer) -> int:
+    """
+    由请求帧前 7 字节推算整帧长度，未知功能码返回 0（靠静默断帧）。
+    0x03/0x04/0x06 固定 8 字节；0x10 为 9 + 字节数。
+    """
+    fc = header[1]
+    if fc in (FunctionCode.READ_HOLDING, FunctionCode.READ_INPUT, FunctionCode.WRITE_SINGLE):
+        return 8
+    if fc == FunctionCode.WRITE_MULTIPLE:
+        return 9 + header[6] if len(header) >= 7 else 7
+    return 0
+
+
+class DriveServer:
+    """
+    pty 上的多从站总线。
+    用法:
+        with DriveServer([SimulatedDrive(1)]) as server:
+            SerialConfig(port=server.port, ...)
+    """
+
+    def __init__(
+        self,
+        drives: list[SimulatedDrive] | None = None,
+        baudrate: int = 115200,
+        response_delay: float = 0.0,
+    ) -> None:
+        self.drives = {d.slave_id: d for d in (drives or [SimulatedDrive()])}
+        self.baudrate = baudrate
+        # 附加应答延时（秒）；驱动器 0x0003 "Modbus返回等待时间" 另行叠加
+        self.response_delay = response_delay
+        self._master: int | None = None
+        self._slave: int | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.port = ""
+
+    def start(self) -> str:
+        """创建 pty 并启动应答线程，返回从端设备路径"""
+        self._master, self._slave = os.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._serve, name="drive-sim", daemon=True)
+        self._thread.start()
+        return self.port
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+        for fd in (self._master, self._slave):
+            if fd is not None:
+                os.close(fd)
+        self._master = self._slave = None
+
+    def __enter__(self) -> DriveServer:
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _serve(self) -> None:
+        assert self._master is not None
+        master = self._master
+        buf = bytearray()
+        silence = max(silent_interval(self.baudrate), 0.005)
+        while not self._stop.is_set():
+            readable, _, _ = select.select([master], [], [], silence if buf else 0.05)
+            if readable:
+                try:
+                    buf += os.read(master, 512)
+                except OSError:
+                    return
+            elif buf:
+                # 静默断帧: 丢弃无法解析的残帧
+                logger.debug("丢弃残帧: %s", buf.hex(" "))
+                buf.clear()
+                continue
+            while len(buf) >= 2:
+                length = request_length(buf) or len(buf)
+                if len(buf) < length or length > ModbusRTU.MAX_FRAME_SIZE:
+                    break
+                frame = bytes(buf[:length])
+                del buf[:length]
+                self._reply(master, frame)
+
+    def _reply(self, master: int, frame: bytes) -> None:
+        targets = self.drives.values() if frame[0] == 0 else [self.drives.get(frame[0])]
+        for drive in targets:
+            if drive is None:
+                continue
+            resp = drive.handle(frame)
+            if resp is None:
+                continue
+            delay = self.response_delay + drive.holding_register(0x0003) / 1000
+            if delay > 0:
+                time.sleep(delay)
+            os.write(master, resp)
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import logging
+import threading
+
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import (
     QComboBox,
@@ -12,8 +15,11 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
+from ..communication.discovery import DiscoveredDevice, discover
 from ..communication.serial_port import SerialConfig, SerialPort
 
+logger = logging.getLogger(__name__)
+
 
 class ConnectionBar(QWidget):
     """串口连接栏 - 统一管理串口配置和连接/断开操作"""
@@ -21,6 +27,8 @@ class ConnectionBar(QWidget):
     connect_requested = pyqtSignal(object)  # SerialConfig
     disconnect_requested = pyqtSignal()
     slave_id_changed = pyqtSignal(int)
+    devices_discovered = pyqtSignal(list)  # list[DiscoveredDevice]
+    _scan_finished = pyqtSignal(list)  # 扫描线程 -> 主线程，内部用
 
     BAUDRATES = [9600, 19200, 38400, 57600, 115200, 256000, 500000, 1000000]
     PARITIES = [("无 (N)", "N"), ("偶 (E)", "E"), ("奇 (O)", "O")]
@@ -29,6 +37,8 @@ class ConnectionBar(QWidget):
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
         self._connected = False
+        self._scanning = False
+        self._scan_finished.connect(self._on_scan_finished)
         self._init_ui()
 
     def _init_ui(self) -> None:
@@ -76,6 +86,13 @@ class ConnectionBar(QWidget):
         self._slave_spin.valueChanged.connect(self.slave_id_changed.emit)
         layout.addWidget(self._slave_spin)
 
+        # 自动发现
+        self._scan_btn = QPushButton("扫描")
+        self._scan_btn.setFixedWidth(80)
+        self._scan_btn.setToolTip("并行扫描全部串口的波特率、数据格式与从站地址")
+        self._scan_btn.clicked.connect(self._on_scan_clicked)
+        layout.addWidget(self._scan_btn)
+
         # 连接按钮
         self._connect_btn = QPushButton("连接")
         self._connect_btn.setFixedWidth(100)
@@ -116,6 +133,56 @@ class ConnectionBar(QWidget):
             )
             self.connect_requested.emit(config)
 
+    def _on_scan_clicked(self) -> None:
+        if self._scanning:
+            return
+        self._scanning = True
+        self._set_controls_enabled(False)
+        self._connect_btn.setEnabled(False)
+        self._scan_btn.setText("扫描中…")
+        threading.Thread(target=self._scan, name="discovery", daemon=True).start()
+
+    def _scan(self) -> None:
+        """扫描线程：无论成败都发出 _scan_finished，界面才能退出扫描状态"""
+        devices: list[DiscoveredDevice] = []
+        try:
+            devices = discover()
+        except Exception:
+            logger.exception("设备扫描失败")
+        finally:
+            self._scan_finished.emit(devices)
+
+    def _on_scan_finished(self, devices: list) -> None:
+        self._scanning = False
+        self._scan_btn.setText("扫描")
+        self._connect_btn.setEnabled(True)
+        self._set_controls_enabled(not self._connected)
+        self._refresh_ports()
+        if devices:
+            self.apply_device(devices[0])
+        self._scan_btn.setToolTip(
+            "\n".join(
+                f"{d.port} {d.baudrate} {d.data_format} 从站 {d.slave_id} SN {d.serial_number:08X}"
+                for d in devices
+            ) or "未发现设备"
+        )
+        self.devices_discovered.emit(devices)
+
+    def apply_device(self, device: DiscoveredDevice) -> None:
+        """按发现的设备填写端口、波特率、格式与从站地址"""
+        config = device.config()
+        idx = self._port_combo.findText(config.port)
+        if idx < 0:
+            self._port_combo.addItem(config.port)
+            idx = self._port_combo.count() - 1
+        self._port_combo.setCurrentIndex(idx)
+        if self._baud_combo.findData(config.baudrate) < 0:
+            self._baud_combo.addItem(str(config.baudrate), config.baudrate)
+        self._baud_combo.setCurrentIndex(self._baud_combo.findData(config.baudrate))
+        self._parity_combo.setCurrentIndex(self._parity_combo.findData(config.parity))
+        self._stop_combo.setCurrentIndex(self._stop_combo.findData(config.stopbits))
+        self._slave_spin.setValue(device.slave_id)
+
     @property
     def slave_id(self) -> int:
         return self._slave_spin.value()
@@ -139,3 +206,4 @@ class ConnectionBar(QWidget):
         self._parity_combo.setEnabled(enabled)
         self._stop_combo.setEnabled(enabled)
         self._slave_spin.setEnabled(enabled)
+        self._scan_btn.setEnabled(enabled)
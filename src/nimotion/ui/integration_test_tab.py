@@ -78,7 +78,7 @@ class IntegrationTestTab(QWidget):
         # 状态轮询定时器（不依赖状态面板的「自动」勾选）
         self._poll_timer = QTimer(self)
         self._poll_timer.setInterval(self._POLL_INTERVAL_MS)
-        self._poll_timer.timeout.connect(self._motor.refresh_status)
+        self._poll_timer.timeout.connect(self._on_poll)
 
         # 单步看门狗（防止某一步卡死）
         self._step_timer = QTimer(self)
@@ -248,6 +248,9 @@ class IntegrationTestTab(QWidget):
                 return
         self._begin_step()
 
+    def _on_poll(self) -> None:
+        self._motor.refresh_status()
+
     def _on_status_updated(self, status: MotorStatus) -> None:
         if not self._running:
             return
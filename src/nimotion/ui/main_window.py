@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import (
     QLabel,
     QMainWindow,
@@ -25,11 +26,14 @@ from .serial_tab import SerialTab
 class MainWindow(QMainWindow):
     """主窗口"""
 
+    EVENT_RATE_HZ = 60  # 通讯事件批量投递到界面的频率
+
     def __init__(self, parent=None) -> None:
         super().__init__(parent)
 
         # 核心组件
         self._worker = CommWorker(self)
+        self._worker.set_batching(self.EVENT_RATE_HZ)
         self._motor_service = MotorService(self._worker)
 
         self._init_ui()
@@ -68,9 +72,20 @@ class MainWindow(QMainWindow):
         self.setStatusBar(self._status_bar)
         self._conn_status = QLabel("未连接")
         self._status_bar.addWidget(self._conn_status)
+        self._health_label = QLabel("")
+        self._health_label.setToolTip(
+            "每秒事务数 / 响应时间 p99 / 超时 / CRC 错误 / 短帧 / 从站异常"
+        )
+        self._status_bar.addPermanentWidget(self._health_label)
         self._bytes_label = QLabel("TX: 0  RX: 0")
         self._status_bar.addPermanentWidget(self._bytes_label)
 
+        # 总线健康读数，每秒刷新
+        self._health_timer = QTimer(self)
+        self._health_timer.setInterval(1000)
+        self._health_timer.timeout.connect(self._refresh_health)
+        self._last_transactions = 0
+
     def _connect_signals(self) -> None:
         # 连接栏
         self._conn_bar.connect_requested.connect(self._on_connect)
@@ -85,6 +100,8 @@ class MainWindow(QMainWindow):
         self._worker.disconnected.connect(self._on_disconnected)
         self._worker.connection_error.connect(self._on_connection_error)
         self._worker.bytes_count_updated.connect(self._on_bytes_updated)
+        self._worker.queue_overflow.connect(self._on_queue_overflow)
+        self._worker.slave_online_changed.connect(self._on_slave_online_changed)
 
     def _on_connect(self, config: SerialConfig) -> None:
         self._worker.connect_port(config)
@@ -94,9 +111,12 @@ class MainWindow(QMainWindow):
 
     def _on_connected(self) -> None:
         self._conn_bar.on_connected()
-        config = self._worker._serial.config
+        config = self._worker.config
         self._conn_status.setText(f"已连接 {config.port} {config.baudrate}")
         self._conn_status.setStyleSheet("color: green;")
+        self._worker.reset_stats()
+        self._last_transactions = 0
+        self._health_timer.start()
         # 首次连接参数校准
         self._motor_service.check_init_params()
 
@@ -104,6 +124,7 @@ class MainWindow(QMainWindow):
         self._conn_bar.on_disconnected()
         self._conn_status.setText("未连接")
         self._conn_status.setStyleSheet("color: gray;")
+        self._health_timer.stop()
 
     def _on_connection_error(self, error: str) -> None:
         QMessageBox.critical(self, "连接失败", error)
@@ -116,6 +137,25 @@ class MainWindow(QMainWindow):
     def _on_bytes_updated(self, tx: int, rx: int) -> None:
         self._bytes_label.setText(f"TX: {tx}  RX: {rx}")
 
+    def _on_queue_overflow(self, lane: str, count: int) -> None:
+        self._status_bar.showMessage(f"通讯繁忙: {lane} 队列已满，丢弃 {count} 条请求", 3000)
+
+    def _on_slave_online_changed(self, slave_id: int, online: bool) -> None:
+        if online:
+            self._status_bar.showMessage(f"从站 {slave_id} 已恢复应答", 3000)
+        else:
+            self._status_bar.showMessage(f"从站 {slave_id} 无应答，已暂停其通讯并定期探测")
+
+    def _refresh_health(self) -> None:
+        total = self._worker.stats()["total"]
+        rate = total["transactions"] - self._last_transactions
+        self._last_transactions = total["transactions"]
+        self._health_label.setText(
+            f"{rate} 帧/s  p99 {total['response']['p99_ms']:.1f}ms  "
+            f"超时 {total['timeouts']}  CRC {total['crc_errors']}  "
+            f"短帧 {total['short_frames']}  异常 {total['exceptions']}"
+        )
+
     def _on_init_config_done(self, msg: str) -> None:
         self._status_bar.showMessage(msg, 5000)
 
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from functools import partial
+
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
     QComboBox,
@@ -39,7 +41,6 @@ class ModbusTab(QWidget):
         self._worker = worker
         self._slave_id = 1
         self._init_ui()
-        self._connect_signals()
         self._on_fc_changed(0)
 
     def set_slave_id(self, slave_id: int) -> None:
@@ -125,10 +126,6 @@ class ModbusTab(QWidget):
         group_log.setLayout(log_layout)
         layout.addWidget(group_log)
 
-    def _connect_signals(self) -> None:
-        self._worker.response_received.connect(self._on_response)
-        self._worker.raw_data_sent.connect(self._log.append_tx)
-
     def _on_fc_changed(self, index: int) -> None:
         """功能码切换联动"""
         fc = self._fc_combo.currentData()
@@ -187,7 +184,7 @@ class ModbusTab(QWidget):
             address=self._get_address(),
             count=self._count_spin.value(),
         )
-        self._worker.send_modbus(req)
+        self._send(req)
 
     def _on_write(self) -> None:
         """写入按钮"""
@@ -218,11 +215,19 @@ class ModbusTab(QWidget):
                 count=len(values),
                 values=values,
             )
-        self._worker.send_modbus(req)
+        self._send(req)
+
+    def _send(self, req: ModbusRequest) -> None:
+        # 响应经回调只回到本页，不再混入电机服务的报文
+        self._worker.send_modbus(req, callback=partial(self._on_response, request=req))
 
-    def _on_response(self, resp: ModbusResponse) -> None:
-        """处理响应"""
+    def _on_response(
+        self, resp: ModbusResponse, request: ModbusRequest | None = None
+    ) -> None:
+        """处理本页请求的响应"""
         # 记录原始帧
+        if resp.raw_tx:
+            self._log.append_tx(resp.raw_tx)
         if resp.raw_rx:
             self._log.append_rx(resp.raw_rx)
 
@@ -232,13 +237,19 @@ class ModbusTab(QWidget):
 
         # 读取响应 - 填充表格
         if resp.function_code in (FunctionCode.READ_HOLDING, FunctionCode.READ_INPUT):
-            self._fill_table(resp)
+            self._fill_table(resp, request)
         else:
             self._log.append_info("写入成功")
 
-    def _fill_table(self, resp: ModbusResponse) -> None:
+    def _fill_table(
+        self, resp: ModbusResponse, request: ModbusRequest | None = None
+    ) -> None:
         """填充结果表格"""
-        if resp.raw_tx and len(resp.raw_tx) >= 4:
+        fc: int
+        if request is not None:
+            start_addr = request.address
+            fc = request.function_code
+        elif resp.raw_tx and len(resp.raw_tx) >= 4:
             start_addr = (resp.raw_tx[2] << 8) | resp.raw_tx[3]
             fc = resp.raw_tx[1]
         else:
@@ -102,7 +102,7 @@ class MotorStatusPanel(QWidget):
         # 刷新控制
         refresh_row = QHBoxLayout()
         refresh_btn = QPushButton("刷新")
-        refresh_btn.clicked.connect(self._motor.refresh_status)
+        refresh_btn.clicked.connect(self._on_poll)
         refresh_row.addWidget(refresh_btn)
 
         self._auto_cb = QCheckBox("自动")
@@ -135,6 +135,7 @@ class SerialTab(QWidget):
     def _connect_signals(self) -> None:
         self._worker.raw_data_received.connect(self._on_data_received)
         self._worker.raw_data_sent.connect(self._on_data_sent)
+        self._worker.events_batched.connect(self._log.append_batch)
 
     def _on_quick_command(self, idx: int) -> None:
         """快捷指令点击"""
@@ -50,6 +50,22 @@ class LogViewer(QPlainTextEdit):
         self.appendPlainText(f"{prefix}RX << {text}")
         self._scroll_to_bottom()
 
+    def append_batch(self, events: list) -> None:
+        """
+        一次追加多条收发记录（CommWorker.events_batched）。
+        整批一次插入、一次滚动；非收发事件忽略。
+        """
+        lines = []
+        for kind, data, ts in events:
+            if kind == "tx":
+                lines.append(f"{self._timestamp_prefix(ts)}TX >> {self._format_data(data)}")
+            elif kind == "rx":
+                lines.append(f"{self._timestamp_prefix(ts)}RX << {self._format_data(data)}")
+        if not lines:
+            return
+        self.appendPlainText("\n".join(lines))
+        self._scroll_to_bottom()
+
     def append_info(self, message: str) -> None:
         """追加信息记录"""
         prefix = self._timestamp_prefix()
@@ -61,9 +77,10 @@ class LogViewer(QPlainTextEdit):
             return " ".join(f"{b:02X}" for b in data)
         return data.decode("latin-1", errors="replace")
 
-    def _timestamp_prefix(self) -> str:
+    def _timestamp_prefix(self, ts: float | None = None) -> str:
         if self._show_timestamp:
-            return f"[{datetime.now().strftime('%H:%M:%S.%f')[:-3]}] "
+            now = datetime.now() if ts is None else datetime.fromtimestamp(ts)
+            return f"[{now.strftime('%H:%M:%S.%f')[:-3]}] "
         return ""
 
     def _scroll_to_bottom(self) -> None:
@@ -0,0 +1,154 @@
+"""nimotion.aio 单元测试（pty 模拟串口，不启动 Qt）"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from nimotion.aio import AsyncModbusClient, AsyncMotor, ModbusError
+from nimotion.communication import crc16
+from nimotion.communication.serial_port import SerialConfig
+from nimotion.models.types import FunctionCode, ModbusRequest, MotorState
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="需要 pty")
+
+
+class PtyDrive:
+    """pty 主端上的应答方：每收到一帧请求，回送预置的下一条应答"""
+
+    def __init__(self) -> None:
+        self.master, slave = os.openpty()
+        self.path = os.ttyname(slave)
+        self._slave = slave
+        self.replies: list[bytes] = []
+        self.requests: list[bytes] = []
+
+    def start(self) -> None:
+        asyncio.get_running_loop().add_reader(self.master, self._on_request)
+
+    def _on_request(self) -> None:
+        self.requests.append(os.read(self.master, 256))
+        if self.replies:
+            os.write(self.master, self.replies.pop(0))
+
+    def close(self) -> None:
+        asyncio.get_running_loop().remove_reader(self.master)
+        os.close(self.master)
+        os.close(self._slave)
+
+
+def _run(coro_fn):
+    async def main():
+        drive = PtyDrive()
+        drive.start()
+        client = await AsyncModbusClient.connect(
+            SerialConfig(port=drive.path, baudrate=115200, timeout=0.2, rx_silence_floor=0.02)
+        )
+        try:
+            return await coro_fn(client, drive)
+        finally:
+            client.close()
+            drive.close()
+
+    return asyncio.run(main())
+
+
+def _read_reply(slave: int, fc: int, values: list[int]) -> bytes:
+    data = b"".join(v.to_bytes(2, "big") for v in values)
+    return crc16.append(bytes([slave, fc, len(data)]) + data)
+
+
+class TestAsyncModbusClient:
+    def test_read_holding(self):
+        async def body(client, drive):
+            drive.replies.append(_read_reply(1, 0x03, [4]))
+            return await client.read_holding(1, 0x001A, 1), drive.requests
+
+        values, requests = _run(body)
+        assert values == [4]
+        assert requests[0][:6] == bytes([0x01, 0x03, 0x00, 0x1A, 0x00, 0x01])
+
+    def test_timeout(self):
+        async def body(client, drive):
+            return await client.transact(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1))
+
+        resp = _run(body)
+        assert resp.is_error and resp.error_code == -2
+
+    def test_request_timeout_used(self):
+        """未显式给出 timeout 时按 request.timeout 等待，而不是串口配置的 0.2 s"""
+        async def body(client, drive):
+            started = time.perf_counter()
+            await client.transact(
+                ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1, timeout=0.5),
+            )
+            return time.perf_counter() - started
+
+        assert _run(body) >= 0.45
+
+    def test_exception_raises(self):
+        async def body(client, drive):
+            drive.replies.append(crc16.append(bytes([0x01, 0x86, 0x03])))
+            with pytest.raises(ModbusError) as info:
+                await client.write_single(1, 0x005B, 9999)
+            return info.value
+
+        err = _run(body)
+        assert err.response.error_code == 0x03
+        assert "0x005B" in str(err)
+
+
+class TestAsyncMotor:
+    def test_refresh_status(self):
+        vals = [24, 1, 0, 0, 0, 0, 0, 1, 0x1037, 1, 0, 1600, 0, 100, 0, 0]
+
+        async def body(client, drive):
+            drive.replies.append(_read_reply(1, 0x04, vals))
+            return await AsyncMotor(client).refresh_status()
+
+        status = _run(body)
+        assert status.state == MotorState.UNKNOWN  # 0x1037 含运行位
+        assert status.is_running
+        assert status.position == 1600
+        assert status.speed == 10
+
+    def test_move_relative_sequence(self):
+        async def body(client, drive):
+            motor = AsyncMotor(client)
+            for addr in (0x0051, 0x0039, 0x0052):
+                drive.replies.append(crc16.append(bytes([1, 0x06, 0, addr, 0, 0])))
+            drive.replies.append(crc16.append(bytes([1, 0x10, 0, 0x53, 0, 2])))
+            for _ in range(4):
+                drive.replies.append(crc16.append(bytes([1, 0x06, 0, 0x51, 0, 0])))
+            await motor.move_relative(-800)
+            return drive.requests
+
+        requests = _run(body)
+        assert len(requests) == 8
+        assert requests[2][4:6] == b"\x00\x00"  # 负数 -> 反转
+        assert requests[3][7:11] == (800).to_bytes(4, "big")  # 幅值为正
+
+    def test_save_params_eeprom_timeout(self):
+        async def body(client, drive):
+            calls = []
+            transact = client.transport.transact
+
+            async def spy(frame, timeout=None):
+                calls.append(timeout)
+                return await transact(frame, timeout)
+
+            client.transport.transact = spy
+            drive.replies.append(crc16.append(bytes([1, 0x06, 0, 0x08, 0x73, 0x76])))
+            await AsyncMotor(client).save_params()
+            return calls
+
+        assert _run(body) == [AsyncMotor.EEPROM_TIMEOUT]
+
+
+def test_no_qt_import():
+    code = "import sys, nimotion.aio; assert 'PyQt5' not in sys.modules"
+    src = os.path.join(os.path.dirname(__file__), "..", "..", "src")
+    subprocess.run([sys.executable, "-c", code], check=True, env={**os.environ, "PYTHONPATH": src})
@@ -0,0 +1,59 @@
+"""从站熔断测试"""
+
+from nimotion.communication.breaker import PROBE_ADDR, CircuitBreaker
+from nimotion.models.types import FunctionCode
+
+
+def _trip(b: CircuitBreaker, slave=1, now=0.0) -> None:
+    for _ in range(b.threshold):
+        b.record_timeout(slave, now)
+
+
+class TestCircuitBreaker:
+    def test_trips_after_threshold(self):
+        b = CircuitBreaker(threshold=3)
+        assert not b.record_timeout(1, 0.0)
+        assert not b.record_timeout(1, 0.0)
+        assert b.record_timeout(1, 0.0)
+        assert b.is_open(1)
+        assert not b.is_open(2)
+        assert b.open_slaves == [1]
+
+    def test_success_resets_count(self):
+        b = CircuitBreaker(threshold=3)
+        b.record_timeout(1, 0.0)
+        b.record_timeout(1, 0.0)
+        assert not b.record_success(1)
+        assert not b.record_timeout(1, 0.0)
+        assert not b.is_open(1)
+
+    def test_probe_schedule(self):
+        b = CircuitBreaker(threshold=1, probe_interval=0.5, probe_timeout=0.1)
+        assert b.next_probe_in(0.0) is None
+        _trip(b, slave=3, now=10.0)
+        assert b.due_probe(10.2) is None
+        assert abs(b.next_probe_in(10.2) - 0.3) < 1e-9
+        probe = b.due_probe(10.5)
+        assert (probe.slave_id, probe.function_code, probe.address, probe.count) == (
+            3, FunctionCode.READ_INPUT, PROBE_ADDR, 1,
+        )
+        assert probe.timeout == 0.1
+        assert b.due_probe(10.6) is None  # 每个周期只探测一次
+        # 探测超时不重复熔断，只推迟下一次探测
+        assert not b.record_timeout(3, 10.6)
+        assert abs(b.next_probe_in(10.6) - 0.5) < 1e-9
+
+    def test_recover(self):
+        b = CircuitBreaker(threshold=1)
+        _trip(b)
+        assert b.record_success(1)
+        assert not b.is_open(1)
+        assert b.next_probe_in(0.0) is None
+
+    def test_snapshot_and_reset(self):
+        b = CircuitBreaker(threshold=2)
+        _trip(b, slave=4)
+        b.due_probe(100.0)
+        assert b.snapshot() == {4: {"timeouts": 2, "open": True, "probes": 1}}
+        b.reset()
+        assert b.snapshot() == {}
@@ -0,0 +1,117 @@
+"""报文抓包文件读写测试"""
+
+import os
+import queue
+
+import pytest
+
+from nimotion.communication import capture
+from nimotion.communication.capture import (
+    RX,
+    TX,
+    CaptureReader,
+    CaptureWriter,
+    index_path,
+)
+
+
+@pytest.fixture(params=["numpy", "struct"])
+def backend(request, monkeypatch):
+    """分别在有/无 numpy 时运行读取测试"""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(capture, "np", None)
+    return request.param
+
+
+def _write(path, n=100):
+    with CaptureWriter(path, baudrate=115200) as w:
+        for i in range(n):
+            slave = i % 3 + 1
+            w.write(TX, bytes([slave, 0x03, 0x00, i & 0xFF]), ts_ns=1000 + i * 10)
+    return w
+
+
+class TestWriter:
+    def test_header_and_counts(self, tmp_path):
+        path = tmp_path / "bus.nimcap"
+        w = _write(path, 10)
+        assert w.written == 10
+        assert w.dropped == 0
+        assert path.read_bytes()[:8] == capture.MAGIC
+        assert index_path(path).stat().st_size == 10 * capture._INDEX.size
+
+    def test_write_after_close_ignored(self, tmp_path):
+        w = _write(tmp_path / "bus.nimcap", 1)
+        w.write(TX, b"\x01\x03")
+        assert w.written == 1
+
+    def test_queue_full_counts_drops(self, tmp_path):
+        with CaptureWriter(tmp_path / "bus.nimcap") as w:
+            w._queue = queue.Queue(1)  # 模拟磁盘跟不上、队列已满
+            w._queue.put_nowait((0, TX, b"\x01"))
+            w.write(TX, b"\x01\x03")
+            assert w.dropped == 1
+
+
+class TestReader:
+    def test_roundtrip(self, tmp_path, backend):
+        path = tmp_path / "bus.nimcap"
+        _write(path)
+        with CaptureReader(path) as r:
+            assert len(r) == 100
+            assert r.baudrate == 115200
+            rec = r[5]
+            assert rec.ts_ns == 1050
+            assert rec.direction == TX
+            assert rec.slave_id == 3
+            assert rec.data == bytes([3, 0x03, 0x00, 5])
+            assert r[-1].ts_ns == 1990
+            assert [x.ts_ns for x in r][:3] == [1000, 1010, 1020]
+
+    def test_seek_and_select(self, tmp_path, backend):
+        path = tmp_path / "bus.nimcap"
+        _write(path)
+        with CaptureReader(path) as r:
+            assert r.seek_time(1055) == 6
+            assert r.seek_time(0) == 0
+            assert r.seek_time(10**9) == 100
+            hits = list(r.select(slave_id=2, start_ns=1100, end_ns=1200))
+            assert [int(i) for i in hits] == [10, 13, 16, 19]
+            assert all(rec.slave_id == 2 for rec in r.records(hits))
+            assert len(r.select(direction=RX)) == 0
+
+    def test_missing_index_rebuilt(self, tmp_path, backend):
+        path = tmp_path / "bus.nimcap"
+        _write(path, 20)
+        os.remove(index_path(path))
+        with CaptureReader(path) as r:
+            assert len(r) == 20
+            assert r[19].data[-1] == 19
+
+    def test_truncated_tail_ignored(self, tmp_path, backend):
+        """进程崩溃留下的残缺记录与超前索引项被忽略"""
+        path = tmp_path / "bus.nimcap"
+        _write(path, 20)
+        with open(path, "r+b") as f:
+            f.truncate(path.stat().st_size - 2)
+        with CaptureReader(path) as r:
+            assert len(r) == 19
+        os.remove(index_path(path))
+        with CaptureReader(path) as r:
+            assert len(r) == 19
+
+    def test_wall_time(self, tmp_path, backend):
+        path = tmp_path / "bus.nimcap"
+        _write(path, 1)
+        with CaptureReader(path) as r:
+            assert r.wall_time(r.start_ns + 2_000_000_000) == pytest.approx(
+                r.start_wall_ns / 1e9 + 2.0
+            )
+
+    def test_not_a_capture(self, tmp_path):
+        path = tmp_path / "junk.bin"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError):
+            CaptureReader(path)
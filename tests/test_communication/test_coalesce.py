@@ -0,0 +1,85 @@
+"""通讯层 coalesce.py 单元测试"""
+
+from nimotion.communication.coalesce import coalesce_reads, split_response
+from nimotion.models.types import FunctionCode, ModbusRequest, ModbusResponse
+
+# configure_and_start_homing 发出的 8 条读请求
+HOMING_READS = [
+    (0x002C, 2), (0x006B, 1), (0x0069, 2), (0x006C, 2),
+    (0x006E, 2), (0x005F, 2), (0x0061, 2), (0x0072, 1),
+]
+
+
+def _reads(spec, slave: int = 1, fc=FunctionCode.READ_HOLDING) -> list[ModbusRequest]:
+    return [ModbusRequest(slave, fc, addr, count) for addr, count in spec]
+
+
+class TestCoalesceReads:
+    def test_single_untouched(self):
+        req = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1)
+        blocks = coalesce_reads([req])
+        assert len(blocks) == 1
+        assert blocks[0].request is req
+        assert not blocks[0].merged
+
+    def test_homing_reads(self):
+        """回零配置的 8 次读取合并为 2 次块读"""
+        reqs = _reads(HOMING_READS)
+        blocks = coalesce_reads(reqs, max_gap=8)
+        assert [(b.request.address, b.request.count) for b in blocks] == [
+            (0x002C, 2), (0x005F, 0x0073 - 0x005F),
+        ]
+        assert sum(len(b.parts) for b in blocks) == 8
+
+    def test_zero_gap_only_adjacent(self):
+        reqs = _reads([(0x0010, 2), (0x0012, 2), (0x0015, 1)])
+        blocks = coalesce_reads(reqs, max_gap=0)
+        assert [(b.request.address, b.request.count) for b in blocks] == [
+            (0x0010, 4), (0x0015, 1),
+        ]
+
+    def test_overlapping(self):
+        reqs = _reads([(0x0017, 16), (0x001F, 1)])
+        blocks = coalesce_reads(reqs)
+        assert len(blocks) == 1
+        assert (blocks[0].request.address, blocks[0].request.count) == (0x0017, 16)
+
+    def test_respects_max_count(self):
+        reqs = _reads([(0, 100), (100, 30)])
+        blocks = coalesce_reads(reqs, max_gap=0)
+        assert len(blocks) == 2
+
+    def test_separate_slaves_and_codes(self):
+        reqs = (
+            _reads([(0x0010, 1)], slave=1)
+            + _reads([(0x0011, 1)], slave=2)
+            + _reads([(0x0012, 1)], slave=1, fc=FunctionCode.READ_INPUT)
+        )
+        assert len(coalesce_reads(reqs)) == 3
+
+    def test_parts_keep_submission_order(self):
+        reqs = _reads([(0x0061, 2), (0x005F, 2)])
+        blocks = coalesce_reads(reqs)
+        assert blocks[0].parts == reqs
+        assert blocks[0].request.address == 0x005F
+
+
+class TestSplitResponse:
+    def test_split_values(self):
+        block = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x005F, 4)
+        resp = ModbusResponse(
+            1, 0x03, bytes([0, 1, 0, 2, 0, 3, 0, 4]), values=[1, 2, 3, 4], raw_rx=b"rx"
+        )
+        part = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0061, 2)
+        out = split_response(block, resp, part)
+        assert out.values == [3, 4]
+        assert out.data == bytes([0, 3, 0, 4])
+        assert out.raw_rx == b"rx"
+        assert not out.is_error
+
+    def test_error_propagates(self):
+        block = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x005F, 4)
+        resp = ModbusResponse(1, 0x03, b"", is_error=True, error_code=-2)
+        part = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0061, 2)
+        out = split_response(block, resp, part)
+        assert out.is_error and out.error_code == -2
@@ -100,3 +100,47 @@ class TestVerify:
             bytes([0x01, 0x10, 0x00, 0x53, 0x00, 0x02, 0x04, 0x00, 0x00, 0x03, 0xE8]),
         ]:
             assert verify(append(test_data)) is True
+
+
+class TestTable:
+    def test_matches_bitwise(self):
+        """查表实现与逐位参考实现结果一致"""
+        import os
+
+        from nimotion.communication.crc16 import calculate_bitwise
+
+        for size in (0, 1, 7, 64, 255):
+            data = os.urandom(size)
+            assert calculate(data) == calculate_bitwise(data)
+
+    def test_accepts_bytearray_and_memoryview(self):
+        data = bytes([0x01, 0x03, 0x00, 0x00, 0x00, 0x01])
+        assert calculate(bytearray(data)) == 0x0A84
+        assert calculate(memoryview(data)) == 0x0A84
+
+
+class TestCrc16Incremental:
+    def test_chunked_equals_whole(self):
+        from nimotion.communication.crc16 import Crc16
+
+        data = bytes([0x01, 0x10, 0x00, 0x53, 0x00, 0x02, 0x04, 0x00, 0x00, 0x03, 0xE8])
+        crc = Crc16()
+        for i in range(0, len(data), 3):
+            crc.update(data[i:i + 3])
+        assert crc.value == calculate(data)
+
+    def test_valid_after_full_frame(self):
+        from nimotion.communication.crc16 import Crc16
+
+        frame = append(bytes([0x01, 0x03, 0x02, 0x00, 0x01]))
+        crc = Crc16(frame[:3])
+        assert not crc.valid
+        crc.update(frame[3:])
+        assert crc.valid
+
+    def test_reset(self):
+        from nimotion.communication.crc16 import Crc16
+
+        crc = Crc16(b"\x01\x02")
+        crc.reset()
+        assert crc.value == 0xFFFF
@@ -0,0 +1,94 @@
+"""设备自动发现测试"""
+
+import os
+
+import pytest
+
+from nimotion.communication.discovery import DiscoveredDevice, discover, scan_port
+from nimotion.communication.serial_port import SerialConfig
+from nimotion.simulator import DriveServer, SimulatedDrive
+
+
+class FakeBus:
+    """只在指定波特率与校验下应答的模拟串口"""
+
+    def __init__(self, drives, baudrate, parity):
+        self.drives = {d.slave_id: d for d in drives}
+        self.baudrate = baudrate
+        self.parity = parity
+        self.config = SerialConfig()
+        self.opened: list[tuple[int, str]] = []
+        self.waited = 0.0
+        self._rx = b""
+
+    def open(self, config):
+        self.config = config
+        self.opened.append((config.baudrate, config.parity))
+
+    def close(self):
+        pass
+
+    def flush_input(self):
+        self._rx = b""
+
+    def write(self, frame):
+        if (self.config.baudrate, self.config.parity) != (self.baudrate, self.parity):
+            self._rx = b"\xff\x00"  # 参数不符: 从站收到乱码，回送噪声
+            return len(frame)
+        drive = self.drives.get(frame[0])
+        self._rx = (drive.handle(frame) or b"") if drive else b""
+        return len(frame)
+
+    def read(self, size, timeout=None):
+        if len(self._rx) < size:
+            self.waited += timeout or 0
+        data, self._rx = self._rx[:size], self._rx[size:]
+        return data
+
+
+class TestScanPort:
+    def test_finds_combination_and_slaves(self):
+        drives = [SimulatedDrive(3), SimulatedDrive(7)]
+        for d in drives:
+            d._holding[0x0002] = 0  # 8E1
+        bus = FakeBus(drives, 19200, "E")
+        devices = scan_port(
+            "fake", probe_ids=range(1, 5), slave_ids=range(1, 11),
+            serial_factory=lambda: bus,
+        )
+        assert [(d.baudrate, d.data_format, d.slave_id) for d in devices] == [
+            (19200, "8E1", 3), (19200, "8E1", 7),
+        ]
+        assert devices[0].serial_number == drives[0].serial_number
+        assert devices[0].vendor == SimulatedDrive.VENDOR_ID
+        # 115200/9600 的四种格式都试过，19200 第二种格式命中后停止
+        assert bus.opened[-1] == (19200, "E")
+        assert len(bus.opened) == 10
+
+    def test_timeout_tightens_after_first_reply(self):
+        bus = FakeBus([SimulatedDrive(1)], 115200, "N")
+        scan_port("fake", probe_ids=[1], slave_ids=range(1, 101), serial_factory=lambda: bus)
+        # 99 个空地址，每个等待远小于默认 0.5s
+        assert bus.waited / 99 < 0.015
+
+    def test_nothing_found(self):
+        bus = FakeBus([], 115200, "N")
+        assert scan_port(
+            "fake", baudrates=[115200], probe_ids=[1], serial_factory=lambda: bus,
+        ) == []
+
+    def test_device_config(self):
+        device = DiscoveredDevice("/dev/ttyUSB0", 38400, "8N2", 4, 0x1234)
+        config = device.config()
+        assert (config.baudrate, config.parity, config.stopbits) == (38400, "N", 2)
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="需要 pty")
+def test_discover_ports_in_parallel():
+    with DriveServer([SimulatedDrive(1), SimulatedDrive(2)]) as a, \
+            DriveServer([SimulatedDrive(5)]) as b:
+        devices = discover([a.port, b.port], slave_ids=range(1, 8), probe_ids=range(1, 8))
+    assert [(d.port, d.slave_id) for d in devices] == sorted(
+        [(a.port, 1), (a.port, 2), (b.port, 5)]
+    )
+    assert all(d.baudrate == 115200 and d.data_format == "8N1" for d in devices)
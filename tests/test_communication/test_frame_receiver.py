@@ -0,0 +1,93 @@
+"""通讯层 frame_receiver.py 单元测试"""
+
+from nimotion.communication import crc16
+from nimotion.communication.frame_receiver import FrameReceiver, RxState
+
+
+def _feed_all(rx: FrameReceiver, frame: bytes) -> None:
+    """模拟通讯线程: 每次按 needed 读取"""
+    pos = 0
+    while not rx.done and pos < len(frame):
+        n = rx.needed
+        rx.feed(frame[pos:pos + n])
+        pos += n
+
+
+class TestFrameReceiver:
+    def test_initial_needs_header(self):
+        rx = FrameReceiver()
+        assert rx.state == RxState.HEADER
+        assert rx.needed == 3
+
+    def test_read_response(self):
+        """读响应: 按字节数字段确定帧长"""
+        frame = crc16.append(bytes([0x01, 0x03, 0x04, 0x00, 0x0A, 0x00, 0x14]))
+        rx = FrameReceiver()
+        rx.feed(frame[:3])
+        assert rx.state == RxState.BODY
+        assert rx.needed == len(frame) - 3
+        _feed_all(rx, frame[3:])
+        assert rx.done
+        assert rx.frame == frame
+        assert rx.crc_ok
+
+    def test_exception_response_is_five_bytes(self):
+        """异常响应 5 字节即完成，不等待读请求的期望长度"""
+        frame = crc16.append(bytes([0x01, 0x83, 0x02]))
+        rx = FrameReceiver()
+        _feed_all(rx, frame)
+        assert rx.done
+        assert rx.received == 5
+        assert rx.crc_ok
+
+    def test_write_response(self):
+        frame = crc16.append(bytes([0x01, 0x06, 0x00, 0x51, 0x00, 0x06]))
+        rx = FrameReceiver()
+        rx.feed(frame[:1])
+        rx.feed(frame[1:3])
+        assert rx.needed == 5
+        rx.feed(frame[3:])
+        assert rx.done and rx.crc_ok
+
+    def test_crc_error(self):
+        frame = bytearray(crc16.append(bytes([0x01, 0x06, 0x00, 0x51, 0x00, 0x06])))
+        frame[-1] ^= 0xFF
+        rx = FrameReceiver()
+        _feed_all(rx, bytes(frame))
+        assert rx.done
+        assert not rx.crc_ok
+
+    def test_truncated_frame_not_done(self):
+        """静默断帧（长度不足）时不视为完成"""
+        frame = crc16.append(bytes([0x01, 0x04, 0x20] + [0] * 32))
+        rx = FrameReceiver()
+        rx.feed(frame[:10])
+        assert not rx.done
+        assert not rx.crc_ok
+
+    def test_reset(self):
+        frame = crc16.append(bytes([0x01, 0x83, 0x02]))
+        rx = FrameReceiver()
+        _feed_all(rx, frame)
+        rx.reset()
+        assert rx.state == RxState.HEADER
+        assert rx.received == 0
+        assert rx.needed == 3
+
+    def test_expected_echo_skips_crc(self):
+        frame = crc16.append(bytes([0x01, 0x06, 0x00, 0x51, 0x00, 0x0F]))
+        rx = FrameReceiver()
+        rx.reset(frame)
+        _feed_all(rx, frame)
+        assert rx.done and rx.crc_ok
+
+    def test_expected_mismatch_verifies_crc(self):
+        expect = crc16.append(bytes([0x01, 0x06, 0x00, 0x51, 0x00, 0x0F]))
+        other = crc16.append(bytes([0x01, 0x06, 0x00, 0x51, 0x00, 0x07]))
+        rx = FrameReceiver()
+        rx.reset(expect)
+        _feed_all(rx, other)
+        assert rx.crc_ok
+        rx.reset(expect)
+        _feed_all(rx, other[:-1] + b"\x00")
+        assert not rx.crc_ok
@@ -2,7 +2,7 @@
 
 import pytest
 from nimotion.communication import crc16
-from nimotion.communication.modbus_rtu import ModbusRTU
+from nimotion.communication.modbus_rtu import ModbusRTU, decode_registers
 from nimotion.models.types import FunctionCode, ModbusRequest
 
 
@@ -247,3 +247,202 @@ class TestSplit32bit:
             high, low = ModbusRTU.split_32bit(val)
             signed = val < 0
             assert ModbusRTU.combine_32bit(high, low, signed=signed) == val
+
+
+class TestBuildFrameInto:
+    def test_matches_build_frame(self):
+        """写入缓冲区的结果与 build_frame 一致"""
+        buf = bytearray(ModbusRTU.MAX_FRAME_SIZE)
+        for req in [
+            ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16),
+            ModbusRequest(2, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x000F]),
+            ModbusRequest(1, FunctionCode.WRITE_MULTIPLE, 0x0053, 2, [0xFFFF, 0xFC18]),
+        ]:
+            n = ModbusRTU.build_frame_into(buf, req)
+            assert bytes(buf[:n]) == ModbusRTU.build_frame(req)
+            assert crc16.verify(bytes(buf[:n]))
+
+    def test_large_block_write(self):
+        """123 个寄存器的整块写（最大帧长 255）"""
+        values = list(range(123))
+        req = ModbusRequest(1, FunctionCode.WRITE_MULTIPLE, 0x0000, 123, values)
+        buf = bytearray(ModbusRTU.MAX_FRAME_SIZE)
+        n = ModbusRTU.build_frame_into(buf, req)
+        assert n == 255
+        assert buf[6] == 246
+        assert buf[7:9] == b"\x00\x00"
+        assert buf[251:253] == b"\x00\x7A"
+
+    def test_values_masked_to_16bit(self):
+        """超出 16 位的值按低 16 位编码"""
+        req = ModbusRequest(1, FunctionCode.WRITE_MULTIPLE, 0x0053, 2, [0x1FFFF, -1])
+        frame = ModbusRTU.build_frame(req)
+        assert frame[7:11] == b"\xFF\xFF\xFF\xFF"
+
+    def test_buffer_too_small(self):
+        req = ModbusRequest(1, FunctionCode.WRITE_MULTIPLE, 0x0000, 10, [0] * 10)
+        with pytest.raises(ValueError, match="缓冲区不足"):
+            ModbusRTU.build_frame_into(bytearray(12), req)
+
+
+class TestFrameLength:
+    def test_read_response(self):
+        assert ModbusRTU.frame_length(bytes([0x01, 0x04, 0x20])) == 37
+
+    def test_exception(self):
+        assert ModbusRTU.frame_length(bytes([0x01, 0x86, 0x06])) == 5
+
+    def test_write(self):
+        assert ModbusRTU.frame_length(bytes([0x01, 0x06, 0x00])) == 8
+        assert ModbusRTU.frame_length(bytes([0x01, 0x10, 0x00])) == 8
+
+    def test_unknown(self):
+        assert ModbusRTU.frame_length(bytes([0x01, 0x2B, 0x00])) == 0
+
+
+class TestParseResponseCrcHint:
+    def test_crc_ok_skips_verify(self):
+        """接收时已校验的帧不再重复计算 CRC"""
+        raw = crc16.append(bytes([0x01, 0x03, 0x02, 0x00, 0x01]))
+        req = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0000, 1)
+        resp = ModbusRTU.parse_response(raw, req, crc_ok=True)
+        assert resp.values == [1]
+
+    def test_crc_failed_hint(self):
+        raw = crc16.append(bytes([0x01, 0x03, 0x02, 0x00, 0x01]))
+        req = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0000, 1)
+        resp = ModbusRTU.parse_response(raw, req, crc_ok=False)
+        assert resp.is_error and resp.error_code == -1
+
+
+class TestParseRequest:
+    @pytest.mark.parametrize("request_", [
+        ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 2),
+        ModbusRequest(2, FunctionCode.READ_INPUT, 0x0017, 16),
+        ModbusRequest(3, FunctionCode.WRITE_SINGLE, 0x0051, 1, [0x000F]),
+        ModbusRequest(4, FunctionCode.WRITE_MULTIPLE, 0x005B, 2, [0x0001, 0xFFFF]),
+    ])
+    def test_roundtrip(self, request_):
+        assert ModbusRTU.parse_request(ModbusRTU.build_frame(request_)) == request_
+
+    def test_bad_crc(self):
+        frame = bytearray(ModbusRTU.build_frame(ModbusRequest(1, FunctionCode.READ_HOLDING, 0, 1)))
+        frame[-1] ^= 0xFF
+        assert ModbusRTU.parse_request(bytes(frame)) is None
+
+    def test_inconsistent_length(self):
+        assert ModbusRTU.parse_request(crc16.append(bytes([1, 0x10, 0, 0, 0, 2, 4, 0, 1]))) is None
+        assert ModbusRTU.parse_request(crc16.append(bytes([1, 0x2B, 0, 0, 0, 1]))) is None
+
+
+class TestEncodeCache:
+    def test_hit_returns_same_frame(self):
+        mb = ModbusRTU()
+        req = ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16)
+        first = mb.encode(req)
+        again = mb.encode(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+        assert again is first
+        assert first.frame == ModbusRTU.build_frame(req)
+        assert mb.cache_info() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_key_includes_values(self):
+        mb = ModbusRTU()
+        a = mb.encode(ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x06]))
+        b = mb.encode(ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x07]))
+        assert a.frame != b.frame
+        assert mb.cache_misses == 2
+
+    def test_lru_eviction(self):
+        mb = ModbusRTU(cache_size=2)
+        reqs = [ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[v]) for v in range(3)]
+        mb.encode(reqs[0])
+        mb.encode(reqs[1])
+        mb.encode(reqs[0])  # 刷新为最近使用
+        mb.encode(reqs[2])  # 挤掉 reqs[1]
+        assert mb.cache_info()["size"] == 2
+        mb.encode(reqs[0])
+        assert mb.cache_hits == 2
+        mb.encode(reqs[1])
+        assert mb.cache_misses == 4
+
+    def test_disabled(self):
+        mb = ModbusRTU(cache_size=0)
+        req = ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16)
+        assert mb.encode(req) == mb.encode(req)
+        assert mb.cache_info() == {"hits": 0, "misses": 2, "size": 0}
+
+    def test_expected_shapes(self):
+        read = ModbusRTU.encode_uncached(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+        assert (read.expected_length, read.prefix, read.echo) == (37, b"\x01\x04\x20", None)
+        single = ModbusRTU.encode_uncached(
+            ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x0F])
+        )
+        assert single.echo == single.frame
+        multi = ModbusRTU.encode_uncached(
+            ModbusRequest(1, FunctionCode.WRITE_MULTIPLE, 0x0053, count=2, values=[0, 1000])
+        )
+        assert multi.expected_length == 8
+        assert multi.echo == crc16.append(multi.frame[:6])
+
+
+class TestParseExpected:
+    def test_read_fast_path(self):
+        req = ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 2)
+        raw = crc16.append(bytes([0x01, 0x04, 0x04, 0x00, 0x0A, 0xFF, 0xFF]))
+        encoded = ModbusRTU.encode_uncached(req)
+        resp = ModbusRTU.parse_expected(raw, req, encoded)
+        assert not resp.is_error
+        assert resp.values == [0x000A, 0xFFFF]
+        assert resp.data == raw[3:7]
+        ref = ModbusRTU.parse_response(raw, req)
+        assert (resp.slave_id, resp.function_code, resp.data, resp.values) == (
+            ref.slave_id, ref.function_code, ref.data, ref.values,
+        )
+
+    def test_echo_fast_path(self):
+        req = ModbusRequest(1, FunctionCode.WRITE_MULTIPLE, 0x0053, count=2, values=[0, 1000])
+        encoded = ModbusRTU.encode_uncached(req)
+        resp = ModbusRTU.parse_expected(encoded.echo, req, encoded)
+        assert not resp.is_error
+        assert resp.values == [2]
+
+    @pytest.mark.parametrize("raw, code", [
+        (crc16.append(bytes([0x01, 0x84, 0x02])), 2),  # 异常响应
+        (bytes([0x01, 0x04, 0x04, 0x00, 0x0A, 0xFF, 0xFF, 0x00, 0x00]), -1),  # CRC 错误
+    ])
+    def test_fallback(self, raw, code):
+        req = ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 2)
+        resp = ModbusRTU.parse_expected(raw, req, ModbusRTU.encode_uncached(req))
+        assert resp.is_error and resp.error_code == code
+
+    def test_echo_mismatch_falls_back(self):
+        req = ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x0F])
+        raw = crc16.append(bytes([0x01, 0x06, 0x00, 0x51, 0x00, 0x07]))
+        resp = ModbusRTU.parse_expected(raw, req, ModbusRTU.encode_uncached(req))
+        assert not resp.is_error
+        assert resp.values == [0x07]
+
+
+class TestDecodeRegisters:
+    @pytest.mark.parametrize("count", [0, 1, 16, 63, 64, 125])
+    def test_matches_byte_loop(self, count):
+        data = bytes((i * 37) & 0xFF for i in range(count * 2))
+        expected = [(data[i] << 8) | data[i + 1] for i in range(0, count * 2, 2)]
+        assert decode_registers(data) == expected
+
+    def test_offset_and_count(self):
+        raw = bytes([0x01, 0x03, 0x04, 0x12, 0x34, 0xAB, 0xCD, 0x00, 0x00])
+        assert decode_registers(raw, 2, 3) == [0x1234, 0xABCD]
+
+    def test_large_read_response(self):
+        req = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0000, 100)
+        values = [(i * 997) & 0xFFFF for i in range(100)]
+        body = b"".join(v.to_bytes(2, "big") for v in values)
+        raw = crc16.append(bytes([0x01, 0x03, 200]) + body)
+        assert ModbusRTU.parse_response(raw, req).values == values
+        assert ModbusRTU.parse_expected(raw, req, ModbusRTU.encode_uncached(req)).values == values
+
+    def test_odd_byte_count_ignores_trailing_byte(self):
+        req = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0000, 1)
+        raw = crc16.append(bytes([0x01, 0x03, 0x03, 0x00, 0x05, 0x07]))
+        assert ModbusRTU.parse_response(raw, req).values == [5]
@@ -0,0 +1,73 @@
+"""抓包回放测试"""
+
+import os
+
+import pytest
+
+from nimotion.communication import crc16
+from nimotion.communication.capture import RX, TX, CaptureReader, CaptureWriter
+from nimotion.communication.modbus_rtu import ModbusRTU
+from nimotion.communication.replay import Replayer, load_session
+from nimotion.communication.serial_port import SerialConfig
+from nimotion.models.types import FunctionCode, ModbusRequest
+from nimotion.simulator import DriveServer, SimulatedDrive
+
+
+def _frame(slave, address, count=1):
+    return ModbusRTU.build_frame(ModbusRequest(slave, FunctionCode.READ_HOLDING, address, count))
+
+
+class TestLoadSession:
+    def test_pairs_requests_with_responses(self, tmp_path):
+        path = tmp_path / "s.nimcap"
+        with CaptureWriter(path) as w:
+            w.write(TX, _frame(1, 0x001A), 1_000)
+            w.write(RX, crc16.append(bytes([1, 0x03, 0x02, 0, 7])), 1_400)
+            w.write(TX, b"AT\r\n", 2_000)  # 串口调试数据，跳过
+            w.write(TX, _frame(2, 0x001A), 3_000)  # 无应答
+            w.write(TX, _frame(1, 0x0020, 2), 5_000)
+            w.write(RX, crc16.append(bytes([1, 0x83, 0x02])), 5_300)
+        with CaptureReader(path) as r:
+            items = list(load_session(r))
+            assert [i.offset_ns for i in items] == [0, 2_000, 4_000]
+            assert [i.request.slave_id for i in items] == [1, 2, 1]
+            assert items[0].captured_latency_ns == 400
+            assert items[1].captured_rx == b""
+            assert items[2].captured_rx[1] == 0x83
+            assert [i.request.address for i in load_session(r, slave_id=1)] == [0x001A, 0x0020]
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="需要 pty")
+class TestReplay:
+    def test_capture_then_replay(self, qtbot, tmp_path):
+        from nimotion.communication.worker import CommWorker
+
+        path = tmp_path / "s.nimcap"
+        requests = [
+            ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16),
+            ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, 1, [0x0006]),
+            ModbusRequest(1, FunctionCode.READ_HOLDING, 0xFFF0, 1),  # 非法地址 → 异常
+            ModbusRequest(9, FunctionCode.READ_HOLDING, 0x001A, 1),  # 无此从站 → 超时
+        ]
+        worker = CommWorker()
+        with DriveServer([SimulatedDrive(1)]) as server:
+            worker.connect_port(SerialConfig(port=server.port, timeout=0.05))
+            worker.start_capture(str(path))
+            for req in requests:
+                worker.send_modbus(req).result(2)
+            worker.stop_capture()
+            worker.disconnect_port()
+
+        with DriveServer([SimulatedDrive(1)]) as server, CaptureReader(path) as r:
+            worker.connect_port(SerialConfig(port=server.port, timeout=0.05))
+            try:
+                report = Replayer(worker, speed=None).run(load_session(r))
+            finally:
+                worker.disconnect_port()
+        assert report.requests == 4
+        assert report.ok == 2
+        assert report.errors == {0x02: 1, -2: 1}
+        assert report.mismatches == 0
+        assert report.captured.count == 3
+        assert report.response.count == 3
+        assert report.throughput > 0
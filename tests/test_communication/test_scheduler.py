@@ -0,0 +1,201 @@
+"""通讯层 scheduler.py 单元测试"""
+
+from nimotion.communication.scheduler import EXPIRED, OVERFLOW, RequestScheduler
+from nimotion.models.types import FunctionCode, ModbusRequest, Priority
+
+
+def _read(slave: int = 1) -> ModbusRequest:
+    return ModbusRequest(slave, FunctionCode.READ_INPUT, 0x0017, 16)
+
+
+def _write(value: int, slave: int = 1, priority: Priority | None = None) -> ModbusRequest:
+    return ModbusRequest(
+        slave, FunctionCode.WRITE_SINGLE, 0x0051, values=[value], priority=priority
+    )
+
+
+class TestOrdering:
+    def test_empty(self):
+        sched = RequestScheduler()
+        assert not sched
+        assert sched.pop(0.0) is None
+
+    def test_fifo_within_lane(self):
+        sched = RequestScheduler()
+        reqs = [_write(v) for v in (0x0006, 0x0007, 0x000F)]
+        for r in reqs:
+            sched.push(r, 0.0)
+        assert [sched.pop(0.0) for _ in reqs] == reqs
+
+    def test_requeue_at_front(self):
+        sched = RequestScheduler()
+        reqs = [_read() for _ in range(3)]
+        for r in reqs:
+            sched.push(r, 0.0)
+        first, second = sched.pop(0.0), sched.pop(0.0)
+        sched.requeue([first, second], 0.0)
+        assert [sched.pop(0.0) for _ in reqs] == reqs
+
+    def test_motion_before_background(self):
+        sched = RequestScheduler()
+        poll = _read()
+        move = _write(0x000F)
+        sched.push(poll, 0.0)
+        sched.push(move, 0.0)
+        assert sched.pop(0.0) is move
+        assert sched.pop(0.0) is poll
+
+    def test_safety_goes_next_under_load(self):
+        """大量轮询与运动命令排队时，急停仍是下一帧"""
+        sched = RequestScheduler()
+        for _ in range(100):
+            sched.push(_read(), 0.0)
+        for v in (0x0000, 0x0006, 0x0007, 0x000F, 0x001F):
+            sched.push(_write(v), 0.0)
+        stop = _write(0x0002, priority=Priority.SAFETY)
+        sched.push(stop, 0.0)
+        assert sched.pop(0.0) is stop
+
+
+class TestSafetyCancel:
+    def test_cancels_pending_motion_same_slave(self):
+        sched = RequestScheduler()
+        moves = [_write(v) for v in (0x0006, 0x0007, 0x001F)]
+        other = _write(0x0006, slave=2)
+        for r in moves:
+            sched.push(r, 0.0)
+        sched.push(other, 0.0)
+        poll = _read()
+        sched.push(poll, 0.0)
+        dropped = sched.push(_write(0x0002, priority=Priority.SAFETY), 0.0)
+        assert dropped == moves
+        assert sched.depth(Priority.MOTION) == 1  # 其它从站不受影响
+        assert sched.depth(Priority.BACKGROUND) == 1  # 读请求保留
+
+    def test_later_motion_not_cancelled(self):
+        """急停之后提交的运动命令正常排队"""
+        sched = RequestScheduler()
+        stop = _write(0x0000, priority=Priority.SAFETY)
+        sched.push(stop, 0.0)
+        after = _write(0x0006)
+        assert sched.push(after, 0.0) == []
+        assert sched.pop(0.0) is stop
+        assert sched.pop(0.0) is after
+
+
+class TestStats:
+    def test_depth_and_wait(self):
+        sched = RequestScheduler()
+        sched.push(_read(), 1.0)
+        sched.push(_read(), 1.5)
+        snap = sched.snapshot()
+        assert snap["background"]["depth"] == 2
+        sched.pop(2.0)
+        sched.pop(2.0)
+        snap = sched.snapshot()
+        assert snap["background"]["sent"] == 2
+        assert snap["background"]["max_wait_ms"] == 1000.0
+        assert snap["background"]["avg_wait_ms"] == 750.0
+        assert snap["safety"]["sent"] == 0
+
+    def test_dropped_counted(self):
+        sched = RequestScheduler()
+        sched.push(_write(0x0006), 0.0)
+        sched.push(_write(0x0002, priority=Priority.SAFETY), 0.0)
+        assert sched.snapshot()["motion"]["dropped"] == 1
+
+
+class TestPopReads:
+    def test_takes_mergeable_only(self):
+        sched = RequestScheduler()
+        near = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0061, 2)
+        far = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0100, 1)
+        other = ModbusRequest(2, FunctionCode.READ_HOLDING, 0x0061, 2)
+        first = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x005F, 2)
+        for r in (first, near, far, other):
+            sched.push(r, 0.0)
+        popped = sched.pop(0.0)
+        block = sched.pop_reads(popped, 0.0, max_gap=8)
+        assert block.parts == [first, near]
+        assert (block.request.address, block.request.count) == (0x005F, 4)
+        assert sched.depth(Priority.BACKGROUND) == 2
+        assert sched.snapshot()["background"]["sent"] == 2
+
+    def test_nothing_to_merge(self):
+        sched = RequestScheduler()
+        first = _read()
+        sched.push(first, 0.0)
+        block = sched.pop_reads(sched.pop(0.0), 0.0, max_gap=8)
+        assert not block.merged
+
+
+class TestBackpressure:
+    def test_background_evicts_oldest(self):
+        sched = RequestScheduler({Priority.BACKGROUND: 2})
+        reqs = [_read(slave) for slave in (1, 2, 3)]
+        for r in reqs:
+            sched.push(r, 0.0)
+        assert sched.depth(Priority.BACKGROUND) == 2
+        assert sched.take_discarded() == [(reqs[0], OVERFLOW)]
+        assert sched.pop(0.0) is reqs[1]
+        assert sched.snapshot()["background"]["overflow"] == 1
+
+    def test_motion_rejects_new(self):
+        sched = RequestScheduler({Priority.MOTION: 2})
+        reqs = [_write(v) for v in (0x0006, 0x0007, 0x000F)]
+        for r in reqs:
+            sched.push(r, 0.0)
+        assert sched.take_discarded() == [(reqs[2], OVERFLOW)]
+        assert [sched.pop(0.0), sched.pop(0.0)] == reqs[:2]
+
+    def test_safety_unbounded(self):
+        sched = RequestScheduler()
+        for _ in range(1000):
+            sched.push(_write(0x0002, priority=Priority.SAFETY), 0.0)
+        assert sched.depth(Priority.SAFETY) == 1000
+        assert sched.take_discarded() == []
+
+    def test_full_lane_purges_expired_first(self):
+        """通道满时先清掉过期请求，新请求不必挤掉有效请求"""
+        sched = RequestScheduler({Priority.BACKGROUND: 2})
+        stale = ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16, deadline=1.0)
+        live = _read(2)
+        sched.push(stale, 0.0)
+        sched.push(live, 0.0)
+        new = _read(3)
+        sched.push(new, 2.0)
+        assert sched.take_discarded() == [(stale, EXPIRED)]
+        assert [sched.pop(2.0), sched.pop(2.0)] == [live, new]
+        snap = sched.snapshot()["background"]
+        assert (snap["expired"], snap["overflow"]) == (1, 0)
+
+
+class TestDeadline:
+    def test_expired_dropped_on_pop(self):
+        sched = RequestScheduler()
+        stale = ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16, deadline=1.0)
+        fresh = ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16, deadline=5.0)
+        sched.push(stale, 0.0)
+        sched.push(fresh, 0.0)
+        assert sched.pop(2.0) is fresh
+        assert sched.take_discarded() == [(stale, EXPIRED)]
+        assert sched.take_discarded() == []
+        assert sched.snapshot()["background"]["expired"] == 1
+        assert sched.snapshot()["background"]["sent"] == 1
+
+    def test_no_deadline_never_expires(self):
+        sched = RequestScheduler()
+        r = _read()
+        sched.push(r, 0.0)
+        assert sched.pop(1e9) is r
+
+    def test_pop_reads_skips_expired(self):
+        sched = RequestScheduler()
+        first = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x005F, 2)
+        stale = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0061, 2, deadline=1.0)
+        sched.push(first, 0.0)
+        sched.push(stale, 0.0)
+        block = sched.pop_reads(sched.pop(2.0), 2.0, max_gap=8)
+        assert not block.merged
+        assert sched.pop(2.0) is None
+        assert sched.take_discarded() == [(stale, EXPIRED)]
@@ -121,3 +121,40 @@ class TestSerialPort:
 
         ports = SerialPort.list_ports()
         assert ports == ["/dev/ttyUSB0", "/dev/ttyUSB1"]
+
+
+class TestTiming:
+    def test_char_time(self):
+        from nimotion.communication.serial_port import char_time
+
+        assert char_time(9600) == pytest.approx(11 / 9600)
+
+    def test_silent_interval_low_baud(self):
+        """≤19200 时 t3.5 = 3.5 个字符时间"""
+        from nimotion.communication.serial_port import silent_interval
+
+        assert silent_interval(9600) == pytest.approx(3.5 * 11 / 9600)
+
+    def test_silent_interval_high_baud(self):
+        """>19200 时固定 1.75ms"""
+        from nimotion.communication.serial_port import silent_interval
+
+        assert silent_interval(115200) == pytest.approx(0.00175)
+
+
+class TestReadTimeout:
+    @patch("nimotion.communication.serial_port.serial.Serial")
+    def test_per_call_timeout(self, mock_serial_cls):
+        """单次读取可覆盖超时，相同值不重复设置"""
+        mock_instance = MagicMock()
+        mock_instance.is_open = True
+        mock_instance.read.return_value = b"\x01"
+        mock_serial_cls.return_value = mock_instance
+
+        sp = SerialPort()
+        sp.open(SerialConfig(port="/dev/ttyUSB0"))
+        sp.read(1, 0.02)
+        assert mock_instance.timeout == 0.02
+        mock_instance.timeout = None
+        sp.read(1, 0.02)
+        assert mock_instance.timeout is None  # 未重复设置
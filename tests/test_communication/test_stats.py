@@ -0,0 +1,70 @@
+"""延迟直方图测试"""
+
+import random
+
+import pytest
+
+from nimotion.communication.stats import LatencyHistogram, _index, _upper
+
+
+class TestBuckets:
+    def test_index_monotonic_and_contiguous(self):
+        prev = -1
+        for us in range(0, 300_000, 7):
+            idx = _index(us)
+            assert idx in (prev, prev + 1) or idx > prev
+            assert _upper(idx) >= us
+            prev = idx
+
+    def test_relative_error(self):
+        for us in (70, 999, 12_345, 1_000_000, 50_000_000):
+            assert (_upper(_index(us)) - us) / us < 0.035
+
+
+class TestLatencyHistogram:
+    def test_empty(self):
+        h = LatencyHistogram()
+        assert h.count == 0
+        assert h.percentile(99) == 0.0
+        assert h.mean == 0.0
+
+    def test_percentiles(self):
+        h = LatencyHistogram()
+        for ms in range(1, 101):
+            h.record(ms / 1000)
+        assert h.count == 100
+        assert h.min == pytest.approx(0.001)
+        assert h.max == pytest.approx(0.100)
+        assert h.percentile(50) == pytest.approx(0.050, rel=0.035)
+        assert h.percentile(99) == pytest.approx(0.099, rel=0.035)
+        assert h.percentile(100) == pytest.approx(0.100)
+        assert h.mean == pytest.approx(0.0505, rel=0.01)
+
+    def test_matches_sorted_samples(self):
+        rng = random.Random(1)
+        samples = [rng.lognormvariate(-6, 0.5) for _ in range(5000)]
+        h = LatencyHistogram()
+        for s in samples:
+            h.record(s)
+        exact = sorted(samples)[int(len(samples) * 0.99) - 1]
+        assert h.percentile(99) == pytest.approx(exact, rel=0.04)
+
+    def test_decay_and_merge(self):
+        a, b = LatencyHistogram(), LatencyHistogram()
+        for _ in range(10):
+            a.record(0.001)
+            b.record(0.010)
+        a.merge(b)
+        assert a.count == 20
+        assert a.max == pytest.approx(0.010)
+        a.decay()
+        assert a.count == 10
+        a.reset()
+        assert a.count == 0
+
+    def test_snapshot_ms(self):
+        h = LatencyHistogram()
+        h.record(0.004)
+        snap = h.snapshot()
+        assert snap["count"] == 1
+        assert snap["p99_ms"] == pytest.approx(4.0, rel=0.035)
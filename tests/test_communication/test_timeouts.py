@@ -0,0 +1,64 @@
+"""自适应响应超时测试"""
+
+import pytest
+
+from nimotion.communication.timeouts import AdaptiveTimeout
+from nimotion.models.types import FunctionCode
+
+
+def _learn(t: AdaptiveTimeout, slave=1, fc=FunctionCode.READ_INPUT, latency=0.004, n=50):
+    for _ in range(n):
+        t.record(slave, fc, latency)
+
+
+class TestAdaptiveTimeout:
+    def test_default_until_enough_samples(self):
+        t = AdaptiveTimeout()
+        _learn(t, n=AdaptiveTimeout.MIN_SAMPLES - 1)
+        assert t.timeout_for(1, FunctionCode.READ_INPUT, 0.5) == 0.5
+
+    def test_learned(self):
+        t = AdaptiveTimeout()
+        _learn(t, latency=0.010)
+        timeout = t.timeout_for(1, FunctionCode.READ_INPUT, 0.5)
+        assert timeout == pytest.approx(0.010 * 2 + 0.010, rel=0.05)
+
+    def test_floor_and_ceiling(self):
+        t = AdaptiveTimeout()
+        _learn(t, latency=0.0001)
+        assert t.timeout_for(1, FunctionCode.READ_INPUT, 0.5) == AdaptiveTimeout.FLOOR
+        _learn(t, slave=2, latency=1.0)
+        assert t.timeout_for(2, FunctionCode.READ_INPUT, 0.5) == 0.5
+
+    def test_per_function_code(self):
+        t = AdaptiveTimeout()
+        _learn(t, fc=FunctionCode.READ_INPUT, latency=0.002)
+        _learn(t, fc=FunctionCode.WRITE_MULTIPLE, latency=0.030)
+        assert t.timeout_for(1, FunctionCode.READ_INPUT, 0.5) < 0.03
+        assert t.timeout_for(1, FunctionCode.WRITE_MULTIPLE, 0.5) > 0.06
+
+    def test_unknown_slave_uses_port_stats(self):
+        """新从站（或掉线从站）沿用同功能码的全端口统计，而不是 0.5s"""
+        t = AdaptiveTimeout()
+        _learn(t, slave=1)
+        assert t.timeout_for(7, FunctionCode.READ_INPUT, 0.5) < 0.05
+
+    def test_backoff_after_timeout(self):
+        t = AdaptiveTimeout()
+        _learn(t, latency=0.010)
+        base = t.timeout_for(1, FunctionCode.READ_INPUT, 0.5)
+        t.on_timeout(1, FunctionCode.READ_INPUT)
+        assert t.timeout_for(1, FunctionCode.READ_INPUT, 0.5) == pytest.approx(base * 2)
+        t.record(1, FunctionCode.READ_INPUT, 0.010)
+        assert t.timeout_for(1, FunctionCode.READ_INPUT, 0.5) == pytest.approx(base, rel=0.05)
+
+    def test_backoff_capped_for_dead_slave(self):
+        """掉线从站连续超时，等待时间停在估计值的 MAX_BACKOFF 倍，不回到默认 0.5s"""
+        t = AdaptiveTimeout()
+        _learn(t, latency=0.010)
+        base = t.timeout_for(1, FunctionCode.READ_INPUT, 0.5)
+        for _ in range(10):
+            t.on_timeout(1, FunctionCode.READ_INPUT)
+        capped = t.timeout_for(1, FunctionCode.READ_INPUT, 0.5)
+        assert capped == pytest.approx(base * AdaptiveTimeout.MAX_BACKOFF)
+        assert capped < 0.5
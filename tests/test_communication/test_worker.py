@@ -0,0 +1,600 @@
+"""通讯层 worker.py 单元测试（用模拟串口，不启动线程）"""
+
+import os
+import time
+
+import pytest
+from PyQt5.QtCore import Qt
+
+from nimotion.communication import crc16
+from nimotion.communication.serial_port import SerialConfig
+from nimotion.models.types import FunctionCode, ModbusRequest, Priority
+
+
+class FakeSerialPort:
+    """
+    模拟串口：write 后把预置应答放入接收缓冲；
+    read 在数据不足时按 timeout 计时返回（模拟 pyserial 行为，但不真正睡眠）。
+    """
+
+    def __init__(self, config: SerialConfig | None = None) -> None:
+        self.config = config or SerialConfig(port="fake")
+        self.is_open = True
+        self.replies: list[bytes] = []
+        self.written: list[bytes] = []
+        self.waited = 0.0  # 累计因数据不足而"等待"的超时时长
+        self._rx = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self.written.append(bytes(data))
+        if self.replies:
+            self._rx += self.replies.pop(0)
+        return len(data)
+
+    def read(self, size: int, timeout: float | None = None) -> bytes:
+        if len(self._rx) < size:
+            self.waited += timeout if timeout is not None else self.config.timeout
+        data = bytes(self._rx[:size])
+        del self._rx[:size]
+        return data
+
+    def read_all(self) -> bytes:
+        data = bytes(self._rx)
+        self._rx.clear()
+        return data
+
+    def flush_input(self) -> None:
+        self._rx.clear()
+
+    def close(self) -> None:
+        self.is_open = False
+
+
+@pytest.fixture
+def worker(qtbot):
+    from nimotion.communication.worker import CommWorker
+
+    w = CommWorker()
+    w._serial = FakeSerialPort()
+    return w
+
+
+def _collect(worker) -> list:
+    responses: list = []
+    worker.response_received.connect(responses.append)
+    return responses
+
+
+class TestReceive:
+    def test_normal_read(self, worker):
+        responses = _collect(worker)
+        worker._serial.replies.append(crc16.append(bytes([0x01, 0x03, 0x02, 0x00, 0x07])))
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1))
+        assert responses[0].values == [7]
+        assert not responses[0].is_error
+        assert worker._serial.waited == 0
+
+    def test_exception_does_not_wait_timeout(self, worker):
+        """5 字节异常响应按帧长完成，不等待读超时"""
+        responses = _collect(worker)
+        worker._serial.replies.append(crc16.append(bytes([0x01, 0x83, 0x02])))
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+        assert responses[0].is_error
+        assert responses[0].error_code == 0x02
+        assert worker._serial.waited == 0
+
+    def test_timeout(self, worker):
+        responses = _collect(worker)
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1))
+        assert responses[0].error_code == -2
+
+    def test_truncated_frame_ends_on_silence(self, worker):
+        """帧不完整时在静默间隔后结束，而不是整段读超时"""
+        responses = _collect(worker)
+        full = crc16.append(bytes([0x01, 0x04, 0x04, 0x00, 0x01, 0x00, 0x02]))
+        worker._serial.replies.append(full[:5])
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 2))
+        assert responses[0].error_code == -3
+        assert worker._serial.waited < worker._serial.config.timeout
+
+
+class TestFrameGap:
+    def test_no_sleep_when_bus_idle_long_enough(self, worker, monkeypatch):
+        """距上一帧已超过 t3.5 时不再额外等待"""
+        from nimotion.communication import worker as worker_mod
+
+        sleeps: list[float] = []
+        monkeypatch.setattr(worker_mod.time, "sleep", sleeps.append)
+        worker._bus_idle_at = 0.0
+        worker._serial.replies.append(crc16.append(bytes([0x01, 0x06, 0x00, 0x51, 0x00, 0x06])))
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[6]))
+        assert sleeps == []
+
+    def test_gap_follows_baudrate(self, worker, monkeypatch):
+        """紧接上一帧发送时，按波特率推算的 t3.5 补足间隔"""
+        from nimotion.communication import worker as worker_mod
+
+        sleeps: list[float] = []
+        monkeypatch.setattr(worker_mod.time, "sleep", sleeps.append)
+        worker._serial.config = SerialConfig(port="fake", baudrate=9600)
+        worker._bus_idle_at = time.perf_counter()
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[6]))
+        assert len(sleeps) == 1
+        assert 0 < sleeps[0] <= 3.5 * 11 / 9600
+
+    def test_gap_floor(self, worker, monkeypatch):
+        from nimotion.communication import worker as worker_mod
+
+        sleeps: list[float] = []
+        monkeypatch.setattr(worker_mod.time, "sleep", sleeps.append)
+        worker._serial.config = SerialConfig(port="fake", frame_gap_floor=0.05)
+        worker._bus_idle_at = time.perf_counter()
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[6]))
+        assert 0.04 < sleeps[0] <= 0.05
+
+
+class TestTurnaround:
+    def test_measured_after_response(self, worker):
+        assert worker.turnaround is None
+        worker._serial.replies.append(crc16.append(bytes([0x01, 0x06, 0x00, 0x51, 0x00, 0x06])))
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[6]))
+        assert worker.turnaround is not None
+        assert worker.turnaround >= 0
+
+    def test_not_updated_on_timeout(self, worker):
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[6]))
+        assert worker.turnaround is None
+
+
+class TestQueue:
+    def test_queue_stats(self, worker):
+        worker.send_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+        worker.send_modbus(ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[6]))
+        stats = worker.queue_stats()
+        assert stats["background"]["depth"] == 1
+        assert stats["motion"]["depth"] == 1
+        assert stats["safety"]["depth"] == 0
+
+
+def _read_reply(slave: int, fc: int, values: list[int]) -> bytes:
+    data = b"".join(v.to_bytes(2, "big") for v in values)
+    return crc16.append(bytes([slave, fc, len(data)]) + data)
+
+
+class TestCoalescing:
+    def _next_block(self, worker):
+        req = worker._scheduler.pop(0.0)
+        return worker._scheduler.pop_reads(req, 0.0, worker.coalesce_gap)
+
+    def test_block_split_to_requesters(self, worker):
+        responses = _collect(worker)
+        worker.send_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x005F, 2))
+        worker.send_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0061, 2))
+        worker._serial.replies.append(_read_reply(1, 0x03, [0, 100, 0, 200]))
+        worker._handle_block(self._next_block(worker))
+        assert len(worker._serial.written) == 1  # 一次往返
+        assert [r.values for r in responses] == [[0, 100], [0, 200]]
+        # raw_tx 按原请求重建，仍可取出起始地址
+        assert responses[1].raw_tx[2:4] == b"\x00\x61"
+
+    def test_rejected_block_falls_back(self, worker):
+        """块读被拒（非法地址）时退回逐条读取，并记住该块"""
+        responses = _collect(worker)
+        worker.send_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0061, 2))
+        worker.send_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0069, 2))
+        worker._serial.replies += [
+            crc16.append(bytes([0x01, 0x83, 0x02])),
+            _read_reply(1, 0x03, [0, 1]),
+            _read_reply(1, 0x03, [0, 2]),
+        ]
+        block = self._next_block(worker)
+        worker._handle_block(block)
+        assert block.key in worker._rejected_blocks
+        assert responses == []  # 各部分放回队首，不在块处理中一次发完
+        # 新到的安全命令排在放回的部分之前
+        worker.send_modbus(ModbusRequest(
+            1, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x02], priority=Priority.SAFETY,
+        ))
+        assert worker._scheduler.pop(0.0).lane == Priority.SAFETY
+        # 之后同一块不再合并，每轮只取一条
+        for _ in range(2):
+            request, block = worker._pop_next(0.0)
+            assert block is None
+            worker._handle_modbus(request)
+        assert [r.values for r in responses] == [[0, 1], [0, 2]]
+        assert worker._scheduler.pop(0.0) is None
+
+
+class TestRequestHandle:
+    def test_handle_resolved_with_response(self, worker):
+        req = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1)
+        handle = worker.send_modbus(req)
+        worker._serial.replies.append(_read_reply(1, 0x03, [7]))
+        worker._handle_modbus(worker._scheduler.pop(0.0))
+        resp = handle.result(timeout=0)
+        assert resp.values == [7]
+        assert resp.request_id == handle.request_id
+        assert handle.request is req
+
+    def test_request_ids_unique(self, worker):
+        req = ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16)
+        h1 = worker.send_modbus(req)
+        h2 = worker.send_modbus(req)  # 同一对象重复提交
+        assert h1.request_id != h2.request_id
+        assert h1.request is not h2.request
+
+    def test_callback_not_broadcast(self, worker, qtbot):
+        """指定回调的响应只交给回调，不经 response_received 广播"""
+        responses = _collect(worker)
+        got: list = []
+        worker.send_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1), got.append)
+        worker._serial.replies.append(_read_reply(1, 0x03, [7]))
+        worker._handle_modbus(worker._scheduler.pop(0.0))
+        qtbot.waitUntil(lambda: len(got) == 1, timeout=1000)
+        assert got[0].values == [7]
+        assert responses == []
+
+    def test_block_parts_to_own_handles(self, worker):
+        h1 = worker.send_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x005F, 2))
+        h2 = worker.send_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0061, 2))
+        worker._serial.replies.append(_read_reply(1, 0x03, [0, 100, 0, 200]))
+        req = worker._scheduler.pop(0.0)
+        worker._handle_block(worker._scheduler.pop_reads(req, 0.0, worker.coalesce_gap))
+        assert h1.result(timeout=0).values == [0, 100]
+        assert h2.result(timeout=0).values == [0, 200]
+
+    def test_cancelled_by_safety(self, worker):
+        motion = worker.send_modbus(
+            ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x1F]),
+        )
+        worker.send_modbus(ModbusRequest(
+            1, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x02], priority=Priority.SAFETY,
+        ))
+        resp = motion.result(timeout=0)
+        assert resp.is_error and resp.error_code == -4
+
+
+
+class TestBackpressure:
+    def test_overflow_completes_handle(self, worker, qtbot):
+        worker._scheduler.capacity[Priority.BACKGROUND] = 1
+        first = worker.send_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+        with qtbot.waitSignal(worker.queue_overflow, timeout=1000) as blocker:
+            worker.send_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+        assert blocker.args == ["background", 1]
+        resp = first.result(timeout=0)
+        assert resp.is_error and resp.error_code == -5
+        assert worker.queue_stats()["background"]["depth"] == 1
+
+    def test_expired_not_sent(self, worker):
+        stale = worker.send_modbus(ModbusRequest(
+            1, FunctionCode.READ_INPUT, 0x0017, 16, deadline=time.perf_counter() - 1,
+        ))
+        assert worker._scheduler.pop(time.perf_counter()) is None
+        worker._mutex.lock()
+        discarded = worker._take_discarded()
+        worker._mutex.unlock()
+        worker._finish_discarded(discarded)
+        resp = stale.result(timeout=0)
+        assert resp.is_error and resp.error_code == -6
+        assert worker._serial.written == []
+
+
+class TestBreaker:
+    def _trip(self, worker, slave=2):
+        for _ in range(worker.breaker.threshold):
+            worker._handle_modbus(worker._scheduler.pop(0.0))
+
+    def test_trip_fails_queued_requests(self, worker, qtbot):
+        moves = [
+            worker.send_modbus(ModbusRequest(2, FunctionCode.WRITE_SINGLE, 0x0051, values=[v]))
+            for v in (0x06, 0x07, 0x0F, 0x1F, 0x0F)
+        ]
+        poll = worker.send_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+        with qtbot.waitSignal(worker.slave_online_changed, timeout=1000) as blocker:
+            self._trip(worker)
+        assert blocker.args == [2, False]
+        assert len(worker._serial.written) == worker.breaker.threshold
+        assert [h.result(timeout=0).error_code for h in moves] == [-2, -2, -2, -7, -7]
+        # 其它从站不受影响
+        assert not poll.done()
+        assert worker._scheduler.pop(0.0).slave_id == 1
+
+    def test_fast_fail_while_open(self, worker):
+        for _ in range(worker.breaker.threshold):
+            worker.send_modbus(ModbusRequest(2, FunctionCode.READ_HOLDING, 0x001A, 1))
+        self._trip(worker)
+        handle = worker.send_modbus(ModbusRequest(2, FunctionCode.READ_HOLDING, 0x001A, 1))
+        resp = handle.result(timeout=0)
+        assert resp.is_error and resp.error_code == -7
+        # 安全命令照常排队发送
+        worker.send_modbus(ModbusRequest(
+            2, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x02], priority=Priority.SAFETY,
+        ))
+        assert worker.queue_stats()["safety"]["depth"] == 1
+
+    def test_probe_recovers(self, worker, qtbot):
+        for _ in range(worker.breaker.threshold):
+            worker.send_modbus(ModbusRequest(2, FunctionCode.READ_HOLDING, 0x001A, 1))
+        self._trip(worker)
+        probe = worker.breaker.due_probe(time.perf_counter() + 10)
+        worker._serial.replies.append(_read_reply(2, 0x04, [0x0001]))
+        with qtbot.waitSignal(worker.slave_online_changed, timeout=1000) as blocker:
+            worker._handle_probe(probe)
+        assert blocker.args == [2, True]
+        assert not worker.breaker.is_open(2)
+        assert worker.stats()["breaker"] == {}
+
+    def test_safety_before_probe(self, worker):
+        for _ in range(worker.breaker.threshold):
+            worker.send_modbus(ModbusRequest(2, FunctionCode.READ_HOLDING, 0x001A, 1))
+        self._trip(worker)
+        worker.send_modbus(ModbusRequest(
+            1, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x02], priority=Priority.SAFETY,
+        ))
+        later = time.perf_counter() + 10
+        assert worker._next_probe(later) is None
+        assert worker._scheduler.pop(later).lane == Priority.SAFETY
+        assert worker._next_probe(later).slave_id == 2
+
+    def test_probe_timeout_follows_estimate(self, worker):
+        for _ in range(40):
+            worker.adaptive_timeout.record(1, FunctionCode.READ_INPUT, 0.002)
+        for _ in range(worker.breaker.threshold):
+            worker.send_modbus(ModbusRequest(2, FunctionCode.READ_HOLDING, 0x001A, 1))
+        self._trip(worker)
+        probe = worker.breaker.due_probe(time.perf_counter() + 10)
+        worker._handle_probe(probe)
+        assert probe.timeout < worker.breaker.probe_timeout / 2
+
+    def test_disabled(self, worker):
+        worker.breaker = None
+        handles = [
+            worker.send_modbus(ModbusRequest(2, FunctionCode.READ_HOLDING, 0x001A, 1))
+            for _ in range(5)
+        ]
+        for _ in handles:
+            worker._handle_modbus(worker._scheduler.pop(0.0))
+        assert [h.result(timeout=0).error_code for h in handles] == [-2] * 5
+
+
+class TestGroups:
+    @staticmethod
+    def _writes(worker, group, values, slave=1):
+        return [
+            worker.send_modbus(
+                ModbusRequest(slave, FunctionCode.WRITE_SINGLE, 0x0051, values=[v]), group=group,
+            )
+            for v in values
+        ]
+
+    @staticmethod
+    def _run(worker):
+        while True:
+            req = worker._scheduler.pop(0.0)
+            if req is None:
+                return
+            # 写单个寄存器的正常应答为原帧回显
+            worker._serial.replies.append(crc16.append(bytes([
+                req.slave_id, 0x06, 0x00, 0x51, 0x00, req.values[0],
+            ])))
+            worker._handle_modbus(req)
+
+    def test_completes_once(self, worker, qtbot):
+        results: list = []
+        group = worker.begin_group("运动", results.append)
+        handles = self._writes(worker, group, [0x00, 0x06, 0x07, 0x0F])
+        worker.end_group(group)
+        assert not group.done()
+        self._run(worker)
+        qtbot.waitUntil(lambda: bool(results), timeout=1000)
+        result = group.result(timeout=0)
+        assert results == [result]
+        assert result.ok and result.sent == 4 and result.failed is None
+        assert result.responses == [h.result(timeout=0) for h in handles]
+        assert result.latency_ns > 0
+
+    def test_abort_on_first_error(self, worker):
+        group = worker.begin_group()
+        handles = self._writes(worker, group, [0x00, 0x06, 0x07, 0x0F])
+        worker.end_group(group)
+        # 首帧被拒: 从站忙
+        worker._serial.replies.append(crc16.append(bytes([1, 0x86, 0x06])))
+        worker._handle_modbus(worker._scheduler.pop(0.0))
+        assert len(worker._serial.written) == 1
+        assert worker._scheduler.pop(0.0) is None
+        assert [h.result(timeout=0).error_code for h in handles] == [6, -4, -4, -4]
+        result = group.result(timeout=0)
+        assert not result.ok
+        assert result.sent == 1
+        assert result.failed.error_code == 6
+        assert result.failed_request is handles[0].request
+
+    def test_late_member_cancelled(self, worker):
+        """组已中止后再提交的请求不再排队"""
+        group = worker.begin_group()
+        self._writes(worker, group, [0x00])
+        worker._handle_modbus(worker._scheduler.pop(0.0))  # 无应答: 超时
+        late = self._writes(worker, group, [0x06])[0]
+        assert late.result(timeout=0).error_code == -4
+        assert worker._scheduler.pop(0.0) is None
+        worker.end_group(group)
+        assert group.result(timeout=0).sent == 1
+
+    def test_other_requests_unaffected(self, worker):
+        group = worker.begin_group()
+        self._writes(worker, group, [0x00, 0x06])
+        other = worker.send_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+        worker.end_group(group)
+        worker._handle_modbus(worker._scheduler.pop(0.0))  # 超时
+        assert not other.done()
+        assert worker.queue_stats()["background"]["depth"] == 1
+
+    def test_empty_group(self, worker):
+        group = worker.end_group(worker.begin_group())
+        result = group.result(timeout=0)
+        assert result.ok and result.responses == [] and result.latency_ns == 0
+
+
+class TestResponseTimeout:
+    def _learn(self, worker, n=30):
+        for _ in range(n):
+            worker.adaptive_timeout.record(1, FunctionCode.READ_INPUT, 0.003)
+
+    def test_dead_slave_costs_tens_of_ms(self, worker):
+        self._learn(worker)
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+        assert worker._serial.waited < 0.05
+
+    def test_request_timeout_overrides(self, worker):
+        self._learn(worker)
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16, timeout=2.0))
+        assert worker._serial.waited > 1.9
+
+    def test_disabled(self, worker):
+        self._learn(worker)
+        worker.adaptive_timeout = None
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+        assert worker._serial.waited >= worker._serial.config.timeout - 0.01
+
+    def test_success_recorded(self, worker):
+        worker._serial.replies.append(_read_reply(1, 0x04, [1]))
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 1))
+        assert worker.adaptive_timeout.histogram(1, FunctionCode.READ_INPUT).count == 1
+
+
+class TestStats:
+    def test_trace_timestamps(self, worker):
+        handle = worker.send_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1))
+        worker._serial.replies.append(_read_reply(1, 0x03, [7]))
+        worker._handle_modbus(worker._scheduler.pop(0.0))
+        trace = handle.result(timeout=0).trace
+        assert 0 < trace.enqueued_ns <= trace.tx_start_ns <= trace.first_rx_ns <= trace.done_ns
+        assert trace.total_ns >= trace.queue_ns + trace.response_ns
+
+    def test_no_first_rx_on_timeout(self, worker):
+        responses = _collect(worker)
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1))
+        assert responses[0].trace.first_rx_ns == 0
+        assert responses[0].trace.response_ns == 0
+
+    def test_counters_per_slave_and_function(self, worker):
+        worker._serial.replies += [
+            _read_reply(1, 0x03, [7]),
+            crc16.append(bytes([0x01, 0x83, 0x02])),
+            b"\x01\x03\x02\x00\x07\x00\x00",  # CRC 错误
+        ]
+        for _ in range(4):  # 第 4 次无应答
+            worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1))
+        worker._serial.replies.append(_read_reply(2, 0x04, [1]))
+        worker._handle_modbus(ModbusRequest(2, FunctionCode.READ_INPUT, 0x0017, 1))
+
+        stats = worker.stats()
+        link = stats["links"]["1/0x03"]
+        counts = (link["ok"], link["exceptions"], link["crc_errors"], link["timeouts"])
+        assert counts == (1, 1, 1, 1)
+        assert link["response"]["count"] == 3
+        assert stats["links"]["2/0x04"]["ok"] == 1
+        assert stats["total"]["transactions"] == 5
+        assert stats["tx_bytes"] == 5 * 8
+
+    def test_reset(self, worker):
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1))
+        worker.reset_stats()
+        assert worker.stats()["links"] == {}
+
+
+class TestCapture:
+    def test_request_and_response_captured(self, worker, tmp_path):
+        from nimotion.communication.capture import RX, TX, CaptureReader
+
+        path = tmp_path / "bus.nimcap"
+        worker.start_capture(str(path))
+        reply = crc16.append(bytes([0x01, 0x03, 0x02, 0x00, 0x07]))
+        worker._serial.replies.append(reply)
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1))
+        worker._handle_modbus(ModbusRequest(2, FunctionCode.READ_HOLDING, 0x001A, 1))
+        worker.stop_capture()
+        assert worker.capture is None
+        with CaptureReader(path) as r:
+            assert [(rec.direction, rec.slave_id) for rec in r] == [(TX, 1), (RX, 1), (TX, 2)]
+            assert r[1].data == reply
+            assert r[0].ts_ns < r[1].ts_ns < r[2].ts_ns
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="需要 pty")
+class TestIdleWait:
+    @pytest.fixture
+    def pty_worker(self, qtbot):
+        from nimotion.communication.worker import CommWorker
+
+        master, slave = os.openpty()
+        w = CommWorker()
+        w.connect_port(SerialConfig(port=os.ttyname(slave), timeout=0.05))
+        yield w, master
+        w.disconnect_port()
+        os.close(master)
+        os.close(slave)
+
+    def test_idle_thread_sleeps(self, pty_worker):
+        worker, _ = pty_worker
+        calls = []
+        read_all = worker._serial.read_all
+        worker._serial.read_all = lambda: calls.append(1) or read_all()
+        time.sleep(0.3)
+        assert len(calls) <= 1  # 旧实现每 50ms 醒一次
+
+    def test_raw_bytes_delivered_immediately(self, pty_worker, qtbot):
+        worker, master = pty_worker
+        arrived = []
+        worker.raw_data_received.connect(
+            lambda data: arrived.append(time.perf_counter()),
+            type=Qt.DirectConnection,
+        )
+        time.sleep(0.1)  # 让线程进入空闲等待
+        sent = time.perf_counter()
+        os.write(master, b"\x55")
+        qtbot.waitUntil(lambda: bool(arrived), timeout=1000)
+        assert arrived[0] - sent < 0.02
+
+    def test_request_wakes_thread(self, pty_worker):
+        worker, master = pty_worker
+        time.sleep(0.1)
+        start = time.perf_counter()
+        worker.send_raw(b"\x01\x02")
+        assert os.read(master, 2) == b"\x01\x02"
+        assert time.perf_counter() - start < 0.02
+
+
+class TestBatching:
+    def test_events_held_until_flush(self, worker):
+        worker.set_batching(60)
+        responses = _collect(worker)
+        batches, counts, called = [], [], []
+        worker.events_batched.connect(batches.append)
+        worker.bytes_count_updated.connect(lambda tx, rx: counts.append((tx, rx)))
+        reply = crc16.append(bytes([0x01, 0x03, 0x02, 0x00, 0x07]))
+        worker._serial.replies += [reply, reply]
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1))
+        handle = worker.send_modbus(ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1),
+                                    callback=called.append)
+        worker._handle_modbus(handle.request)
+        assert not responses and not batches and not counts and not called
+        assert worker._events_urgent
+
+        worker._flush_events()
+        assert len(batches) == 1
+        kinds = [kind for kind, _, _ in batches[0]]
+        assert kinds == [worker.EVENT_TX, worker.EVENT_RESPONSE, worker.EVENT_TX]
+        assert batches[0][1][1].values == [7]
+        assert called[0].values == [7]  # 回调仍只交给发起者
+        assert counts == [(16, 14)]  # 每批一次
+
+    def test_disabled_emits_per_event(self, worker):
+        sent = []
+        worker.raw_data_sent.connect(sent.append)
+        worker._serial.replies.append(crc16.append(bytes([0x01, 0x06, 0, 0x51, 0, 6])))
+        worker._handle_modbus(ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, 1, [6]))
+        assert len(sent) == 1
+        assert worker.batching is None
+        assert not worker._events
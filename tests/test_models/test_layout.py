@@ -0,0 +1,71 @@
+"""模型层 layout.py / status.py 寄存器布局单元测试"""
+
+import pytest
+
+from nimotion.models.layout import RegisterLayout, pack_words
+from nimotion.models.status import STATUS_COUNT, STATUS_LAYOUT, parse_status, parse_status_data
+from nimotion.models.types import DataType, MotorState, RunMode
+
+
+class TestRegisterLayout:
+    def test_decode_types(self):
+        layout = RegisterLayout([
+            ("u16", 0, DataType.UINT16),
+            ("i16", 1, DataType.INT16),
+            ("u32", 2, DataType.UINT32),
+            ("i32", 4, DataType.INT32),
+        ])
+        data = pack_words([0xFFFF, 0xFFFF, 0x0001, 0x0002, 0xFFFF, 0xFFFE])
+        assert layout.decode(data) == {"u16": 0xFFFF, "i16": -1, "u32": 0x00010002, "i32": -2}
+
+    def test_gaps_and_count(self):
+        layout = RegisterLayout([("b", 3, DataType.UINT16), ("a", 1, DataType.UINT16)], count=6)
+        assert layout.names == ("a", "b")
+        assert layout.count == 6
+        assert layout.size == 12
+        assert layout.decode(pack_words([0, 10, 0, 30, 0, 0])) == {"a": 10, "b": 30}
+
+    def test_offset(self):
+        layout = RegisterLayout([("x", 0, DataType.INT16)])
+        assert layout.unpack(bytes([0x01, 0x03, 0x02, 0x80, 0x00]), 3) == (-0x8000,)
+
+    def test_overlap_rejected(self):
+        with pytest.raises(ValueError):
+            RegisterLayout([("a", 0, DataType.UINT32), ("b", 1, DataType.UINT16)])
+
+    def test_count_too_small(self):
+        with pytest.raises(ValueError):
+            RegisterLayout([("a", 0, DataType.UINT32)], count=1)
+
+
+class TestStatusLayout:
+    VALUES = [
+        24, 0x0005, 0, 0, 0, 0, 0,  # 0x17 电压, 0x18 DI, 0x19~0x1D
+        RunMode.POSITION, 0x0037, 1,  # 0x1E 模式, 0x1F 状态字, 0x20 方向
+        0xFFFF, 0xFC18,  # 0x21~0x22 位置 -1000
+        0x0000, 0x2710,  # 0x23~0x24 速度 10000 (x10)
+        0, 0x0010,  # 0x25, 0x26 报警码
+    ]
+
+    def test_covers_status_block(self):
+        assert STATUS_LAYOUT.count == STATUS_COUNT
+        assert STATUS_LAYOUT.size == STATUS_COUNT * 2
+
+    def test_parse_status_data(self):
+        status = parse_status_data(pack_words(self.VALUES))
+        assert status.voltage == 24
+        assert status.di_status == 5
+        assert status.current_mode == RunMode.POSITION
+        assert status.state == MotorState.OPERATION_ENABLED
+        assert not status.is_running
+        assert status.direction == 1
+        assert status.position == -1000
+        assert status.speed == 1000
+        assert status.alarm_code == 0x0010
+
+    def test_values_and_data_agree(self):
+        assert parse_status(self.VALUES) == parse_status_data(pack_words(self.VALUES))
+
+    def test_short_input(self):
+        assert parse_status(self.VALUES[:-1]) is None
+        assert parse_status_data(pack_words(self.VALUES[:-1])) is None
@@ -2,9 +2,12 @@
 
 import pytest
 from nimotion.models.registers import (
+    COMMAND_ONLY_ADDRS,
     HOLDING_REGISTERS,
     INPUT_REGISTERS,
+    decode_value,
     get_register,
+    plan_block_reads,
 )
 from nimotion.models.types import DataType, RegisterType
 
@@ -117,3 +120,68 @@ class TestGetRegister:
         assert h is not None
         assert i is not None
         assert h.name != i.name  # 不同寄存器
+
+
+class TestPlanBlockReads:
+    def test_covers_every_readable_register_once(self):
+        blocks = plan_block_reads(HOLDING_REGISTERS + INPUT_REGISTERS)
+        planned = [(r.reg_type, r.address) for b in blocks for r in b.registers]
+        expected = [
+            (r.reg_type, r.address) for r in HOLDING_REGISTERS + INPUT_REGISTERS
+            if r.reg_type == RegisterType.INPUT or r.address not in COMMAND_ONLY_ADDRS
+        ]
+        assert sorted(planned) == sorted(expected)
+        assert len(blocks) < len(expected) // 4
+
+    def test_full_table_block_counts(self):
+        """与 scripts/dump_params.py 文档中的事务数一致"""
+        regs = HOLDING_REGISTERS + INPUT_REGISTERS
+        counts = [len(plan_block_reads(regs, max_gap=gap)) for gap in (0, 4, 8)]
+        assert counts == [15, 9, 6]
+
+    def test_blocks_are_legal(self):
+        """块内只含已定义地址，不含命令型寄存器"""
+        for block in plan_block_reads(HOLDING_REGISTERS + INPUT_REGISTERS):
+            defined = {
+                r.address + i for r in block.registers for i in range(r.count)
+            }
+            span = set(range(block.address, block.address + block.count))
+            assert span == defined
+            if block.reg_type == RegisterType.HOLDING:
+                assert not span & COMMAND_ONLY_ADDRS
+            assert block.count <= 125
+            assert len({r.reg_type for r in block.registers}) == 1
+
+    def test_gap_and_count_limits(self):
+        regs = [get_register(a, RegisterType.INPUT) for a in (0x0016, 0x0017, 0x001E, 0x001F)]
+        assert len(plan_block_reads(regs)) == 2
+        assert len(plan_block_reads(regs, max_gap=8)) == 1
+        assert [b.count for b in plan_block_reads(regs, max_count=2)] == [2, 2]
+
+    def test_32bit_not_split(self):
+        regs = [get_register(a, RegisterType.INPUT) for a in (0x0016, 0x0017, 0x0018)]
+        assert [b.count for b in plan_block_reads(regs, max_count=3)] == [2, 2]
+
+    def test_decode(self):
+        regs = [get_register(a, RegisterType.INPUT) for a in (0x0017, 0x0018)]
+        (block,) = plan_block_reads(regs)
+        assert block.decode([0x0237, 0x0001, 0x0002]) == {0x0017: 0x0237, 0x0018: 0x00010002}
+
+    def test_decode_data(self):
+        regs = [get_register(a, RegisterType.INPUT) for a in (0x0017, 0x0018)]
+        (block,) = plan_block_reads(regs)
+        assert block.decode_data(bytes([0x02, 0x37, 0x00, 0x01, 0x00, 0x02])) == {
+            0x0017: 0x0237, 0x0018: 0x00010002,
+        }
+
+    def test_layout_matches_decode_value(self):
+        for block in plan_block_reads(HOLDING_REGISTERS + INPUT_REGISTERS):
+            values = [(i * 40503) & 0xFFFF for i in range(block.count)]
+            assert block.decode(values) == {
+                reg.address: decode_value(reg, block.raw(values, reg)) for reg in block.registers
+            }
+
+    def test_decode_signed(self):
+        reg = get_register(0x0021, RegisterType.INPUT)
+        assert reg.data_type == DataType.INT32
+        assert decode_value(reg, [0xFFFF, 0xFFFE]) == -2
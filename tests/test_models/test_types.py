@@ -8,6 +8,7 @@ from nimotion.models.types import (
     ModbusResponse,
     MotorState,
     MotorStatus,
+    Priority,
     RegisterDef,
     RegisterType,
     RunMode,
@@ -116,6 +117,22 @@ class TestModbusRequest:
         assert req.values == [0x0006]
 
 
+class TestRequestLane:
+    def test_default_read_is_background(self):
+        req = ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16)
+        assert req.lane == Priority.BACKGROUND
+
+    def test_default_write_is_motion(self):
+        req = ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[6])
+        assert req.lane == Priority.MOTION
+
+    def test_explicit_priority(self):
+        req = ModbusRequest(
+            1, FunctionCode.WRITE_SINGLE, 0x0051, values=[2], priority=Priority.SAFETY
+        )
+        assert req.lane == Priority.SAFETY
+
+
 class TestModbusResponse:
     def test_success_response(self):
         resp = ModbusResponse(
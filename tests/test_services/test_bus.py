@@ -0,0 +1,108 @@
+"""多从站总线调度测试"""
+
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from nimotion.models.types import FunctionCode, MotorStatus
+from nimotion.services.bus import MotorBus
+
+
+@pytest.fixture
+def worker(qtbot):
+    from nimotion.communication.worker import CommWorker
+
+    w = CommWorker()
+    w._serial = MagicMock(is_open=True)
+    return w
+
+
+@pytest.fixture
+def bus(worker):
+    return MotorBus(worker)
+
+
+def _done_future() -> Future:
+    f: Future = Future()
+    f.set_result(None)
+    return f
+
+
+class TestMotors:
+    def test_one_service_per_slave(self, bus, worker):
+        m1 = bus.motor(1)
+        assert bus.motor(1) is m1
+        assert bus.motor(2).slave_id == 2
+        assert bus.slaves == [1, 2]
+        assert m1._worker is worker
+
+    def test_status_relayed_with_slave(self, bus, qtbot):
+        m3 = bus.motor(3)
+        with qtbot.waitSignal(bus.status_updated, timeout=1000) as blocker:
+            m3.status_updated.emit(MotorStatus())
+        assert blocker.args[0] == 3
+
+    def test_remove(self, bus, worker):
+        bus.motor(1)
+        bus.motor(2)
+        bus.remove(1)
+        with patch.object(worker, "send_modbus", side_effect=lambda *a, **k: _done_future()):
+            assert [bus.poll_next() for _ in range(3)] == [2, 2, 2]
+
+    def test_remove_disposes_service(self, bus, qtbot):
+        m1 = bus.motor(1)
+        m1._homing_poll_timer.start()
+        with patch.object(m1, "deleteLater") as delete:
+            bus.remove(1)
+        assert not m1._homing_poll_timer.isActive()
+        delete.assert_called_once()
+        with qtbot.assertNotEmitted(bus.status_updated):
+            m1.status_updated.emit(MotorStatus())
+
+
+class TestPolling:
+    def _poll(self, bus, worker, n):
+        done = lambda *a, **k: _done_future()  # noqa: E731
+        with patch.object(worker, "send_modbus", side_effect=done) as send:
+            order = [bus.poll_next() for _ in range(n)]
+        assert all(c.args[0].function_code == FunctionCode.READ_INPUT for c in send.call_args_list)
+        return order
+
+    def test_round_robin(self, bus, worker):
+        for sid in (1, 2, 3):
+            bus.motor(sid)
+        assert self._poll(bus, worker, 6) == [1, 2, 3, 1, 2, 3]
+
+    def test_weighted(self, bus, worker):
+        bus.motor(1, weight=3)
+        bus.motor(2)
+        order = self._poll(bus, worker, 8)
+        assert order.count(1) == 6 and order.count(2) == 2
+        assert order[:4] == [1, 1, 2, 1]  # 平滑: 低权重从站不会被饿到一轮末尾
+
+    def test_zero_weight_not_polled(self, bus, worker):
+        bus.motor(1)
+        bus.motor(2, weight=0)
+        assert self._poll(bus, worker, 3) == [1, 1, 1]
+
+    def test_skip_outstanding(self, bus, worker):
+        """上一次轮询未返回的从站跳过，不堆积请求"""
+        bus.motor(1)
+        bus.motor(2)
+        pending: Future = Future()
+        futures = [pending, _done_future(), _done_future()]
+        with patch.object(worker, "send_modbus", side_effect=futures):
+            assert bus.poll_next() == 1
+            assert bus.poll_next() == 2
+            assert bus.poll_next() == 2
+        pending.set_result(None)
+        with patch.object(worker, "send_modbus", side_effect=lambda *a, **k: _done_future()):
+            assert bus.poll_next() == 1
+
+    def test_not_connected(self, bus, worker):
+        bus.motor(1)
+        worker._serial.is_open = False
+        with patch.object(worker, "send_modbus") as send:
+            assert bus.poll_next() is None
+            send.assert_not_called()
@@ -0,0 +1,83 @@
+"""多串口总线管理测试（pty 模拟串口）"""
+
+import os
+
+import pytest
+
+from nimotion.communication import crc16
+from nimotion.communication.serial_port import SerialConfig
+from nimotion.models.types import FunctionCode, ModbusRequest
+from nimotion.services.bus_manager import BusManager
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="需要 pty")
+
+
+@pytest.fixture
+def ptys():
+    pairs = [os.openpty() for _ in range(2)]
+    yield [(master, os.ttyname(slave)) for master, slave in pairs]
+    for master, slave in pairs:
+        os.close(master)
+        os.close(slave)
+
+
+@pytest.fixture
+def manager(qtbot):
+    m = BusManager()
+    yield m
+    m.close_all()
+
+
+def _config(path: str) -> SerialConfig:
+    return SerialConfig(port=path, baudrate=115200, timeout=0.05)
+
+
+class TestBusManager:
+    def test_open_and_route(self, manager, ptys, qtbot):
+        (master_a, path_a), (master_b, path_b) = ptys
+        manager.open_all([_config(path_a), _config(path_b)])
+        assert manager.ports == [path_a, path_b]
+        assert manager.stats()["total"]["connected"] == 2
+
+        handle = manager.send(path_b, ModbusRequest(3, FunctionCode.READ_HOLDING, 0x001A, 1))
+        qtbot.waitUntil(handle.done, timeout=2000)
+        frame = os.read(master_b, 64)
+        assert frame == crc16.append(bytes([3, 0x03, 0x00, 0x1A, 0x00, 0x01]))
+        assert handle.result().error_code == -2  # 无应答方，超时
+
+    def test_motor_per_port(self, manager, ptys):
+        (_, path_a), (_, path_b) = ptys
+        manager.open_all([_config(path_a), _config(path_b)])
+        a1 = manager.motor(path_a, 1)
+        b1 = manager.motor(path_b, 1)
+        assert a1 is not b1
+        assert a1._worker is not b1._worker
+        stats = manager.stats()
+        assert stats["ports"][path_a]["slaves"] == [1]
+        assert stats["total"]["slaves"] == 2
+
+    def test_open_error_reported(self, manager, qtbot):
+        with qtbot.waitSignal(manager.port_error, timeout=1000) as blocker:
+            manager.open(_config("/dev/nonexistent-port"))
+        assert blocker.args[0] == "/dev/nonexistent-port"
+        assert manager.stats()["total"]["connected"] == 0
+
+    def test_failed_port_removed(self, manager, ptys, qtbot):
+        (_, path_a), _ = ptys
+        manager.open(_config(path_a))
+        with qtbot.waitSignal(manager.port_error, timeout=1000):
+            manager.open_all([_config("/dev/nonexistent-port")])
+        assert manager.ports == [path_a]
+        with pytest.raises(KeyError):
+            manager.bus("/dev/nonexistent-port")
+        assert list(manager.stats()["ports"]) == [path_a]
+
+    def test_unknown_port(self, manager):
+        with pytest.raises(KeyError):
+            manager.bus("COM99")
+
+    def test_close(self, manager, ptys):
+        (_, path_a), _ = ptys
+        manager.open(_config(path_a))
+        manager.close(path_a)
+        assert manager.ports == []
@@ -1,5 +1,7 @@
 """服务层 motor_service.py 单元测试"""
 
+import time
+
 import pytest
 from unittest.mock import MagicMock, patch, call
 
@@ -11,6 +13,7 @@ from nimotion.models.types import (
     ModbusResponse,
     MotorState,
     MotorStatus,
+    Priority,
     RunMode,
 )
 from nimotion.services.motor_service import MotorService
@@ -83,10 +86,20 @@ class TestStateControl:
     def test_clear_fault(self, service, mock_worker):
         self._assert_control_word(service, mock_worker, "clear_fault", 0x0080)
 
+    def test_safety_lane(self, service, mock_worker):
+        """急停与脱机走安全通道，普通控制字走运动通道"""
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.quick_stop()
+            service.disable()
+            service.run()
+            lanes = [c[0][0].lane for c in mock_send.call_args_list]
+            assert lanes == [Priority.SAFETY, Priority.SAFETY, Priority.MOTION]
+
 
 class TestMotionControl:
     def test_move_relative(self, service, mock_worker):
         """自包含完整序列: 停机+设模式+方向+写幅值+启动+使能+相对运行+触发 = 8 条"""
+        _set_fused(service, False)
         with patch.object(mock_worker, "send_modbus") as mock_send:
             service.move_relative(1000)
             assert mock_send.call_count == 8
@@ -112,6 +125,7 @@ class TestMotionControl:
 
     def test_move_relative_negative_direction(self, service, mock_worker):
         """负数相对运动: 方向应为反转(0)，幅值取绝对值写入 0x0053"""
+        _set_fused(service, False)
         with patch.object(mock_worker, "send_modbus") as mock_send:
             service.move_relative(-500)
             req_dir = mock_send.call_args_list[2][0][0]
@@ -162,60 +176,355 @@ class TestMotionControl:
             assert mock_send.call_args_list[4][0][0].values == [0x000F]
             assert mock_send.call_args_list[5][0][0].values == [0x001F]
 
-    def test_homing_ignores_premature_idle(self, service, mock_worker):
+    def test_homing_ignores_premature_idle(self, service, mock_worker, qtbot):
         """回零触发后未起转的空闲帧不得被误判为完成(修偶发秒成功、没动)。"""
         done = []
         service.homing_done.connect(lambda: done.append(True))
-        with patch.object(mock_worker, "send_modbus"):
-            # 模拟回零已启动(armed)
-            service._homing_di_restore = 0x00000001
-            service._homing_seen_running = False
-            # 触发后电机尚未起转的空闲帧 -> 不应完成
-            s0 = MotorStatus()
-            s0.is_running = False
-            s0.speed = 0
-            service._check_homing_running(s0)
-            assert done == []
-            assert service._homing_di_restore is not None  # 仍在回零中
-            # 电机真正起转
-            s1 = MotorStatus()
-            s1.is_running = True
-            s1.speed = 50
-            service._check_homing_running(s1)
-            assert service._homing_seen_running is True
-            # 之后停下 -> 真正完成
-            s2 = MotorStatus()
-            s2.is_running = False
-            s2.speed = 0
-            service._check_homing_running(s2)
-            assert done == [True]
-            assert service._homing_di_restore is None
-
-    def test_homing_grace_completes_when_already_home(self, service, mock_worker):
+        # 模拟回零已启动(armed)
+        service._homing_di_restore = 0x00000001
+        service._homing_seen_running = False
+        # 触发后电机尚未起转的空闲帧 -> 不应完成
+        s0 = MotorStatus()
+        s0.is_running = False
+        s0.speed = 0
+        service._check_homing_running(s0)
+        assert done == []
+        assert mock_worker._scheduler.pop(0.0) is None
+        assert service._homing_di_restore is not None  # 仍在回零中
+        # 电机真正起转
+        s1 = MotorStatus()
+        s1.is_running = True
+        s1.speed = 50
+        service._check_homing_running(s1)
+        assert service._homing_seen_running is True
+        # 之后停下 -> 下发恢复，整组成功后才算完成
+        s2 = MotorStatus()
+        s2.is_running = False
+        s2.speed = 0
+        service._check_homing_running(s2)
+        assert _answer_all(mock_worker) == 6
+        qtbot.waitUntil(lambda: bool(done), timeout=1000)
+        assert done == [True]
+        assert service._homing_di_restore is None
+
+    def test_homing_grace_completes_when_already_home(self, service, mock_worker, qtbot):
         """已在 home 点再回零、几乎不动(never see is_running)时 grace 兜底判完成。"""
         done = []
         service.homing_done.connect(lambda: done.append(True))
+        service._homing_di_restore = 0x00000001
+        service._homing_seen_running = False
+        service._homing_grace_over = False
+        # 未起转的空闲帧 + grace 未到 -> 不完成
+        s0 = MotorStatus()
+        s0.is_running = False
+        s0.speed = 0
+        service._check_homing_running(s0)
+        assert done == []
+        assert service._homing_di_restore is not None
+        # grace 到期（会补发一次状态查询）
         with patch.object(mock_worker, "send_modbus"):
-            service._homing_di_restore = 0x00000001
-            service._homing_seen_running = False
-            service._homing_grace_over = False
-            # 未起转的空闲帧 + grace 未到 -> 不完成
-            s0 = MotorStatus()
-            s0.is_running = False
-            s0.speed = 0
-            service._check_homing_running(s0)
-            assert done == []
-            assert service._homing_di_restore is not None
-            # grace 到期
             service._on_homing_grace_over()
-            assert service._homing_grace_over is True
-            # 再来空闲帧 -> 兜底判完成(即便从未见过 is_running=True)
-            s1 = MotorStatus()
-            s1.is_running = False
-            s1.speed = 0
-            service._check_homing_running(s1)
-            assert done == [True]
-            assert service._homing_di_restore is None
+        assert service._homing_grace_over is True
+        # 再来空闲帧 -> 兜底判完成(即便从未见过 is_running=True)
+        s1 = MotorStatus()
+        s1.is_running = False
+        s1.speed = 0
+        service._check_homing_running(s1)
+        _answer_all(mock_worker)
+        qtbot.waitUntil(lambda: bool(done), timeout=1000)
+        assert service._homing_di_restore is None
+
+    def test_homing_restore_failure_keeps_values(self, service, mock_worker, qtbot):
+        """恢复组首帧被拒(从站忙): 保留原值、不报完成，下一帧状态重试"""
+        done, status_msgs = [], []
+        service.homing_done.connect(lambda: done.append(True))
+        service.homing_config_status.connect(status_msgs.append)
+        service._homing_di_restore = 0x00000021
+        service._homing_accel_restore = 2000
+        service._homing_decel_restore = 1500
+        service._homing_seen_running = True
+        idle = MotorStatus()
+        service._check_homing_running(idle)
+        service._check_homing_running(idle)  # 恢复在途，不重复下发
+        assert _answer_all(mock_worker, error_code=6) == 1
+        qtbot.waitUntil(lambda: not service._homing_restoring, timeout=1000)
+        assert done == [] and status_msgs == []
+        assert service._homing_di_restore == 0x00000021
+        assert (service._homing_accel_restore, service._homing_decel_restore) == (2000, 1500)
+        assert service._homing_poll_timer.isActive()
+        # 重试成功
+        service._check_homing_running(idle)
+        assert _answer_all(mock_worker) == 8
+        qtbot.waitUntil(lambda: bool(done), timeout=1000)
+        assert service._homing_di_restore is None
+        assert service._homing_accel_restore is None
+        assert "2000" in status_msgs[-1]
+
+    def test_pending_restore_survives_new_homing(self, service, mock_worker):
+        """上次恢复未成功时重新回零，仍记录最初的原值而非设备上的回零值"""
+        from nimotion.models.types import HomingConfig
+
+        service._homing_di_restore = 0x00000020
+        service._homing_accel_restore = 2000
+        service._homing_decel_restore = 2000
+        service._homing_config = HomingConfig()
+        service._homing_phase = "reading"
+        service._homing_read_values = {
+            0x002C: 0x00000021, 0x006B: 17, 0x0069: 0, 0x006C: 100, 0x006E: 20,
+            0x005F: 200, 0x0061: 200, 0x0072: 0,
+        }
+        with patch.object(mock_worker, "send_modbus"):
+            service._check_homing_reads_complete()
+        assert service._homing_di_restore == 0x00000020
+        assert service._homing_accel_restore == 2000
+
+
+def _answer_all(worker, error_code: int | None = None, at: int = 0) -> int:
+    """按顺序应答排队的请求（error_code 非 None 时第 at 帧以该异常码拒绝），返回应答帧数"""
+    n = 0
+    while (request := worker._scheduler.pop(0.0)) is not None:
+        if error_code is not None and n == at:
+            resp = ModbusResponse(
+                1, request.function_code, b"", is_error=True, error_code=error_code,
+            )
+        else:
+            resp = ModbusResponse(1, request.function_code, b"", values=[0])
+        worker._complete(request, resp)
+        n += 1
+    return n
+
+
+def _set_fused(service, supported: bool) -> None:
+    service._fused_cache[service._drive_key()] = supported
+
+
+def _status(state, mode=RunMode.POSITION, running=False, position=0) -> MotorStatus:
+    s = MotorStatus()
+    s.state = state
+    s.current_mode = mode
+    s.is_running = running
+    s.position = position
+    return s
+
+
+class TestFusedMotion:
+    def _prepare(self, service, state, control):
+        _set_fused(service, True)
+        service._mode_written = RunMode.POSITION
+        service._last_control = control
+        service._last_state = state
+        service._last_status = _status(state, position=1000)
+        service._direction_written = 1
+
+    def test_unsupported_uses_full_sequence(self, service, mock_worker):
+        _set_fused(service, False)
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.move_relative(100)
+            assert mock_send.call_count == 8
+
+    def test_relative_when_enabled(self, service, mock_worker):
+        """已运行使能: 控制字+方向+目标一帧 + 触发 = 2 帧"""
+        self._prepare(service, MotorState.OPERATION_ENABLED, 0x005F)
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.move_relative(-500)
+            assert mock_send.call_count == 2
+            block = mock_send.call_args_list[0][0][0]
+            assert block.function_code == FunctionCode.WRITE_MULTIPLE
+            assert block.address == 0x0051
+            assert block.values == [0x004F, 0, *ModbusRTU.split_32bit(500)]
+            assert mock_send.call_args_list[1][0][0].values == [0x005F]
+
+    def test_absolute_when_disabled(self, service, mock_worker):
+        """移动后已脱机(转盘场景): 启动+方向+目标一帧 + 使能 + 运行 + 触发 = 4 帧"""
+        self._prepare(service, MotorState.OPERATION_ENABLED, 0x0000)
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.move_absolute(-2000)
+            assert mock_send.call_count == 4
+            block = mock_send.call_args_list[0][0][0]
+            assert block.address == 0x0051
+            # 方向寄存器写回已知值，不按目标推算
+            assert block.values == [0x0006, 1, *ModbusRTU.split_32bit(-2000)]
+            assert [c[0][0].values for c in mock_send.call_args_list[1:]] == [
+                [0x0007], [0x000F], [0x001F],
+            ]
+
+    def test_absolute_direction_unknown_skips_0052(self, service, mock_worker):
+        self._prepare(service, MotorState.OPERATION_ENABLED, 0x005F)
+        service._direction_written = None
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.move_absolute(-2000)
+        sent = [c[0][0] for c in mock_send.call_args_list]
+        assert [(r.address, r.values) for r in sent] == [
+            (0x0051, [0x000F]),
+            (0x0053, list(ModbusRTU.split_32bit(-2000))),
+            (0x0051, [0x001F]),
+        ]
+
+    def test_direction_tracked_from_relative(self, service, mock_worker):
+        self._prepare(service, MotorState.OPERATION_ENABLED, 0x005F)
+        with patch.object(mock_worker, "send_modbus"):
+            service.move_relative(-500)
+        assert service._direction_written == 0
+
+    def test_after_quick_stop_restarts_from_disable(self, service, mock_worker):
+        self._prepare(service, MotorState.QUICK_STOP, 0x0002)
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.move_absolute(2000)
+            assert mock_send.call_args_list[0][0][0].values == [0x0000]
+            assert mock_send.call_count == 5
+
+    def test_mode_written_when_not_position(self, service, mock_worker):
+        self._prepare(service, MotorState.SWITCH_ON_DISABLED, 0x0000)
+        service._mode_written = RunMode.HOMING
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.move_absolute(2000)
+            assert mock_send.call_args_list[0][0][0].address == 0x0039
+            assert mock_send.call_count == 5
+
+
+class TestFusedTrial:
+    """首次位置运动即试探合并写，不额外读写驱动器"""
+
+    def test_first_move_sends_fused_frame(self, service, mock_worker, qtbot):
+        service.move_relative(100)
+        with qtbot.waitSignal(service.fused_probe_done, timeout=1000) as blocker:
+            assert _answer_all(mock_worker) == 6
+        assert blocker.args == [True]
+        assert service.fused_supported is True
+
+    def test_rejected_falls_back_to_sequence(self, service, mock_worker, qtbot):
+        messages: list = []
+        service.operation_done.connect(lambda ok, msg: messages.append((ok, msg)))
+        service.move_relative(-100)
+        with patch.object(mock_worker, "_complete", wraps=mock_worker._complete) as complete:
+            # 停机、设模式后合并帧被拒（非法功能），其后以逐帧序列重发
+            assert _answer_all(mock_worker, error_code=0x01, at=2) == 3 + 8
+            sent = [c.args[0] for c in complete.call_args_list]
+        qtbot.waitUntil(lambda: bool(messages), timeout=1000)
+        assert service.fused_supported is False
+        assert (sent[2].address, sent[2].count) == (0x0051, 4)
+        assert (sent[5].address, sent[5].values) == (0x0052, [0])
+        assert messages == [(True, messages[0][1])]
+
+    def test_other_failure_leaves_unknown(self, service, mock_worker, qtbot):
+        service.move_relative(100)
+        with qtbot.waitSignal(service.operation_done, timeout=1000) as blocker:
+            assert _answer_all(mock_worker, error_code=0x06, at=0) == 1
+        assert blocker.args[0] is False
+        assert service.fused_supported is None
+        assert mock_worker._scheduler.pop(0.0) is None
+
+    def test_absolute_direction_unknown_not_trial(self, service, mock_worker):
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.move_absolute(1000)
+        assert mock_send.call_count == 7
+        assert all(c[0][0].address != 0x0052 for c in mock_send.call_args_list)
+
+    def test_cached_per_slave(self, service):
+        _set_fused(service, False)
+        service.slave_id = 2
+        assert service.fused_supported is None
+        service.slave_id = 1
+        assert service.fused_supported is False
+
+
+class TestEepromTimeout:
+    @pytest.mark.parametrize("method", ["save_params", "restore_defaults"])
+    def test_declares_long_budget(self, service, mock_worker, method):
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            getattr(service, method)()
+            assert mock_send.call_args[0][0].timeout == MotorService.EEPROM_TIMEOUT
+
+    def test_normal_write_adaptive(self, service, mock_worker):
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.write_param(0x001A, 4)
+            assert mock_send.call_args[0][0].timeout is None
+
+
+class TestRequestCorrelation:
+    def test_send_passes_callback(self, service, mock_worker):
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.read_param(0x001A)
+            assert mock_send.call_args.kwargs["callback"] is not None
+
+    def test_start_address_from_request(self, service, qtbot):
+        """起始地址取自原请求，响应无需携带 raw_tx"""
+        req = ModbusRequest(1, FunctionCode.READ_HOLDING, 0x001A, 1)
+        with qtbot.waitSignal(service.param_read, timeout=1000) as blocker:
+            service._on_response(
+                ModbusResponse(1, FunctionCode.READ_HOLDING, b"", values=[3]), req,
+            )
+        assert blocker.args == [0x001A, 3]
+
+    def test_cancelled_silent(self, service, qtbot):
+        req = ModbusRequest(1, FunctionCode.WRITE_SINGLE, 0x0051, values=[0x1F])
+        with qtbot.assertNotEmitted(service.operation_done):
+            service._on_response(
+                ModbusResponse(1, FunctionCode.WRITE_SINGLE, b"", is_error=True, error_code=-4),
+                req,
+            )
+
+
+    def test_expired_poll_silent(self, service, qtbot):
+        req = ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16)
+        with qtbot.assertNotEmitted(service.operation_done):
+            for code in (-5, -6):
+                service._on_response(
+                    ModbusResponse(1, FunctionCode.READ_INPUT, b"", is_error=True, error_code=code),
+                    req,
+                )
+
+    def test_status_poll_has_deadline(self, service, mock_worker):
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.refresh_status()
+            req = mock_send.call_args[0][0]
+        assert req.deadline is not None
+        assert 0 < req.deadline - time.perf_counter() <= service.STATUS_MAX_AGE
+
+
+
+class TestTransactionGroups:
+    def test_move_is_one_group(self, service, mock_worker):
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.move_absolute(1000)
+        groups = {c.kwargs["group"] for c in mock_send.call_args_list}
+        assert len(groups) == 1
+        group = groups.pop()
+        assert group.sealed and group.name == "绝对运动"
+        assert service._group is None
+
+    def test_nested_joins_outer(self, service, mock_worker):
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            with service._transaction("回零配置"):
+                service._write_control_word(0x0000)
+                service.start_homing()
+        assert len({c.kwargs["group"] for c in mock_send.call_args_list}) == 1
+        assert mock_send.call_count == 7
+
+    def test_single_request_not_grouped(self, service, mock_worker):
+        with patch.object(mock_worker, "send_modbus") as mock_send:
+            service.enable()
+        assert "group" not in mock_send.call_args.kwargs
+
+    def test_group_reports_once(self, service, mock_worker, qtbot):
+        messages: list = []
+        service.operation_done.connect(lambda ok, msg: messages.append((ok, msg)))
+        service.set_speed(100, 1)
+        # 逐条应答: 首帧成功，第二帧被拒，其余应被取消
+        worker = mock_worker
+        first = worker._scheduler.pop(0.0)
+        worker._complete(first, ModbusResponse(1, FunctionCode.WRITE_SINGLE, b"", values=[0]))
+        second = worker._scheduler.pop(0.0)
+        worker._complete(second, ModbusResponse(
+            1, FunctionCode.WRITE_SINGLE, b"", is_error=True, error_code=6,
+        ))
+        qtbot.waitUntil(lambda: bool(messages), timeout=1000)
+        assert worker._scheduler.pop(0.0) is None
+        assert len(messages) == 1
+        ok, msg = messages[0]
+        assert not ok
+        assert msg.startswith("速度运行中止")
+        assert "0x0039" in msg and "2/7" in msg
 
 
 class TestParamOperations:
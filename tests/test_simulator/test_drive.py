@@ -0,0 +1,211 @@
+"""虚拟驱动器单元测试（手动时钟，不经串口）"""
+
+import pytest
+
+from nimotion.communication import crc16
+from nimotion.communication.modbus_rtu import ModbusRTU
+from nimotion.models.status import decode_state, parse_status
+from nimotion.models.types import FunctionCode, ModbusRequest, MotorState
+from nimotion.simulator.drive import ALARM_NEG_LIMIT, SimulatedDrive
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def drive(clock):
+    d = SimulatedDrive(1, clock=clock)
+    d._holding[0x001A] = 0  # 整步，脉冲 = 步
+    return d
+
+
+def _do(drive, request: ModbusRequest):
+    raw = drive.handle(ModbusRTU.build_frame(request))
+    return ModbusRTU.parse_response(raw, request)
+
+
+def _write(drive, address, *values):
+    if len(values) == 1:
+        req = ModbusRequest(1, FunctionCode.WRITE_SINGLE, address, values=list(values))
+    else:
+        req = ModbusRequest(1, FunctionCode.WRITE_MULTIPLE, address, len(values), list(values))
+    return _do(drive, req)
+
+
+def _status(drive):
+    resp = _do(drive, ModbusRequest(1, FunctionCode.READ_INPUT, 0x0017, 16))
+    return parse_status(resp.values)
+
+
+def _run_relative(drive, steps: int, direction: int = 1):
+    for addr, val in ((0x0051, 0), (0x0039, 1), (0x0052, direction)):
+        _write(drive, addr, val)
+    _write(drive, 0x0053, *ModbusRTU.split_32bit(steps))
+    for word in (0x0006, 0x0007, 0x004F, 0x005F):
+        _write(drive, 0x0051, word)
+
+
+class TestRegisters:
+    def test_read_defaults(self, drive):
+        resp = _do(drive, ModbusRequest(1, FunctionCode.READ_HOLDING, 0x005B, 2))
+        assert ModbusRTU.combine_32bit(*resp.values) == 250
+
+    def test_other_slave_ignored(self, drive):
+        req = ModbusRequest(2, FunctionCode.READ_HOLDING, 0x005B, 2)
+        assert drive.handle(ModbusRTU.build_frame(req)) is None
+
+    def test_bad_crc_ignored(self, drive):
+        frame = bytearray(ModbusRTU.build_frame(ModbusRequest(1, FunctionCode.READ_HOLDING, 0, 1)))
+        frame[-1] ^= 0xFF
+        assert drive.handle(bytes(frame)) is None
+
+    def test_out_of_range_rejected(self, drive):
+        resp = _write(drive, 0x001A, 9)
+        assert resp.is_error and resp.error_code == 0x03
+
+    def test_undefined_write_rejected(self, drive):
+        resp = _write(drive, 0x0004, 1)
+        assert resp.is_error and resp.error_code == 0x02
+
+    def test_min_speed_above_max_rejected(self, drive):
+        resp = _write(drive, 0x005D, 0, 600)
+        assert resp.is_error and resp.error_code == 0x03
+
+    def test_reject_gaps(self, clock):
+        d = SimulatedDrive(1, clock=clock, reject_gaps=True)
+        resp = _do(d, ModbusRequest(1, FunctionCode.READ_HOLDING, 0x0061, 10))
+        assert resp.is_error and resp.error_code == 0x02
+
+    def test_save_params(self, drive):
+        assert not _write(drive, 0x0008, 0x7376).is_error
+        assert drive.saves == 1
+        assert _write(drive, 0x0008, 0x1234).error_code == 0x03
+
+    def test_unknown_function(self, drive):
+        raw = drive.handle(crc16.append(bytes([1, 0x2B, 0x0E, 0x01])))
+        assert raw[1] == 0xAB and raw[2] == 0x01
+
+
+class TestStateMachine:
+    @pytest.mark.parametrize("words, state", [
+        ([0x0000], MotorState.SWITCH_ON_DISABLED),
+        ([0x0006], MotorState.READY_TO_SWITCH_ON),
+        ([0x0006, 0x0007], MotorState.SWITCHED_ON),
+        ([0x0006, 0x0007, 0x000F], MotorState.OPERATION_ENABLED),
+        ([0x0006, 0x0007, 0x0002], MotorState.QUICK_STOP),
+        ([0x000F], MotorState.SWITCH_ON_DISABLED),  # 非法跳转被忽略
+    ])
+    def test_transitions(self, drive, words, state):
+        for word in words:
+            _write(drive, 0x0051, word)
+        assert decode_state(_status(drive).status_word) == state
+
+    def test_fault_and_reset(self, drive):
+        drive.inject_fault(0x2200)
+        status = _status(drive)
+        assert status.state == MotorState.FAULT
+        assert status.alarm_code == 0x2200
+        _write(drive, 0x0051, 0x0080)
+        assert _status(drive).state == MotorState.SWITCH_ON_DISABLED
+
+
+class TestMotion:
+    def test_relative_move_trapezoid(self, drive, clock):
+        _run_relative(drive, 1000)
+        clock.now = 0.2
+        status = _status(drive)
+        assert status.is_running
+        assert 0 < status.position < 1000
+        assert 0 < status.speed <= 250
+        clock.now = 10.0
+        status = _status(drive)
+        assert not status.is_running
+        assert status.position == 1000
+        assert status.state == MotorState.OPERATION_ENABLED
+
+    def test_move_duration(self, drive, clock):
+        """1000 步、vmax 250、加减速 1000: 约 4.25s (加速 0.234s + 匀速 + 减速)"""
+        _run_relative(drive, 1000)
+        clock.now = 4.0
+        assert _status(drive).is_running
+        clock.now = 4.5
+        assert not _status(drive).is_running
+
+    def test_relative_reverse(self, drive, clock):
+        _run_relative(drive, 300, direction=0)
+        clock.now = 5.0
+        assert _status(drive).position == -300
+
+    def test_absolute_move(self, drive, clock):
+        _write(drive, 0x0039, 1)
+        _write(drive, 0x0053, *ModbusRTU.split_32bit(-500))
+        for word in (0x0006, 0x0007, 0x000F, 0x001F):
+            _write(drive, 0x0051, word)
+        clock.now = 5.0
+        assert _status(drive).position == -500
+
+    def test_trigger_needs_rising_edge(self, drive, clock):
+        _run_relative(drive, 100)
+        clock.now = 5.0
+        _write(drive, 0x0051, 0x005F)  # 触发位保持为 1，不再启动
+        clock.now = 10.0
+        assert _status(drive).position == 100
+
+    def test_speed_mode(self, drive, clock):
+        _write(drive, 0x0039, 2)
+        _write(drive, 0x0052, 1)
+        _write(drive, 0x0055, 0, 200)
+        for word in (0x0006, 0x0007, 0x000F):
+            _write(drive, 0x0051, word)
+        clock.now = 1.0
+        assert _status(drive).speed == 200
+        _write(drive, 0x0051, 0x0007)  # 减速停机
+        clock.now = 2.0
+        status = _status(drive)
+        assert status.speed == 0 and not status.is_running
+
+
+class TestDi1:
+    def test_negative_limit_stops(self, drive, clock):
+        drive.di1_position = -200
+        _write(drive, 0x002C, 0, 1)  # DI1 = 负限位
+        _run_relative(drive, 1000, direction=0)
+        clock.now = 10.0
+        status = _status(drive)
+        assert not status.is_running
+        assert -210 <= status.position <= -200
+        assert status.di_status & 0x01
+        assert status.alarm_code == ALARM_NEG_LIMIT
+
+    def test_release_by_positive_move(self, drive, clock):
+        drive.di1_position = 0
+        _write(drive, 0x002C, 0, 1)
+        _run_relative(drive, 100)
+        clock.now = 5.0
+        status = _status(drive)
+        assert status.position == 100
+        assert not status.di_status & 0x01
+
+    def test_homing(self, drive, clock):
+        drive.di1_position = -300
+        _write(drive, 0x002C, 0, 3)  # DI1 = 原点开关
+        _write(drive, 0x0069, *ModbusRTU.split_32bit(-50))  # 原点偏移
+        for word in (0x0006,):
+            _write(drive, 0x0051, word)
+        _write(drive, 0x0039, 3)
+        for word in (0x0006, 0x0007, 0x000F, 0x001F):
+            _write(drive, 0x0051, word)
+        clock.now = 10.0
+        status = _status(drive)
+        assert not status.is_running
+        assert status.position == -50
@@ -0,0 +1,39 @@
+"""pty 虚拟驱动器端到端测试（经真实串口路径）"""
+
+import asyncio
+import os
+
+import pytest
+
+from nimotion.aio import AsyncModbusClient, AsyncMotor
+from nimotion.communication.serial_port import SerialConfig
+from nimotion.models.types import MotorState
+from nimotion.simulator import DriveServer, SimulatedDrive
+from nimotion.simulator.server import request_length
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="需要 pty")
+
+
+def test_request_length():
+    assert request_length(bytes([1, 0x03, 0, 0, 0, 1])) == 8
+    assert request_length(bytes([1, 0x10, 0, 0x51, 0, 4, 8])) == 17
+    assert request_length(bytes([1, 0x2B])) == 0
+
+
+def test_multi_drop_over_pty():
+    async def main():
+        with DriveServer([SimulatedDrive(1), SimulatedDrive(2)]) as server:
+            client = await AsyncModbusClient.connect(
+                SerialConfig(port=server.port, timeout=0.5)
+            )
+            try:
+                m1, m2 = AsyncMotor(client, 1), AsyncMotor(client, 2)
+                await m2.startup()
+                await m2.enable()
+                return await m1.refresh_status(), await m2.refresh_status()
+            finally:
+                client.close()
+
+    s1, s2 = asyncio.run(main())
+    assert s1.state == MotorState.SWITCH_ON_DISABLED
+    assert s2.state == MotorState.SWITCHED_ON